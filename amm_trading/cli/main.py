@@ -17,6 +17,7 @@ from ..core.wallet import generate_wallet
 from ..core.balances import BalanceQuery
 from ..core.connection import Web3Manager
 from ..contracts.weth import WETH
+from ..utils.token_cache import get_token_cache
 
 
 def get_results_dir():
@@ -594,6 +595,11 @@ def cmd_v4_query_pools(args):
 def cmd_v4_query_position(args):
     """Query V4 position information"""
     query = V4PositionQuery()
+
+    if args.refresh_tokens:
+        get_token_cache().clear()
+        print("Token cache cleared.", file=sys.stderr)
+
     result = query.get_position(args.token_id)
 
     print(json.dumps(result, indent=2, default=str))
@@ -604,6 +610,11 @@ def cmd_v4_query_position(args):
 def cmd_v4_query_positions(args):
     """Query all V4 positions for address"""
     query = V4PositionQuery()
+
+    if args.refresh_tokens:
+        get_token_cache().clear()
+        print("Token cache cleared.", file=sys.stderr)
+
     address = args.address or query.manager.address
     result = query.get_positions_for_address(address)
 
@@ -792,26 +803,30 @@ def cmd_v4_remove_liquidity(args):
 
     print(f"Removing {args.percentage}% liquidity from V4 position {args.token_id}")
 
+    # V4 always takes accrued fees with the removed liquidity, so
+    # --collect-fees is accepted but not passed on
     result = manager.remove_liquidity(
         token_id=args.token_id,
         percentage=args.percentage,
-        collect_fees=args.collect_fees,
         burn=args.burn,
     )
 
+    # Decrease, collect and burn share one tx
+    tx_hash = result["receipt"].transactionHash.hex()
+
     print(f"\nSuccess!")
-    print(f"Decrease tx: {result['decrease_receipt'].transactionHash.hex()}")
-    if "collect_receipt" in result:
-        print(f"Collect tx: {result['collect_receipt'].transactionHash.hex()}")
-    if "burn_receipt" in result:
-        print(f"Burn tx: {result['burn_receipt'].transactionHash.hex()}")
+    print(f"Tx (decrease + collect{' + burn' if result.get('burned') else ''}): {tx_hash}")
+    if "burn_skipped" in result:
+        print(f"Burn skipped: {result['burn_skipped']}")
 
     save_data = {
         "token_id": result["token_id"],
         "percentage": args.percentage,
-        "decrease_tx": result["decrease_receipt"].transactionHash.hex(),
-        "collect_tx": result.get("collect_receipt", {}).transactionHash.hex() if "collect_receipt" in result else None,
-        "burn_tx": result.get("burn_receipt", {}).transactionHash.hex() if "burn_receipt" in result else None,
+        "tx": tx_hash,
+        "burned": result.get("burned", False),
+        "decrease_tx": tx_hash,
+        "collect_tx": tx_hash,
+        "burn_tx": tx_hash if result.get("burned") else None,
     }
     filepath = save_result(f"univ4_remove_liquidity_{args.token_id}.json", save_data)
     print(f"Saved to {filepath}", file=sys.stderr)
@@ -1113,11 +1128,13 @@ examples:
     # univ4 query position
     v4_pos_parser = univ4_query_sub.add_parser("position", help="Query position by NFT token ID")
     v4_pos_parser.add_argument("token_id", type=int, help="Position NFT token ID")
+    v4_pos_parser.add_argument("--refresh-tokens", action="store_true", help="Clear cached token metadata")
     v4_pos_parser.set_defaults(func=cmd_v4_query_position)
 
     # univ4 query positions
     v4_positions_parser = univ4_query_sub.add_parser("positions", help="Query all V4 positions for address")
     v4_positions_parser.add_argument("--address", help="Address to query (default: wallet.env)")
+    v4_positions_parser.add_argument("--refresh-tokens", action="store_true", help="Clear cached token metadata")
     v4_positions_parser.set_defaults(func=cmd_v4_query_positions)
 
     # ── univ4 calculate ────────────────────────────────────────────────
@@ -1174,7 +1191,8 @@ examples:
     v4_remove_parser = univ4_sub.add_parser("remove", help="Remove liquidity")
     v4_remove_parser.add_argument("token_id", type=int, help="Position token ID")
     v4_remove_parser.add_argument("percentage", type=float, help="Percentage to remove")
-    v4_remove_parser.add_argument("--collect-fees", action="store_true", help="Collect fees")
+    v4_remove_parser.add_argument("--collect-fees", action="store_true",
+                                  help="No-op, kept for compatibility (V4 always collects fees)")
     v4_remove_parser.add_argument("--burn", action="store_true", help="Burn position NFT")
     v4_remove_parser.set_defaults(func=cmd_v4_remove_liquidity)
 
@@ -1,6 +1,7 @@
 """Shared contract wrappers"""
 
 from .erc20 import ERC20
+from .multicall import Multicall3
 from .weth import WETH
 
-__all__ = ["ERC20", "WETH"]
+__all__ = ["ERC20", "Multicall3", "WETH"]
@@ -0,0 +1,55 @@
+"""Multicall3 contract wrapper for aggregating read calls"""
+
+
+class Multicall3:
+    """
+    Wrapper for the Multicall3 contract.
+
+    Multicall3 is deployed at the same address on every major chain,
+    so N read-only calls can be sent as a single eth_call.
+    """
+
+    ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+    def __init__(self, manager):
+        """
+        Args:
+            manager: Web3Manager instance
+        """
+        self.manager = manager
+        self.address = manager.checksum(self.ADDRESS)
+        self.contract = manager.get_contract(self.address, "multicall3")
+
+    def aggregate3(self, calls, allow_failure: bool = False, block_identifier="latest"):
+        """
+        Execute several calls in a single eth_call.
+
+        Args:
+            calls: List of (target, calldata) tuples
+            allow_failure: If False, the whole call reverts when any sub-call fails
+            block_identifier: Block to execute the calls against
+
+        Returns:
+            List of (success, return_data) tuples, in the same order as calls
+        """
+        return self.contract.functions.aggregate3(
+            [(target, allow_failure, calldata) for target, calldata in calls]
+        ).call(block_identifier=block_identifier)
+
+    def eth_balance_call(self, address):
+        """
+        Build a (target, calldata) call that reads a native ETH balance.
+
+        Lets ETH balances be read in the same aggregate3 batch as
+        contract calls.
+
+        Args:
+            address: Account to read the balance of
+
+        Returns:
+            (target, calldata) tuple for aggregate3
+        """
+        return (
+            self.address,
+            self.contract.encode_abi("getEthBalance", args=[self.manager.checksum(address)]),
+        )
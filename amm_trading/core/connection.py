@@ -1,11 +1,17 @@
 """Web3 connection management"""
 
 import os
-from web3 import Web3
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import AsyncWeb3, Web3
 from dotenv import load_dotenv
 from .config import Config
 from .exceptions import ConnectionError, ConfigError
 
+# Keep-alive pool sized for concurrent pool queries (see PoolQuery)
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+
 
 class Web3Manager:
     """Manages Web3 connection and account"""
@@ -21,6 +27,8 @@ class Web3Manager:
         load_dotenv("wallet.env")
 
         self.config = Config()
+        self._async_w3 = None
+        self._chain_id = None
         self._setup_web3()
 
         self.account = None
@@ -33,11 +41,24 @@ class Web3Manager:
         if not rpc_url:
             raise ConfigError("RPC_URL not found in environment")
 
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.rpc_url = rpc_url
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url, session=self._create_session()))
 
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to {rpc_url}")
 
+    @staticmethod
+    def _create_session():
+        """requests Session with a larger keep-alive connection pool"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _setup_account(self):
         """Setup signing account from private key"""
         private_key = os.getenv("PRIVATE_KEY")
@@ -55,10 +76,19 @@ class Web3Manager:
         public_key = os.getenv("PUBLIC_KEY")
         return public_key if public_key else None
 
+    @property
+    def async_w3(self):
+        """AsyncWeb3 instance on the same RPC endpoint (created on first use)"""
+        if self._async_w3 is None:
+            self._async_w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc_url))
+        return self._async_w3
+
     @property
     def chain_id(self):
-        """Get current chain ID"""
-        return self.w3.eth.chain_id
+        """Get chain ID (read once; it cannot change for an RPC endpoint)"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
 
     def get_balance(self, address=None):
         """Get ETH balance in ether"""
@@ -87,6 +117,14 @@ class Web3Manager:
             abi=abi
         )
 
+    def get_async_contract(self, address, abi_name):
+        """Create contract instance bound to the async provider"""
+        abi = self.config.get_abi(abi_name)
+        return self.async_w3.eth.contract(
+            address=Web3.to_checksum_address(address),
+            abi=abi
+        )
+
     def checksum(self, address):
         """Convert address to checksum format"""
         return Web3.to_checksum_address(address)
@@ -2,6 +2,7 @@
 
 from mnemonic import Mnemonic
 from eth_account import Account
+from eth_account.hdaccount import key_from_seed, seed_from_mnemonic
 
 
 def generate_wallet(num_accounts=3):
@@ -21,11 +22,14 @@ def generate_wallet(num_accounts=3):
     mnemo = Mnemonic("english")
     mnemonic = mnemo.generate(strength=128)
 
+    # Stretch the mnemonic into a seed once (PBKDF2), not once per account
+    seed = seed_from_mnemonic(mnemonic, "")
+
     # Derive accounts using standard Ethereum path
     accounts = []
     for i in range(num_accounts):
         path = f"m/44'/60'/0'/0/{i}"
-        account = Account.from_mnemonic(mnemonic, account_path=path)
+        account = Account.from_key(key_from_seed(seed, path))
 
         accounts.append({
             "index": i,
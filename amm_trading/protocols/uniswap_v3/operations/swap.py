@@ -7,6 +7,7 @@ from ....core.connection import Web3Manager
 from ..config import UniswapV3Config
 from ....core.exceptions import ConfigError, InsufficientBalanceError
 from ....contracts.erc20 import ERC20
+from ....utils.gas import get_nonce_tracker
 from ...base import BaseSwapManager
 
 
@@ -233,8 +234,7 @@ class SwapManager(BaseSwapManager):
                 "Swap would return 0 tokens. Check pool liquidity and token addresses."
             )
 
-        slippage_multiplier = (10000 - slippage_bps) / 10000
-        amount_out_min = int(expected_out * slippage_multiplier)
+        amount_out_min = int(expected_out * (10000 - slippage_bps) // 10000)
 
         if amount_out_min == 0:
             raise ValueError(
@@ -292,16 +292,23 @@ class SwapManager(BaseSwapManager):
             0,
         )
 
-        tx = self.router.functions.exactInputSingle(swap_params).build_transaction({
-            "from": self.manager.address,
-            "nonce": self.manager.get_nonce(),
-            "gas": int(gas_estimate * 1.2),
-            "gasPrice": gas_price,
-            "chainId": self.manager.chain_id,
-        })
-
-        signed = self.manager.account.sign_transaction(tx)
-        tx_hash = self.manager.w3.eth.send_raw_transaction(signed.raw_transaction)
+        # Share the nonce counter with the approval and other tracked txs
+        nonce_tracker = get_nonce_tracker(self.manager, self.manager.address)
+        nonce = nonce_tracker.reserve()
+        try:
+            tx = self.router.functions.exactInputSingle(swap_params).build_transaction({
+                "from": self.manager.address,
+                "nonce": nonce,
+                "gas": int(gas_estimate * 1.2),
+                "gasPrice": gas_price,
+                "chainId": self.manager.chain_id,
+            })
+
+            signed = self.manager.account.sign_transaction(tx)
+            tx_hash = self.manager.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception:
+            nonce_tracker.resync()
+            raise
 
         receipt = self.manager.w3.eth.wait_for_transaction_receipt(tx_hash)
 
@@ -1,11 +1,11 @@
 """Uniswap V4 protocol implementation"""
 
 from .config import UniswapV4Config
-from .types import PoolKey, Actions, ADDRESS_ZERO, create_pool_key, sort_currencies, is_native_eth, compute_pool_id
+from .types import PoolKey, PositionInfo, Actions, ADDRESS_ZERO, create_pool_key, sort_currencies, is_native_eth, compute_pool_id
 from .contracts.pool_manager import PoolManager
 from .contracts.position_manager import PositionManager
 from .contracts.state_view import StateView
-from .contracts.quoter import Quoter
+from .contracts.quoter import Quoter, QuoteBatcher
 from .operations.liquidity import LiquidityManager
 from .operations.positions import PositionQuery
 from .operations.pools import PoolQuery
@@ -16,6 +16,7 @@ __all__ = [
     "UniswapV4Config",
     # Types
     "PoolKey",
+    "PositionInfo",
     "Actions",
     "ADDRESS_ZERO",
     "create_pool_key",
@@ -27,6 +28,7 @@ __all__ = [
     "PositionManager",
     "StateView",
     "Quoter",
+    "QuoteBatcher",
     # Operations
     "LiquidityManager",
     "PositionQuery",
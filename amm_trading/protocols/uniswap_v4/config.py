@@ -2,6 +2,7 @@
 
 import os
 import json
+from importlib.resources import files
 from pathlib import Path
 
 from ...core.config import Config
@@ -26,9 +27,9 @@ class UniswapV4Config:
     _pools = None
     _abis = None
 
-    # Package files (not user-configurable)
-    ADDRESSES_FILE = Path(__file__).parent / "addresses.json"
-    ABIS_FILE = Path(__file__).parent / "abis.json"
+    # Package resources (not user-configurable)
+    ADDRESSES_FILE = "addresses.json"
+    ABIS_FILE = "abis.json"
 
     # V4 fee tier to tick spacing mapping (same as V3, but V4 allows custom)
     TICK_SPACING = {
@@ -75,19 +76,26 @@ class UniswapV4Config:
 
         return None
 
+    @staticmethod
+    def _read_package_json(name, label):
+        """
+        Read a JSON resource bundled with this package.
+
+        Uses importlib.resources so the files are found in zipped or
+        frozen installs, and each file is read exactly once.
+        """
+        resource = files(__package__) / name
+        try:
+            data = resource.read_bytes()
+        except FileNotFoundError:
+            raise ConfigError(f"V4 {label} not found: {resource}")
+        return json.loads(data)
+
     def _load(self):
         """Load V4-specific configuration files"""
-        # Load addresses from package
-        if not self.ADDRESSES_FILE.exists():
-            raise ConfigError(f"V4 addresses not found: {self.ADDRESSES_FILE}")
-        with open(self.ADDRESSES_FILE) as f:
-            UniswapV4Config._addresses = json.load(f)
-
-        # Load ABIs from package
-        if not self.ABIS_FILE.exists():
-            raise ConfigError(f"V4 ABIs not found: {self.ABIS_FILE}")
-        with open(self.ABIS_FILE) as f:
-            UniswapV4Config._abis = json.load(f)
+        # Load addresses and ABIs from package resources
+        UniswapV4Config._addresses = self._read_package_json(self.ADDRESSES_FILE, "addresses")
+        UniswapV4Config._abis = self._read_package_json(self.ABIS_FILE, "ABIs")
 
         # Load pools from user config
         config_dir = self._find_config_dir()
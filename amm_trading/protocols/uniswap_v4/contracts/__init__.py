@@ -3,6 +3,6 @@
 from .pool_manager import PoolManager
 from .position_manager import PositionManager
 from .state_view import StateView
-from .quoter import Quoter
+from .quoter import Quoter, QuoteBatcher
 
-__all__ = ["PoolManager", "PositionManager", "StateView", "Quoter"]
+__all__ = ["PoolManager", "PositionManager", "StateView", "Quoter", "QuoteBatcher"]
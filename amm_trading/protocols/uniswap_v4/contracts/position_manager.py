@@ -1,11 +1,11 @@
 """Uniswap V4 Position Manager contract wrapper"""
 
 import time
-from eth_abi import encode
+from eth_abi.registry import registry
 from web3 import Web3
 
 from ..config import UniswapV4Config
-from ..types import PoolKey, ADDRESS_ZERO, is_native_eth
+from ..types import PoolKey, PositionInfo, ADDRESS_ZERO, is_native_eth
 from ..encoding import (
     encode_mint_position,
     encode_mint_position_with_native_eth,
@@ -17,6 +17,12 @@ from ....core.exceptions import PositionError
 from ....utils.gas import GasManager
 from ....utils.transactions import TransactionBuilder
 
+# ERC721 Transfer(address,address,uint256) event topic
+_ERC721_TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+
+# modifyLiquidities unlockData layout: abi.encode(bytes actions, bytes[] params)
+_UNLOCK_DATA_ENCODER = registry.get_encoder("(bytes,bytes[])")
+
 
 class PositionManager:
     """
@@ -44,7 +50,7 @@ class PositionManager:
         self.gas_manager = GasManager(manager)
         self.tx_builder = TransactionBuilder(manager, self.gas_manager)
 
-    def get_position(self, token_id: int):
+    def get_position(self, token_id: int) -> PositionInfo:
         """
         Get position data by token ID.
 
@@ -52,24 +58,11 @@ class PositionManager:
             token_id: Position NFT token ID
 
         Returns:
-            dict with PoolKey, tickLower, tickUpper, liquidity
+            PositionInfo with pool_key, tick_lower, tick_upper, liquidity
         """
         try:
             result = self.contract.functions.getPositionInfo(token_id).call()
-
-            pool_key_tuple = result[0]
-            return {
-                "pool_key": PoolKey(
-                    currency0=pool_key_tuple[0],
-                    currency1=pool_key_tuple[1],
-                    fee=pool_key_tuple[2],
-                    tick_spacing=pool_key_tuple[3],
-                    hooks=pool_key_tuple[4],
-                ),
-                "tick_lower": result[1],
-                "tick_upper": result[2],
-                "liquidity": result[3],
-            }
+            return PositionInfo(PoolKey(*result[0]), result[1], result[2], result[3])
         except Exception as e:
             raise PositionError(f"Position {token_id} not found: {e}")
 
@@ -118,8 +111,8 @@ class PositionManager:
         Returns:
             dict with receipt and token_id
         """
-        recipient = recipient or self.manager.address
-        deadline = deadline or int(time.time()) + 1800
+        recipient = recipient if recipient is not None else self.manager.address
+        deadline = deadline if deadline is not None else int(time.time()) + 1800
 
         # Check if using native ETH
         uses_native_eth = (
@@ -152,7 +145,7 @@ class PositionManager:
             eth_value = 0
 
         # Encode the unlock data
-        unlock_data = encode(["bytes", "bytes[]"], [actions, params])
+        unlock_data = _UNLOCK_DATA_ENCODER((actions, params))
 
         contract_func = self.contract.functions.modifyLiquidities(
             unlock_data,
@@ -198,8 +191,8 @@ class PositionManager:
         Returns:
             Transaction receipt
         """
-        recipient = recipient or self.manager.address
-        deadline = deadline or int(time.time()) + 1800
+        recipient = recipient if recipient is not None else self.manager.address
+        deadline = deadline if deadline is not None else int(time.time()) + 1800
 
         actions, params = encode_decrease_liquidity(
             token_id=token_id,
@@ -209,7 +202,7 @@ class PositionManager:
             recipient=recipient,
         )
 
-        unlock_data = encode(["bytes", "bytes[]"], [actions, params])
+        unlock_data = _UNLOCK_DATA_ENCODER((actions, params))
 
         contract_func = self.contract.functions.modifyLiquidities(
             unlock_data,
@@ -245,15 +238,15 @@ class PositionManager:
         Returns:
             Transaction receipt
         """
-        recipient = recipient or self.manager.address
-        deadline = deadline or int(time.time()) + 1800
+        recipient = recipient if recipient is not None else self.manager.address
+        deadline = deadline if deadline is not None else int(time.time()) + 1800
 
         actions, params = encode_collect_fees(
             token_id=token_id,
             recipient=recipient,
         )
 
-        unlock_data = encode(["bytes", "bytes[]"], [actions, params])
+        unlock_data = _UNLOCK_DATA_ENCODER((actions, params))
 
         contract_func = self.contract.functions.modifyLiquidities(
             unlock_data,
@@ -283,10 +276,10 @@ class PositionManager:
         Returns:
             Transaction receipt
         """
-        deadline = deadline or int(time.time()) + 1800
+        deadline = deadline if deadline is not None else int(time.time()) + 1800
 
         actions, params = encode_burn_position(token_id)
-        unlock_data = encode(["bytes", "bytes[]"], [actions, params])
+        unlock_data = _UNLOCK_DATA_ENCODER((actions, params))
 
         contract_func = self.contract.functions.modifyLiquidities(
             unlock_data,
@@ -303,20 +296,60 @@ class PositionManager:
 
         return receipt
 
+    def modify_batch(
+        self,
+        actions: bytes,
+        params: list,
+        operation_type: str = None,
+        value: int = 0,
+        deadline: int = None,
+    ):
+        """
+        Send an arbitrary batch of encoded actions in one modifyLiquidities tx.
+
+        Args:
+            actions: Encoded action bytes (see encoding.combine_actions)
+            params: ABI-encoded params, one per action
+            operation_type: Type of operation for gas limit lookup
+            value: ETH value to send in wei
+            deadline: Transaction deadline (default: 30 min from now)
+
+        Returns:
+            Transaction receipt
+        """
+        deadline = deadline if deadline is not None else int(time.time()) + 1800
+
+        unlock_data = _UNLOCK_DATA_ENCODER((actions, params))
+
+        contract_func = self.contract.functions.modifyLiquidities(
+            unlock_data,
+            deadline
+        )
+
+        receipt = self.tx_builder.build_and_send(
+            contract_func,
+            operation_type=operation_type,
+            value=value,
+        )
+
+        if receipt.status != 1:
+            raise PositionError(f"Modify liquidities failed: {receipt.transactionHash.hex()}")
+
+        return receipt
+
     def _parse_token_id_from_receipt(self, receipt) -> int:
         """Parse token ID from mint receipt events"""
         # Look for Transfer event (ERC721)
         # Transfer(from=0x0, to=recipient, tokenId=...)
         try:
             for log in receipt.logs:
-                # ERC721 Transfer event topic
-                if log.topics[0].hex() == Web3.keccak(
-                    text="Transfer(address,address,uint256)"
-                ).hex():
-                    # tokenId is the third topic for indexed events,
-                    # or decode from data if not indexed
-                    if len(log.topics) > 3:
-                        return int(log.topics[3].hex(), 16)
+                # Only the NFT's own 4-topic Transfer logs can carry the token ID;
+                # skip pool/ERC20 logs before comparing topic hashes
+                if len(log.topics) != 4 or log.address != self.address:
+                    continue
+                if log.topics[0] == _ERC721_TRANSFER_TOPIC:
+                    # tokenId is the third indexed argument
+                    return int.from_bytes(log.topics[3], "big")
 
             # Fallback: decode from event data
             return None
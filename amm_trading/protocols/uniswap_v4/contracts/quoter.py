@@ -1,8 +1,12 @@
 """Uniswap V4 Quoter contract wrapper"""
 
+import asyncio
+
+from eth_abi import decode
 from web3 import Web3
 from ..config import UniswapV4Config
-from ..types import PoolKey
+from ..types import PoolKey, MIN_SQRT_PRICE_LIMIT, MAX_SQRT_PRICE_LIMIT
+from ....contracts.multicall import Multicall3
 from ....core.exceptions import QuoteError
 
 
@@ -22,6 +26,14 @@ class Quoter:
         self.config = UniswapV4Config()
         self.address = manager.checksum(self.config.quoter_address)
         self.contract = manager.get_contract(self.address, "quoter")
+        self._async_contract = None
+
+    @property
+    def async_contract(self):
+        """Quoter contract bound to the manager's async provider"""
+        if self._async_contract is None:
+            self._async_contract = self.manager.get_async_contract(self.address, "quoter")
+        return self._async_contract
 
     def quote_exact_input_single(
         self,
@@ -48,7 +60,7 @@ class Quoter:
             pool_key.to_tuple(),
             zero_for_one,
             amount_in,
-            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (0 if zero_for_one else 2**160 - 1),
+            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (MIN_SQRT_PRICE_LIMIT if zero_for_one else MAX_SQRT_PRICE_LIMIT),
             hook_data,
         )
 
@@ -86,7 +98,7 @@ class Quoter:
             pool_key.to_tuple(),
             zero_for_one,
             amount_out,
-            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (0 if zero_for_one else 2**160 - 1),
+            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (MIN_SQRT_PRICE_LIMIT if zero_for_one else MAX_SQRT_PRICE_LIMIT),
             hook_data,
         )
 
@@ -98,3 +110,176 @@ class Quoter:
             }
         except Exception as e:
             raise QuoteError(f"Failed to get quote: {e}")
+
+    async def quote_exact_input_single_async(
+        self,
+        pool_key: PoolKey,
+        zero_for_one: bool,
+        amount_in: int,
+        sqrt_price_limit_x96: int = 0,
+        hook_data: bytes = b"",
+    ):
+        """
+        Async version of quote_exact_input_single.
+
+        Uses the manager's AsyncWeb3 provider so many quotes can be
+        awaited concurrently instead of paying one RPC round trip each.
+
+        Returns:
+            dict with amountOut and gasEstimate
+        """
+        params = (
+            pool_key.to_tuple(),
+            zero_for_one,
+            amount_in,
+            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (MIN_SQRT_PRICE_LIMIT if zero_for_one else MAX_SQRT_PRICE_LIMIT),
+            hook_data,
+        )
+
+        try:
+            result = await self.async_contract.functions.quoteExactInputSingle(params).call()
+            return {
+                "amount_out": result[0],
+                "gas_estimate": result[1],
+            }
+        except Exception as e:
+            raise QuoteError(f"Failed to get quote: {e}")
+
+    async def quotes_many(self, requests):
+        """
+        Run several exact input quotes concurrently.
+
+        A failing quote does not cancel the others: its slot in the
+        result list holds the QuoteError instead of a quote dict.
+
+        Args:
+            requests: List of dicts with quote_exact_input_single kwargs
+                (pool_key, zero_for_one, amount_in, ...)
+
+        Returns:
+            List of quote dicts or QuoteError, in the same order as requests
+        """
+        return await asyncio.gather(
+            *(self.quote_exact_input_single_async(**request) for request in requests),
+            return_exceptions=True,
+        )
+
+    def batcher(
+        self,
+        pool_key: PoolKey,
+        zero_for_one: bool,
+        sqrt_price_limit_x96: int = 0,
+        hook_data: bytes = b"",
+    ):
+        """
+        Create a QuoteBatcher for sampling one pool/direction at many amounts.
+
+        Args:
+            pool_key: The pool to swap through
+            zero_for_one: True if swapping currency0 for currency1
+            sqrt_price_limit_x96: Price limit (0 for no limit)
+            hook_data: Optional data for hooks
+
+        Returns:
+            QuoteBatcher bound to this quoter
+        """
+        return QuoteBatcher(self, pool_key, zero_for_one, sqrt_price_limit_x96, hook_data)
+
+
+class QuoteBatcher:
+    """
+    Exact input quotes for a fixed pool and direction.
+
+    Only amount_in changes between quotes, so the rest of the params
+    tuple is built once. Useful for sampling a price impact curve.
+    """
+
+    def __init__(
+        self,
+        quoter: Quoter,
+        pool_key: PoolKey,
+        zero_for_one: bool,
+        sqrt_price_limit_x96: int = 0,
+        hook_data: bytes = b"",
+    ):
+        """
+        Args:
+            quoter: Quoter instance
+            pool_key: The pool to swap through
+            zero_for_one: True if swapping currency0 for currency1
+            sqrt_price_limit_x96: Price limit (0 for no limit)
+            hook_data: Optional data for hooks
+        """
+        self.quoter = quoter
+        self._prefix = (pool_key.to_tuple(), zero_for_one)
+        self._suffix = (
+            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (MIN_SQRT_PRICE_LIMIT if zero_for_one else MAX_SQRT_PRICE_LIMIT),
+            hook_data,
+        )
+        self._multicall = None
+
+    def _params(self, amount_in: int) -> tuple:
+        return (*self._prefix, amount_in, *self._suffix)
+
+    def quote(self, amount_in: int):
+        """
+        Quote a single exact input amount.
+
+        Args:
+            amount_in: Exact amount of input token (in wei)
+
+        Returns:
+            dict with amountOut and gasEstimate
+        """
+        try:
+            result = self.quoter.contract.functions.quoteExactInputSingle(
+                self._params(amount_in)
+            ).call()
+        except Exception as e:
+            raise QuoteError(f"Failed to get quote: {e}")
+
+        return {
+            "amount_out": result[0],
+            "gas_estimate": result[1],
+        }
+
+    def quote_many(self, amounts_in):
+        """
+        Quote several input amounts in a single Multicall3 eth_call.
+
+        A failing quote does not fail the others: its slot in the result
+        list holds a QuoteError instead of a quote dict.
+
+        Args:
+            amounts_in: List of exact input amounts (in wei)
+
+        Returns:
+            List of quote dicts or QuoteError, in the same order as amounts_in
+        """
+        if self._multicall is None:
+            self._multicall = Multicall3(self.quoter.manager)
+
+        encode_abi = self.quoter.contract.encode_abi
+        calls = [
+            (
+                self.quoter.address,
+                encode_abi("quoteExactInputSingle", args=[self._params(amount)]),
+            )
+            for amount in amounts_in
+        ]
+        try:
+            results = self._multicall.aggregate3(calls, allow_failure=True)
+        except Exception as e:
+            raise QuoteError(f"Failed to get quotes: {e}")
+
+        quotes = []
+        for amount, (success, return_data) in zip(amounts_in, results):
+            if not success:
+                quotes.append(QuoteError(f"Failed to get quote for amount {amount}"))
+                continue
+            amount_out, gas_estimate = decode(["uint256", "uint256"], return_data)
+            quotes.append({
+                "amount_out": amount_out,
+                "gas_estimate": gas_estimate,
+            })
+        return quotes
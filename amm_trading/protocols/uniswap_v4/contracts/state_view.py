@@ -1,11 +1,29 @@
 """Uniswap V4 StateView contract wrapper for read-only queries"""
 
+import asyncio
+from collections import OrderedDict
+
+from eth_abi import decode
 from web3 import Web3
 from ..config import UniswapV4Config
-from ..types import PoolKey, compute_pool_id
+from ..types import PoolKey
+from ....contracts.multicall import Multicall3
 from ....core.exceptions import PoolError
 
 
+# Return types of the StateView getters, used to decode Multicall3 results
+_SLOT0_TYPES = ["uint160", "int24", "uint24", "uint24"]
+_LIQUIDITY_TYPES = ["uint128"]
+_TICK_INFO_TYPES = ["uint128", "int128", "uint256", "uint256"]
+
+# Getters taking only a bytes32 poolId: calldata is selector + poolId
+_GET_SLOT0_SELECTOR = Web3.keccak(text="getSlot0(bytes32)")[:4]
+_GET_LIQUIDITY_SELECTOR = Web3.keccak(text="getLiquidity(bytes32)")[:4]
+
+# Most tick infos kept for the pinned block before the oldest are evicted
+TICK_INFO_CACHE_SIZE = 4096
+
+
 class StateView:
     """
     Wrapper for Uniswap V4 StateView read-only queries.
@@ -27,11 +45,75 @@ class StateView:
         self.config = UniswapV4Config()
         self.address = manager.checksum(self.config.state_view_address)
         self.contract = manager.get_contract(self.address, "stateView")
+        self.multicall = Multicall3(manager)
         self._slot0_cache = {}
+        self._tick_info_cache = OrderedDict()
+        self._tick_info_block = None
+        self._async_contract = None
+
+    @property
+    def async_contract(self):
+        """StateView contract bound to the manager's async provider"""
+        if self._async_contract is None:
+            self._async_contract = self.manager.get_async_contract(self.address, "stateView")
+        return self._async_contract
 
     def _get_pool_id(self, pool_key: PoolKey) -> bytes:
-        """Compute bytes32 pool ID from PoolKey."""
-        return compute_pool_id(pool_key)
+        """Get the bytes32 pool ID for a PoolKey (memoized on the key)."""
+        return pool_key.pool_id
+
+    def _aggregate(self, calldatas, output_types, block_identifier="latest"):
+        """
+        Execute several StateView reads as a single Multicall3 eth_call.
+
+        Args:
+            calldatas: List of encoded StateView calls
+            output_types: ABI types of the function's return values
+            block_identifier: Block to read state at
+
+        Returns:
+            List of decoded result tuples, in the same order as calldatas
+        """
+        calls = [(self.address, calldata) for calldata in calldatas]
+        return [
+            decode(output_types, return_data)
+            for _, return_data in self.multicall.aggregate3(
+                calls, block_identifier=block_identifier
+            )
+        ]
+
+    @staticmethod
+    def _slot0_dict(result):
+        return {
+            "sqrt_price_x96": result[0],
+            "tick": result[1],
+            "protocol_fee": result[2],
+            "lp_fee": result[3],
+        }
+
+    def slot0_call(self, pool_key: PoolKey):
+        """
+        Build a (target, calldata) getSlot0 call for use in a Multicall3 batch.
+
+        Args:
+            pool_key: The pool's key
+
+        Returns:
+            (target, calldata) tuple; decode the result with decode_slot0()
+        """
+        return (self.address, _GET_SLOT0_SELECTOR + self._get_pool_id(pool_key))
+
+    def decode_slot0(self, return_data: bytes):
+        """
+        Decode getSlot0 return data from a Multicall3 batch.
+
+        Args:
+            return_data: Raw return data of a slot0_call()
+
+        Returns:
+            dict with sqrtPriceX96, tick, protocolFee, lpFee
+        """
+        return self._slot0_dict(decode(_SLOT0_TYPES, return_data))
 
     def get_slot0(self, pool_key: PoolKey, use_cache: bool = False):
         """
@@ -44,25 +126,38 @@ class StateView:
         Returns:
             dict with sqrtPriceX96, tick, protocolFee, lpFee
         """
-        cache_key = str(pool_key.to_tuple())
+        return self.get_slot0_batch([pool_key], use_cache=use_cache)[0]
 
-        if use_cache and cache_key in self._slot0_cache:
-            return self._slot0_cache[cache_key]
+    def get_slot0_batch(self, pool_keys, use_cache: bool = False):
+        """
+        Get slot0 data for several pools in a single eth_call.
 
-        try:
-            pool_id = self._get_pool_id(pool_key)
-            result = self.contract.functions.getSlot0(pool_id).call()
-            slot0 = {
-                "sqrt_price_x96": result[0],
-                "tick": result[1],
-                "protocol_fee": result[2],
-                "lp_fee": result[3],
-            }
-            self._slot0_cache[cache_key] = slot0
-            return slot0
+        Args:
+            pool_keys: List of pool keys
+            use_cache: Whether to use cached values if available
 
-        except Exception as e:
-            raise PoolError(f"Failed to get slot0 for pool: {e}")
+        Returns:
+            List of slot0 dicts, in the same order as pool_keys
+        """
+        pool_ids = [self._get_pool_id(pk) for pk in pool_keys]
+
+        if use_cache:
+            missing = [pid for pid in pool_ids if pid not in self._slot0_cache]
+        else:
+            missing = pool_ids
+
+        if missing:
+            try:
+                results = self._aggregate(
+                    [_GET_SLOT0_SELECTOR + pid for pid in missing], _SLOT0_TYPES
+                )
+            except Exception as e:
+                raise PoolError(f"Failed to get slot0 for pool: {e}")
+
+            for pid, result in zip(missing, results):
+                self._slot0_cache[pid] = self._slot0_dict(result)
+
+        return [self._slot0_cache[pid] for pid in pool_ids]
 
     def get_liquidity(self, pool_key: PoolKey) -> int:
         """
@@ -74,37 +169,134 @@ class StateView:
         Returns:
             Total liquidity in the pool
         """
+        return self.get_liquidity_batch([pool_key])[0]
+
+    def get_liquidity_batch(self, pool_keys):
+        """
+        Get total liquidity for several pools in a single eth_call.
+
+        Args:
+            pool_keys: List of pool keys
+
+        Returns:
+            List of liquidity values, in the same order as pool_keys
+        """
         try:
-            pool_id = self._get_pool_id(pool_key)
-            return self.contract.functions.getLiquidity(pool_id).call()
+            results = self._aggregate(
+                [_GET_LIQUIDITY_SELECTOR + self._get_pool_id(pk) for pk in pool_keys],
+                _LIQUIDITY_TYPES,
+            )
         except Exception as e:
             raise PoolError(f"Failed to get liquidity: {e}")
 
-    def get_tick_info(self, pool_key: PoolKey, tick: int):
+        return [result[0] for result in results]
+
+    def multi_get_slot0_and_liquidity(self, pool_keys):
+        """
+        Get slot0 and total liquidity for several pools in a single eth_call.
+
+        Refreshes the slot0 cache for every pool read.
+
+        Args:
+            pool_keys: List of pool keys
+
+        Returns:
+            List of (slot0 dict, liquidity) tuples, in the same order as pool_keys
+        """
+        pool_ids = [self._get_pool_id(pk) for pk in pool_keys]
+        calls = []
+        for pid in pool_ids:
+            calls.append((self.address, _GET_SLOT0_SELECTOR + pid))
+            calls.append((self.address, _GET_LIQUIDITY_SELECTOR + pid))
+
+        try:
+            results = self.multicall.aggregate3(calls)
+        except Exception as e:
+            raise PoolError(f"Failed to get pool state: {e}")
+
+        pool_states = []
+        for i, pid in enumerate(pool_ids):
+            slot0 = self.decode_slot0(results[2 * i][1])
+            liquidity = decode(_LIQUIDITY_TYPES, results[2 * i + 1][1])[0]
+            self._slot0_cache[pid] = slot0
+            pool_states.append((slot0, liquidity))
+        return pool_states
+
+    def get_tick_info(self, pool_key: PoolKey, tick: int, block_identifier="latest"):
         """
         Get tick information.
 
         Args:
             pool_key: The pool's key
             tick: The tick to query
+            block_identifier: Block to read state at (default: latest)
 
         Returns:
             dict with liquidityGross, liquidityNet, feeGrowthOutside0X128, feeGrowthOutside1X128
         """
+        return self.get_tick_info_batch(pool_key, [tick], block_identifier)[0]
+
+    def get_tick_info_batch(self, pool_key: PoolKey, ticks, block_identifier="latest"):
+        """
+        Get information for several ticks of a pool in a single eth_call.
+
+        Only reads pinned to a block number are cached, keyed by
+        (pool_id, tick): repeated lookups at that block skip the RPC, and
+        the cache is dropped as soon as a different block is queried. It
+        holds at most TICK_INFO_CACHE_SIZE entries. "latest", other tags
+        and block hashes are read directly; resolve "latest" to a number
+        once and pass it in to share the cache across several batches.
+
+        Args:
+            pool_key: The pool's key
+            ticks: List of ticks to query
+            block_identifier: Block to read state at (default: latest)
+
+        Returns:
+            List of tick info dicts, in the same order as ticks
+        """
+        pool_id = self._get_pool_id(pool_key)
+
+        if not isinstance(block_identifier, int):
+            return self._fetch_tick_info(pool_id, ticks, block_identifier)
+
+        if block_identifier != self._tick_info_block:
+            self._tick_info_cache.clear()
+            self._tick_info_block = block_identifier
+
+        cache = self._tick_info_cache
+        missing = [tick for tick in dict.fromkeys(ticks) if (pool_id, tick) not in cache]
+        if missing:
+            fetched = self._fetch_tick_info(pool_id, missing, block_identifier)
+            for tick, info in zip(missing, fetched):
+                cache[(pool_id, tick)] = info
+
+        infos = [cache[(pool_id, tick)] for tick in ticks]
+        while len(cache) > TICK_INFO_CACHE_SIZE:
+            cache.popitem(last=False)
+        return infos
+
+    def _fetch_tick_info(self, pool_id, ticks, block_identifier):
+        """Read tick infos of one pool in a single Multicall3 eth_call"""
         try:
-            pool_id = self._get_pool_id(pool_key)
-            result = self.contract.functions.getTickInfo(
-                pool_id,
-                tick
-            ).call()
-            return {
+            results = self._aggregate(
+                [self.contract.encode_abi("getTickInfo", args=[pool_id, tick])
+                 for tick in ticks],
+                _TICK_INFO_TYPES,
+                block_identifier,
+            )
+        except Exception as e:
+            raise PoolError(f"Failed to get tick info: {e}")
+
+        return [
+            {
                 "liquidity_gross": result[0],
                 "liquidity_net": result[1],
                 "fee_growth_outside_0_x128": result[2],
                 "fee_growth_outside_1_x128": result[3],
             }
-        except Exception as e:
-            raise PoolError(f"Failed to get tick info: {e}")
+            for result in results
+        ]
 
     def get_position_info(
         self,
@@ -130,7 +322,7 @@ class StateView:
         Returns:
             dict with liquidity and fee growth values
         """
-        pool_id = compute_pool_id(pool_key)
+        pool_id = self._get_pool_id(pool_key)
 
         try:
             result = self.contract.functions.getPositionInfo(
@@ -148,6 +340,71 @@ class StateView:
         except Exception as e:
             raise PoolError(f"Failed to get position info: {e}")
 
+    async def get_slot0_async(self, pool_key: PoolKey):
+        """
+        Async version of get_slot0 (always fetches, then updates the cache).
+
+        Args:
+            pool_key: The pool's key
+
+        Returns:
+            dict with sqrtPriceX96, tick, protocolFee, lpFee
+        """
+        pool_id = self._get_pool_id(pool_key)
+        try:
+            result = await self.async_contract.functions.getSlot0(pool_id).call()
+        except Exception as e:
+            raise PoolError(f"Failed to get slot0 for pool: {e}")
+
+        slot0 = self._slot0_dict(result)
+        self._slot0_cache[pool_id] = slot0
+        return slot0
+
+    async def get_liquidity_async(self, pool_key: PoolKey) -> int:
+        """Async version of get_liquidity"""
+        try:
+            return await self.async_contract.functions.getLiquidity(
+                self._get_pool_id(pool_key)
+            ).call()
+        except Exception as e:
+            raise PoolError(f"Failed to get liquidity: {e}")
+
+    async def get_tick_info_async(self, pool_key: PoolKey, tick: int):
+        """Async version of get_tick_info"""
+        try:
+            result = await self.async_contract.functions.getTickInfo(
+                self._get_pool_id(pool_key),
+                tick
+            ).call()
+        except Exception as e:
+            raise PoolError(f"Failed to get tick info: {e}")
+
+        return {
+            "liquidity_gross": result[0],
+            "liquidity_net": result[1],
+            "fee_growth_outside_0_x128": result[2],
+            "fee_growth_outside_1_x128": result[3],
+        }
+
+    async def get_tick_info_many_async(self, pool_key: PoolKey, ticks):
+        """
+        Fetch several ticks of a pool concurrently.
+
+        A failing tick does not cancel the others: its slot in the
+        result list holds the PoolError instead of a tick info dict.
+
+        Args:
+            pool_key: The pool's key
+            ticks: List of ticks to query
+
+        Returns:
+            List of tick info dicts or PoolError, in the same order as ticks
+        """
+        return await asyncio.gather(
+            *(self.get_tick_info_async(pool_key, tick) for tick in ticks),
+            return_exceptions=True,
+        )
+
     @property
     def sqrt_price_x96(self):
         """Get current sqrt price (requires pool_key to be set)"""
@@ -159,5 +416,7 @@ class StateView:
         raise NotImplementedError("Use get_slot0(pool_key) instead")
 
     def clear_cache(self):
-        """Clear the slot0 cache"""
+        """Clear the slot0 and tick info caches"""
         self._slot0_cache = {}
+        self._tick_info_cache.clear()
+        self._tick_info_block = None
@@ -1,8 +1,68 @@
 """V4 action encoding for Position Manager operations"""
 
+from functools import lru_cache
 from typing import List, Tuple
 from eth_abi import encode
-from .types import Actions, PoolKey, ADDRESS_ZERO
+from eth_abi.registry import registry
+from .types import Actions, PoolKey, ADDRESS_ZERO, MIN_SQRT_PRICE_LIMIT, MAX_SQRT_PRICE_LIMIT
+
+# Action sequences that never change between calls
+_ACTIONS_MINT_SETTLE = bytes([Actions.MINT_POSITION, Actions.SETTLE_PAIR])
+_ACTIONS_MINT_SETTLE_SWEEP = bytes(
+    [Actions.MINT_POSITION, Actions.SETTLE_PAIR, Actions.SWEEP]
+)
+_ACTIONS_DECREASE_TAKE = bytes([Actions.DECREASE_LIQUIDITY, Actions.TAKE_PAIR])
+_ACTIONS_BURN = bytes([Actions.BURN_POSITION])
+
+
+# Param layouts for the hot action encoders. The tuple encoders are
+# built once here so each call skips type-string parsing and lookup.
+_MINT_POSITION_TYPES = [
+    "(address,address,uint24,int24,address)",  # PoolKey
+    "int24",      # tickLower
+    "int24",      # tickUpper
+    "uint256",    # liquidity
+    "uint128",    # amount0Max
+    "uint128",    # amount1Max
+    "address",    # recipient
+    "bytes",      # hookData
+]
+_DECREASE_LIQUIDITY_TYPES = [
+    "uint256",    # tokenId
+    "uint256",    # liquidity
+    "uint128",    # amount0Min
+    "uint128",    # amount1Min
+    "bytes",      # hookData
+]
+_BURN_POSITION_TYPES = [
+    "uint256",    # tokenId
+    "uint128",    # amount0Min
+    "uint128",    # amount1Min
+    "bytes",      # hookData
+]
+_SWAP_EXACT_IN_SINGLE_TYPES = [
+    "(address,address,uint24,int24,address)",  # PoolKey
+    "bool",       # zeroForOne
+    "int256",     # amountSpecified (negative for exact input)
+    "uint160",    # sqrtPriceLimitX96
+    "bytes",      # hookData
+]
+
+_MINT_POSITION_ENCODER = registry.get_encoder(f"({','.join(_MINT_POSITION_TYPES)})")
+_DECREASE_LIQUIDITY_ENCODER = registry.get_encoder(f"({','.join(_DECREASE_LIQUIDITY_TYPES)})")
+_BURN_POSITION_ENCODER = registry.get_encoder(f"({','.join(_BURN_POSITION_TYPES)})")
+_SWAP_EXACT_IN_SINGLE_ENCODER = registry.get_encoder(f"({','.join(_SWAP_EXACT_IN_SINGLE_TYPES)})")
+
+
+@lru_cache(maxsize=256)
+def _encode_addresses(*addresses: str) -> bytes:
+    """
+    ABI-encode a fixed list of addresses.
+
+    SETTLE_PAIR, SWEEP and TAKE_PAIR params only contain addresses, and
+    the same pool currencies / recipient show up on almost every call.
+    """
+    return encode(["address"] * len(addresses), list(addresses))
 
 
 def encode_pool_key(pool_key: PoolKey) -> bytes:
@@ -50,21 +110,11 @@ def encode_mint_position(
         (actions_bytes, params_list) for modifyLiquidities call
     """
     # Actions: MINT_POSITION then SETTLE_PAIR
-    actions = bytes([Actions.MINT_POSITION, Actions.SETTLE_PAIR])
+    actions = _ACTIONS_MINT_SETTLE
 
     # Params for MINT_POSITION
-    mint_params = encode(
-        [
-            "(address,address,uint24,int24,address)",  # PoolKey
-            "int24",      # tickLower
-            "int24",      # tickUpper
-            "uint256",    # liquidity
-            "uint128",    # amount0Max
-            "uint128",    # amount1Max
-            "address",    # recipient
-            "bytes",      # hookData
-        ],
-        [
+    mint_params = _MINT_POSITION_ENCODER(
+        (
             pool_key.to_tuple(),
             tick_lower,
             tick_upper,
@@ -73,14 +123,11 @@ def encode_mint_position(
             amount1_max,
             recipient,
             hook_data,
-        ],
+        )
     )
 
     # Params for SETTLE_PAIR - just the currencies
-    settle_params = encode(
-        ["address", "address"],
-        [pool_key.currency0, pool_key.currency1],
-    )
+    settle_params = _encode_addresses(pool_key.currency0, pool_key.currency1)
 
     return actions, [mint_params, settle_params]
 
@@ -104,21 +151,11 @@ def encode_mint_position_with_native_eth(
         (actions_bytes, params_list) for modifyLiquidities call
     """
     # Actions: MINT_POSITION, SETTLE_PAIR, then SWEEP excess ETH
-    actions = bytes([Actions.MINT_POSITION, Actions.SETTLE_PAIR, Actions.SWEEP])
+    actions = _ACTIONS_MINT_SETTLE_SWEEP
 
     # Params for MINT_POSITION
-    mint_params = encode(
-        [
-            "(address,address,uint24,int24,address)",
-            "int24",
-            "int24",
-            "uint256",
-            "uint128",
-            "uint128",
-            "address",
-            "bytes",
-        ],
-        [
+    mint_params = _MINT_POSITION_ENCODER(
+        (
             pool_key.to_tuple(),
             tick_lower,
             tick_upper,
@@ -127,20 +164,14 @@ def encode_mint_position_with_native_eth(
             amount1_max,
             recipient,
             hook_data,
-        ],
+        )
     )
 
     # Params for SETTLE_PAIR
-    settle_params = encode(
-        ["address", "address"],
-        [pool_key.currency0, pool_key.currency1],
-    )
+    settle_params = _encode_addresses(pool_key.currency0, pool_key.currency1)
 
     # Params for SWEEP - sweep native ETH to recipient
-    sweep_params = encode(
-        ["address", "address"],
-        [ADDRESS_ZERO, recipient],
-    )
+    sweep_params = _encode_addresses(ADDRESS_ZERO, recipient)
 
     return actions, [mint_params, settle_params, sweep_params]
 
@@ -168,29 +199,16 @@ def encode_decrease_liquidity(
         (actions_bytes, params_list) for modifyLiquidities call
     """
     # Actions: DECREASE_LIQUIDITY then TAKE_PAIR
-    actions = bytes([Actions.DECREASE_LIQUIDITY, Actions.TAKE_PAIR])
+    actions = _ACTIONS_DECREASE_TAKE
 
     # Params for DECREASE_LIQUIDITY
-    decrease_params = encode(
-        [
-            "uint256",    # tokenId
-            "uint256",    # liquidity
-            "uint128",    # amount0Min
-            "uint128",    # amount1Min
-            "bytes",      # hookData
-        ],
-        [token_id, liquidity, amount0_min, amount1_min, hook_data],
+    decrease_params = _DECREASE_LIQUIDITY_ENCODER(
+        (token_id, liquidity, amount0_min, amount1_min, hook_data)
     )
 
-    # Params for TAKE_PAIR - recipient and settle flag
-    take_params = encode(
-        ["address", "address", "address"],
-        [
-            ADDRESS_ZERO,  # currency0 (resolved from position)
-            ADDRESS_ZERO,  # currency1 (resolved from position)
-            recipient,
-        ],
-    )
+    # Params for TAKE_PAIR - currency0/currency1 placeholders (resolved
+    # from the position) and the recipient
+    take_params = _encode_addresses(ADDRESS_ZERO, ADDRESS_ZERO, recipient)
 
     return actions, [decrease_params, take_params]
 
@@ -223,21 +241,52 @@ def encode_collect_fees(
     )
 
 
-def encode_burn_position(token_id: int) -> Tuple[bytes, List[bytes]]:
+def encode_burn_position(
+    token_id: int,
+    amount0_min: int = 0,
+    amount1_min: int = 0,
+    hook_data: bytes = b"",
+) -> Tuple[bytes, List[bytes]]:
     """
     Encode BURN_POSITION action.
 
+    Burning also removes any liquidity left in the position, so the
+    Position Manager expects the same min amounts and hook data as
+    DECREASE_LIQUIDITY; a bare tokenId makes it revert.
+
     Args:
         token_id: Position NFT token ID to burn
+        amount0_min: Minimum amount of token0 to receive
+        amount1_min: Minimum amount of token1 to receive
+        hook_data: Optional data for hooks
 
     Returns:
         (actions_bytes, params_list) for modifyLiquidities call
     """
-    actions = bytes([Actions.BURN_POSITION])
-    burn_params = encode(["uint256"], [token_id])
+    actions = _ACTIONS_BURN
+    burn_params = _BURN_POSITION_ENCODER((token_id, amount0_min, amount1_min, hook_data))
     return actions, [burn_params]
 
 
+def combine_actions(*encoded: Tuple[bytes, List[bytes]]) -> Tuple[bytes, List[bytes]]:
+    """
+    Concatenate several encoded action groups into one batch.
+
+    modifyLiquidities runs its actions in order inside a single unlock,
+    so e.g. DECREASE_LIQUIDITY + TAKE_PAIR and BURN_POSITION can be sent
+    as one transaction.
+
+    Args:
+        encoded: (actions_bytes, params_list) pairs from the encode_* helpers
+
+    Returns:
+        (actions_bytes, params_list) for modifyLiquidities call
+    """
+    actions = b"".join(group_actions for group_actions, _ in encoded)
+    params = [param for _, group_params in encoded for param in group_params]
+    return actions, params
+
+
 def encode_swap_exact_in_single(
     pool_key: PoolKey,
     zero_for_one: bool,
@@ -260,19 +309,12 @@ def encode_swap_exact_in_single(
     Returns:
         Encoded swap params for Universal Router
     """
-    return encode(
-        [
-            "(address,address,uint24,int24,address)",  # PoolKey
-            "bool",       # zeroForOne
-            "int256",     # amountSpecified (negative for exact input)
-            "uint160",    # sqrtPriceLimitX96
-            "bytes",      # hookData
-        ],
-        [
+    return _SWAP_EXACT_IN_SINGLE_ENCODER(
+        (
             pool_key.to_tuple(),
             zero_for_one,
             -amount_in,  # Negative for exact input
-            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (0 if zero_for_one else 2**160 - 1),
+            sqrt_price_limit_x96 if sqrt_price_limit_x96 else (MIN_SQRT_PRICE_LIMIT if zero_for_one else MAX_SQRT_PRICE_LIMIT),
             hook_data,
-        ],
+        )
     )
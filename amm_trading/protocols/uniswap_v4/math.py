@@ -5,6 +5,8 @@ V4 uses the same concentrated liquidity math as V3.
 This module re-exports V3 math functions for V4 use.
 """
 
+from functools import lru_cache
+
 # V4 uses the same math as V3 for concentrated liquidity
 from ..uniswap_v3.math import (
     Q96,
@@ -17,6 +19,133 @@ from ..uniswap_v3.math import (
     calculate_slippage_amounts,
 )
 
+try:
+    # GMP multiplication/division is noticeably faster on the ~160-bit
+    # intermediates below; plain ints give identical results without it.
+    from gmpy2 import mpz
+except ImportError:
+    mpz = int
+
+
+# TickMath.getSqrtRatioAtTick: Q128 ratios of sqrt(1.0001)^-(2^i), one per tick bit
+_TICK_RATIOS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+MAX_TICK = 887272
+_MAX_UINT256 = (1 << 256) - 1
+
+
+@lru_cache(maxsize=16384)
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """
+    Exact sqrt(1.0001^tick) * 2^96, bit-for-bit equal to the on-chain TickMath.
+
+    Args:
+        tick: Tick value in [-MAX_TICK, MAX_TICK]
+
+    Returns:
+        sqrtPriceX96 for the tick (int)
+    """
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} out of range")
+
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 1 << 128
+    for bit, multiplier in _TICK_RATIOS:
+        if abs_tick & bit:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = _MAX_UINT256 // ratio
+
+    # Q128.128 -> Q64.96, rounding up
+    return (ratio >> 32) + (1 if ratio & 0xffffffff else 0)
+
+
+def get_amount1_for_amount0(
+    sqrt_price_x96: int,
+    sqrt_price_lower_x96: int,
+    sqrt_price_upper_x96: int,
+    amount0: int,
+) -> int:
+    """
+    Amount of token1 that pairs with amount0 for an in-range position.
+
+    Full-precision integer version of
+    amount1 = amount0 * (sqrtP - sqrtA) * sqrtP * sqrtB / (sqrtB - sqrtP).
+
+    Args:
+        sqrt_price_x96: Current sqrt price in X96 format
+        sqrt_price_lower_x96: Lower bound sqrt price in X96 format
+        sqrt_price_upper_x96: Upper bound sqrt price in X96 format
+        amount0: Amount of token0 in wei
+
+    Returns:
+        Amount of token1 in wei (int)
+    """
+    sqrt_price_x96 = min(max(sqrt_price_x96, sqrt_price_lower_x96), sqrt_price_upper_x96)
+    if sqrt_price_x96 == sqrt_price_upper_x96:
+        raise ValueError("Price is at the upper bound; the position takes only token1")
+
+    return (
+        amount0
+        * sqrt_price_x96
+        * sqrt_price_upper_x96
+        * (sqrt_price_x96 - sqrt_price_lower_x96)
+        // ((sqrt_price_upper_x96 - sqrt_price_x96) * Q96 * Q96)
+    )
+
+
+def get_amount0_for_amount1(
+    sqrt_price_x96: int,
+    sqrt_price_lower_x96: int,
+    sqrt_price_upper_x96: int,
+    amount1: int,
+) -> int:
+    """
+    Amount of token0 that pairs with amount1 for an in-range position.
+
+    Inverse of get_amount1_for_amount0, in full-precision integer math.
+
+    Args:
+        sqrt_price_x96: Current sqrt price in X96 format
+        sqrt_price_lower_x96: Lower bound sqrt price in X96 format
+        sqrt_price_upper_x96: Upper bound sqrt price in X96 format
+        amount1: Amount of token1 in wei
+
+    Returns:
+        Amount of token0 in wei (int)
+    """
+    sqrt_price_x96 = min(max(sqrt_price_x96, sqrt_price_lower_x96), sqrt_price_upper_x96)
+    if sqrt_price_x96 == sqrt_price_lower_x96:
+        raise ValueError("Price is at the lower bound; the position takes only token0")
+
+    return (
+        amount1
+        * (sqrt_price_upper_x96 - sqrt_price_x96)
+        * Q96
+        * Q96
+        // (sqrt_price_x96 * sqrt_price_upper_x96 * (sqrt_price_x96 - sqrt_price_lower_x96))
+    )
+
 
 def calculate_liquidity_from_amounts(
     sqrt_price_x96: int,
@@ -38,17 +167,16 @@ def calculate_liquidity_from_amounts(
         amount1: Amount of token1 in wei
 
     Returns:
-        Liquidity amount
+        Liquidity amount (int)
     """
-    sqrt_price_lower = tick_to_sqrt_price(tick_lower) * Q96
-    sqrt_price_upper = tick_to_sqrt_price(tick_upper) * Q96
-    sqrt_price_current = sqrt_price_x96
+    # Same sqrt prices the pool uses for the range bounds
+    sqrt_price_lower = mpz(get_sqrt_ratio_at_tick(tick_lower))
+    sqrt_price_upper = mpz(get_sqrt_ratio_at_tick(tick_upper))
+    amount0 = mpz(amount0)
+    amount1 = mpz(amount1)
 
     # Clamp current price to range
-    if sqrt_price_current < sqrt_price_lower:
-        sqrt_price_current = sqrt_price_lower
-    elif sqrt_price_current > sqrt_price_upper:
-        sqrt_price_current = sqrt_price_upper
+    sqrt_price_current = min(max(mpz(sqrt_price_x96), sqrt_price_lower), sqrt_price_upper)
 
     # Calculate liquidity from each token
     liquidity0 = 0
@@ -69,10 +197,34 @@ def calculate_liquidity_from_amounts(
 
     # Return the minimum (limiting factor)
     if liquidity0 == 0:
-        return liquidity1
+        return int(liquidity1)
     if liquidity1 == 0:
-        return liquidity0
-    return min(liquidity0, liquidity1)
+        return int(liquidity0)
+    return int(min(liquidity0, liquidity1))
+
+
+def calculate_liquidity_from_amounts_batch(
+    sqrt_prices_x96,
+    tick_lowers,
+    tick_uppers,
+    amounts0,
+    amounts1,
+):
+    """
+    Calculate liquidity for many (price, range, amounts) combinations.
+
+    Useful when sizing positions over a grid of tick ranges. All inputs
+    are equal-length sequences.
+
+    Returns:
+        List of liquidity amounts, one per input row
+    """
+    calc = calculate_liquidity_from_amounts
+    return [
+        calc(sqrt_price_x96, tick_lower, tick_upper, amount0, amount1)
+        for sqrt_price_x96, tick_lower, tick_upper, amount0, amount1
+        in zip(sqrt_prices_x96, tick_lowers, tick_uppers, amounts0, amounts1)
+    ]
 
 
 __all__ = [
@@ -85,4 +237,9 @@ __all__ = [
     "get_amounts_from_liquidity",
     "calculate_slippage_amounts",
     "calculate_liquidity_from_amounts",
+    "calculate_liquidity_from_amounts_batch",
+    "MAX_TICK",
+    "get_sqrt_ratio_at_tick",
+    "get_amount0_for_amount1",
+    "get_amount1_for_amount0",
 ]
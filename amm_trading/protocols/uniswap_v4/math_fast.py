@@ -0,0 +1,299 @@
+"""
+Float64 and NumPy-vectorized versions of the Uniswap V4 position math.
+
+The integer functions in math.py are authoritative and must be used for
+any value that goes on-chain. The variants here are for display, range
+search and scanning many positions at once; they follow the float formulas
+of math.py (no fastmath reassociation) and agree with them to within
+float64 rounding error.
+
+If numba is installed the scalar functions are JIT-compiled; otherwise
+they run as plain Python with the same results. The vectorized variants need
+numpy. Install both with the "fast" extra.
+"""
+
+import math
+
+from .math import tick_to_sqrt_price
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# ln(1.0001); exp(tick * ln(1.0001)) is cheaper than 1.0001 ** tick
+_LN_TICK_BASE = math.log(1.0001)
+
+
+def _float_array(values, convert):
+    """
+    Apply a Python-level float conversion to each element, keeping the shape.
+
+    Used where the result must match math.py bit for bit: numpy's power()
+    can round differently from Python's, and the amount formulas subtract
+    nearly equal sqrt prices at the range edges, which magnifies that
+    difference.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=object)
+    return np.asarray(
+        [convert(value) for value in np.ravel(values)], dtype=np.float64
+    ).reshape(values.shape)
+
+
+@njit(cache=True)
+def calculate_liquidity_from_amounts_f64(
+    sqrt_price: float,
+    tick_lower: int,
+    tick_upper: int,
+    amount0: float,
+    amount1: float,
+) -> float:
+    """
+    Float64 version of calculate_liquidity_from_amounts.
+
+    For approximate range search; refine the chosen range with the
+    integer version before minting.
+
+    Args:
+        sqrt_price: Current sqrt price as a plain float (sqrt_price_x96 / Q96)
+        tick_lower: Lower tick of the range
+        tick_upper: Upper tick of the range
+        amount0: Amount of token0 in wei
+        amount1: Amount of token1 in wei
+
+    Returns:
+        Approximate liquidity amount (float)
+    """
+    sqrt_price_lower = math.pow(1.0001, tick_lower / 2.0)
+    sqrt_price_upper = math.pow(1.0001, tick_upper / 2.0)
+
+    # Clamp current price to range
+    sqrt_price_current = min(max(sqrt_price, sqrt_price_lower), sqrt_price_upper)
+
+    liquidity0 = 0.0
+    liquidity1 = 0.0
+
+    if amount0 > 0 and sqrt_price_current < sqrt_price_upper:
+        liquidity0 = (
+            amount0
+            * sqrt_price_current
+            * sqrt_price_upper
+            / (sqrt_price_upper - sqrt_price_current)
+        )
+
+    if amount1 > 0 and sqrt_price_current > sqrt_price_lower:
+        liquidity1 = amount1 / (sqrt_price_current - sqrt_price_lower)
+
+    # Return the minimum (limiting factor)
+    if liquidity0 == 0.0:
+        return liquidity1
+    if liquidity1 == 0.0:
+        return liquidity0
+    return min(liquidity0, liquidity1)
+
+
+@njit(cache=True)
+def tick_to_price_f64(tick: int, decimals0: int, decimals1: int) -> float:
+    """
+    Float64 version of tick_to_price.
+
+    Args:
+        tick: Tick value
+        decimals0: Token0 decimals
+        decimals1: Token1 decimals
+
+    Returns:
+        Approximate price as token1/token0
+    """
+    return math.exp(tick * _LN_TICK_BASE) * 10.0 ** (decimals0 - decimals1)
+
+
+@njit(cache=True)
+def get_amounts_from_liquidity_f64(
+    liquidity: float,
+    sqrt_price: float,
+    tick: int,
+    tick_lower: int,
+    tick_upper: int,
+    decimals0: int,
+    decimals1: int,
+):
+    """
+    Float64 version of get_amounts_from_liquidity.
+
+    Args:
+        liquidity: Position liquidity
+        sqrt_price: Current sqrt price as a plain float (sqrt_price_x96 / Q96)
+        tick: Current tick
+        tick_lower: Position lower tick
+        tick_upper: Position upper tick
+        decimals0: Token0 decimals
+        decimals1: Token1 decimals
+
+    Returns:
+        (amount0, amount1) in human-readable format
+    """
+    # Same pow as tick_to_sqrt_price, so the edge-of-range subtraction matches
+    sqrt_pl = 1.0001 ** (tick_lower / 2.0)
+    sqrt_pu = 1.0001 ** (tick_upper / 2.0)
+
+    if tick < tick_lower:
+        # Price below range: all token0
+        return liquidity * (1.0 / sqrt_pl - 1.0 / sqrt_pu) / 10.0 ** decimals0, 0.0
+    if tick > tick_upper:
+        # Price above range: all token1
+        return 0.0, liquidity * (sqrt_pu - sqrt_pl) / 10.0 ** decimals1
+
+    # Price in range: mix of both
+    amount0 = liquidity * (1.0 / sqrt_price - 1.0 / sqrt_pu) / 10.0 ** decimals0
+    amount1 = liquidity * (sqrt_price - sqrt_pl) / 10.0 ** decimals1
+    return amount0, amount1
+
+
+def calculate_liquidity_from_amounts_vec(
+    sqrt_prices,
+    tick_lowers,
+    tick_uppers,
+    amounts0,
+    amounts1,
+):
+    """
+    NumPy-vectorized float64 version of calculate_liquidity_from_amounts.
+
+    Evaluates a whole grid of candidates in one call. Arguments may be
+    arrays or scalars and are broadcast against each other, e.g. a single
+    sqrt price against arrays of tick ranges. Requires numpy.
+
+    Args:
+        sqrt_prices: Current sqrt price(s) as plain floats (sqrt_price_x96 / Q96)
+        tick_lowers: Lower tick(s) of the ranges
+        tick_uppers: Upper tick(s) of the ranges
+        amounts0: Amount(s) of token0 in wei
+        amounts1: Amount(s) of token1 in wei
+
+    Returns:
+        numpy.ndarray of approximate liquidity amounts (float64)
+    """
+    import numpy as np
+
+    sqrt_prices = np.asarray(sqrt_prices, dtype=np.float64)
+    amounts0 = np.asarray(amounts0, dtype=np.float64)
+    amounts1 = np.asarray(amounts1, dtype=np.float64)
+    sqrt_price_lower = np.power(1.0001, np.asarray(tick_lowers, dtype=np.float64) / 2.0)
+    sqrt_price_upper = np.power(1.0001, np.asarray(tick_uppers, dtype=np.float64) / 2.0)
+
+    # Clamp current price to range
+    sqrt_price_current = np.clip(sqrt_prices, sqrt_price_lower, sqrt_price_upper)
+
+    # Masked branches; the inner where() keeps masked-out lanes from dividing by zero
+    mask0 = (amounts0 > 0) & (sqrt_price_current < sqrt_price_upper)
+    liquidity0 = np.where(
+        mask0,
+        amounts0 * sqrt_price_current * sqrt_price_upper
+        / np.where(mask0, sqrt_price_upper - sqrt_price_current, 1.0),
+        0.0,
+    )
+
+    mask1 = (amounts1 > 0) & (sqrt_price_current > sqrt_price_lower)
+    liquidity1 = np.where(
+        mask1,
+        amounts1 / np.where(mask1, sqrt_price_current - sqrt_price_lower, 1.0),
+        0.0,
+    )
+
+    # Return the minimum (limiting factor), ignoring a side that is zero
+    return np.where(
+        liquidity0 == 0.0,
+        liquidity1,
+        np.where(liquidity1 == 0.0, liquidity0, np.minimum(liquidity0, liquidity1)),
+    )
+
+
+def tick_to_price_vec(ticks, decimals0, decimals1):
+    """
+    NumPy-vectorized version of tick_to_price.
+
+    Args:
+        ticks: Tick value(s)
+        decimals0: Token0 decimals (scalar or array)
+        decimals1: Token1 decimals (scalar or array)
+
+    Returns:
+        numpy.ndarray of prices as token1/token0 (float64)
+    """
+    import numpy as np
+
+    ticks = np.asarray(ticks, dtype=np.float64)
+    decimals_diff = np.asarray(decimals0, dtype=np.float64) - np.asarray(decimals1, dtype=np.float64)
+    return np.power(1.0001, ticks) * np.power(10.0, decimals_diff)
+
+
+def get_amounts_from_liquidity_vec(
+    liquidity,
+    sqrt_price_x96,
+    tick,
+    tick_lower,
+    tick_upper,
+    decimals0,
+    decimals1,
+):
+    """
+    NumPy-vectorized version of get_amounts_from_liquidity.
+
+    All arguments may be arrays (one entry per position) or scalars and
+    are broadcast against each other. Requires numpy.
+
+    Args:
+        liquidity: Position liquidity
+        sqrt_price_x96: Current sqrt price (X96 format)
+        tick: Current tick
+        tick_lower: Position lower tick
+        tick_upper: Position upper tick
+        decimals0: Token0 decimals
+        decimals1: Token1 decimals
+
+    Returns:
+        (amount0, amount1) numpy.ndarrays in human-readable format
+    """
+    import numpy as np
+
+    liquidity = np.asarray(liquidity, dtype=np.float64)
+    # sqrtPriceX96 exceeds int64, so convert through Python floats
+    sqrt_price = _float_array(sqrt_price_x96, float) / float(2 ** 96)
+    tick = np.asarray(tick)
+    tick_lower = np.asarray(tick_lower)
+    tick_upper = np.asarray(tick_upper)
+    scale0 = np.power(10.0, np.asarray(decimals0, dtype=np.float64))
+    scale1 = np.power(10.0, np.asarray(decimals1, dtype=np.float64))
+
+    # Range bounds computed exactly as the scalar path does, so a position
+    # gets the same amounts whichever path _derive_batch picks
+    sqrt_pl = _float_array(tick_lower, lambda t: tick_to_sqrt_price(int(t)))
+    sqrt_pu = _float_array(tick_upper, lambda t: tick_to_sqrt_price(int(t)))
+
+    below = tick < tick_lower
+    above = tick > tick_upper
+
+    # Current sqrt price, pinned to the range edge when out of range
+    sqrt_pc = np.where(below, sqrt_pl, np.where(above, sqrt_pu, sqrt_price))
+
+    amount0 = np.where(above, 0.0, liquidity * (1 / sqrt_pc - 1 / sqrt_pu) / scale0)
+    amount1 = np.where(below, 0.0, liquidity * (sqrt_pc - sqrt_pl) / scale1)
+
+    return amount0, amount1
+
+
+__all__ = [
+    "calculate_liquidity_from_amounts_f64",
+    "calculate_liquidity_from_amounts_vec",
+    "tick_to_price_f64",
+    "get_amounts_from_liquidity_f64",
+    "tick_to_price_vec",
+    "get_amounts_from_liquidity_vec",
+]
@@ -1,22 +1,45 @@
 """Liquidity management operations for Uniswap V4"""
 
+import logging
+import warnings
+import math
+import sys
 import time
+from decimal import Decimal
+from eth_abi import decode
 from ....core.connection import Web3Manager
 from ..config import UniswapV4Config
 from ....core.exceptions import InsufficientBalanceError, PositionError
 from ....contracts.erc20 import ERC20
 from ..contracts.position_manager import PositionManager
 from ..contracts.state_view import StateView
+from ..encoding import combine_actions, encode_burn_position, encode_decrease_liquidity
 from ..types import PoolKey, ADDRESS_ZERO, create_pool_key, is_native_eth, sort_currencies
 from ..math import (
     round_tick_to_spacing,
     calculate_slippage_amounts,
-    price_to_tick,
     tick_to_price,
     calculate_liquidity_from_amounts,
+    get_sqrt_ratio_at_tick,
+    get_amount0_for_amount1,
+    get_amount1_for_amount0,
 )
 from ...base import BaseLiquidityManager
 
+logger = logging.getLogger(__name__)
+
+_LN_TICK_BASE = math.log(1.0001)
+
+
+def _tick_at_percent(current_tick, percent):
+    """
+    Tick whose price is current price * (1 + percent).
+
+    Works in tick space directly (log1p is accurate for small percentages)
+    instead of converting tick -> price -> tick.
+    """
+    return current_tick + round(math.log1p(percent) / _LN_TICK_BASE)
+
 
 class LiquidityManager(BaseLiquidityManager):
     """
@@ -38,6 +61,14 @@ class LiquidityManager(BaseLiquidityManager):
         self.config = UniswapV4Config()
         self.position_manager = PositionManager(self.manager)
         self.state_view = StateView(self.manager)
+        # Token metadata is immutable, so contracts and 10**decimals are
+        # kept per address for the lifetime of the manager
+        self._erc20_cache = {}
+        self._scale_cache = {}
+        self._pair_cache = {}
+        # Known allowance per (token, spender), so approvals are only
+        # checked on-chain once
+        self._approved = {}
 
     def _get_token_address(self, symbol_or_address):
         """
@@ -47,41 +78,161 @@ class LiquidityManager(BaseLiquidityManager):
         """
         if symbol_or_address.upper() == "ETH":
             return ADDRESS_ZERO
-        return self.manager.checksum(self.config.get_token_address(symbol_or_address))
+        # Interned so repeated PoolKey hashing/equality compares by identity
+        return sys.intern(self.manager.checksum(self.config.get_token_address(symbol_or_address)))
+
+    def _resolve_pair(self, token0, token1):
+        """
+        Resolve and sort a token pair (cached per input pair).
+
+        Args:
+            token0: Token0 symbol or address (or 'ETH' for native)
+            token1: Token1 symbol or address
+
+        Returns:
+            (token0_addr, token1_addr, currency0, currency1, swapped)
+        """
+        key = (token0, token1)
+        pair = self._pair_cache.get(key)
+        if pair is None:
+            token0_addr = self._get_token_address(token0)
+            token1_addr = self._get_token_address(token1)
+            currency0, currency1 = sort_currencies(token0_addr, token1_addr)
+            pair = self._pair_cache[key] = (
+                token0_addr, token1_addr, currency0, currency1, currency0 != token0_addr
+            )
+        return pair
 
     def _get_token_contract(self, address):
-        """Get ERC20 contract or None for native ETH"""
+        """Get ERC20 contract (cached per address) or None for native ETH"""
         if is_native_eth(address):
             return None
-        return ERC20(self.manager, address)
+        token = self._erc20_cache.get(address)
+        if token is None:
+            token = self._erc20_cache[address] = ERC20(self.manager, address)
+        return token
 
     def _get_token_decimals(self, address):
         """Get token decimals, 18 for native ETH"""
         if is_native_eth(address):
             return 18
-        return ERC20(self.manager, address).decimals
+        return self._get_token_contract(address).decimals
 
     def _get_token_symbol(self, address):
         """Get token symbol, 'ETH' for native ETH"""
         if is_native_eth(address):
             return "ETH"
-        return ERC20(self.manager, address).symbol
+        return self._get_token_contract(address).symbol
+
+    def _get_token_scale(self, address):
+        """Get 10 ** decimals for a token (cached per address)"""
+        scale = self._scale_cache.get(address)
+        if scale is None:
+            scale = self._scale_cache[address] = 10 ** self._get_token_decimals(address)
+        return scale
 
     def _to_wei(self, amount, address):
-        """Convert human amount to wei"""
-        decimals = self._get_token_decimals(address)
-        return int(amount * (10 ** decimals))
+        """Convert human amount to wei (exact decimal scaling, no float multiply)"""
+        return int(Decimal(str(amount)) * self._get_token_scale(address))
 
     def _from_wei(self, amount_wei, address):
         """Convert wei to human amount"""
-        decimals = self._get_token_decimals(address)
-        return amount_wei / (10 ** decimals)
+        return amount_wei / self._get_token_scale(address)
 
     def _get_balance(self, address):
         """Get balance in wei (native ETH or ERC20)"""
         if is_native_eth(address):
             return self.manager.w3.eth.get_balance(self.manager.address)
-        return ERC20(self.manager, address).balance_of()
+        return self._get_token_contract(address).balance_of()
+
+    def _ensure_approval(self, address, amount_wei):
+        """
+        Make sure PositionManager may spend amount_wei of a token.
+
+        Approves MAX_UINT256 when the allowance is short, so each token
+        needs at most one approval tx. The allowance is tracked in memory
+        and only read on-chain the first time a token is used.
+
+        Returns:
+            True if an approval tx was sent
+        """
+        spender = self.position_manager.address
+        key = (address, spender)
+
+        allowance = self._approved.get(key)
+        sent = False
+        if allowance is None or allowance < amount_wei:
+            token = self._get_token_contract(address)
+            allowance = token.allowance(spender)
+            if allowance < amount_wei:
+                token.approve(spender, self.config.MAX_UINT256)
+                allowance = self.config.MAX_UINT256
+                sent = True
+
+        # Infinite allowances are not decreased by transferFrom
+        if allowance != self.config.MAX_UINT256:
+            allowance -= amount_wei
+        self._approved[key] = allowance
+        return sent
+
+    def _preflight_reads(self, currency0, currency1, pool_key, slot0=None):
+        """
+        Read decimals, balances and slot0 for add_liquidity.
+
+        All reads go out as a single Multicall3 eth_call. If the multicall
+        fails, the values are fetched with individual calls instead.
+
+        Args:
+            slot0: Already-fetched slot0 for pool_key; skips reading it again
+
+        Returns:
+            (decimals0, decimals1, balance0, balance1, slot0)
+        """
+        try:
+            return self._preflight_reads_multicall(currency0, currency1, pool_key, slot0)
+        except Exception:
+            return (
+                self._get_token_decimals(currency0),
+                self._get_token_decimals(currency1),
+                self._get_balance(currency0),
+                self._get_balance(currency1),
+                slot0 if slot0 is not None else self.state_view.get_slot0(pool_key),
+            )
+
+    def _preflight_reads_multicall(self, currency0, currency1, pool_key, slot0=None):
+        """Multicall3 implementation of _preflight_reads"""
+        multicall = self.state_view.multicall
+        owner = self.manager.address
+
+        calls = []
+        for currency in (currency0, currency1):
+            if is_native_eth(currency):
+                calls.append(multicall.eth_balance_call(owner))
+            else:
+                token = self._get_token_contract(currency).contract
+                calls.append((currency, token.encode_abi("decimals")))
+                calls.append((currency, token.encode_abi("balanceOf", args=[owner])))
+        if slot0 is None:
+            calls.append(self.state_view.slot0_call(pool_key))
+
+        results = iter(
+            return_data for _, return_data in multicall.aggregate3(calls)
+        )
+
+        decimals = []
+        balances = []
+        for currency in (currency0, currency1):
+            if is_native_eth(currency):
+                decimals.append(18)
+            else:
+                token_decimals = decode(["uint8"], next(results))[0]
+                self._scale_cache[currency] = 10 ** token_decimals
+                decimals.append(token_decimals)
+            balances.append(decode(["uint256"], next(results))[0])
+        if slot0 is None:
+            slot0 = self.state_view.decode_slot0(next(results))
+
+        return decimals[0], decimals[1], balances[0], balances[1], slot0
 
     def calculate_optimal_amounts(
         self,
@@ -93,6 +244,7 @@ class LiquidityManager(BaseLiquidityManager):
         amount0_desired=None,
         amount1_desired=None,
         hooks=ADDRESS_ZERO,
+        _slot0_override=None,
     ):
         """
         Calculate optimal token amounts for a liquidity position.
@@ -106,6 +258,7 @@ class LiquidityManager(BaseLiquidityManager):
             amount0_desired: Desired amount of token0 (if None, calculated from amount1)
             amount1_desired: Desired amount of token1 (if None, calculated from amount0)
             hooks: Hooks contract address (default: no hooks)
+            _slot0_override: Already-fetched slot0 for this pool (internal)
 
         Returns:
             Dict with optimal amounts and position details
@@ -114,13 +267,8 @@ class LiquidityManager(BaseLiquidityManager):
            (amount0_desired is not None and amount1_desired is not None):
             raise ValueError("Must specify exactly one of amount0_desired or amount1_desired")
 
-        # Resolve token addresses
-        token0_addr = self._get_token_address(token0)
-        token1_addr = self._get_token_address(token1)
-
-        # Ensure correct token order
-        currency0, currency1 = sort_currencies(token0_addr, token1_addr)
-        swapped = currency0 != token0_addr
+        # Resolve token addresses and ensure correct token order
+        _, _, currency0, currency1, swapped = self._resolve_pair(token0, token1)
 
         if swapped:
             if amount0_desired is not None:
@@ -147,14 +295,14 @@ class LiquidityManager(BaseLiquidityManager):
         )
 
         # Get pool state
-        slot0 = self.state_view.get_slot0(pool_key)
+        slot0 = _slot0_override
+        if slot0 is None:
+            slot0 = self.state_view.get_slot0(pool_key)
         current_tick = slot0["tick"]
         sqrt_price_x96 = slot0["sqrt_price_x96"]
 
         # Calculate prices
         current_price = tick_to_price(current_tick, decimals0, decimals1)
-        price_lower = tick_to_price(tick_lower, decimals0, decimals1)
-        price_upper = tick_to_price(tick_upper, decimals0, decimals1)
 
         # Determine position type and calculate amounts
         if current_tick < tick_lower:
@@ -175,23 +323,32 @@ class LiquidityManager(BaseLiquidityManager):
             calculated_amount1 = amount1_desired
         else:
             position_type = "in_range"
-            sqrt_price_raw = sqrt_price_x96 / (2 ** 96)
-            sqrt_pl_raw = 1.0001 ** (tick_lower / 2)
-            sqrt_pu_raw = 1.0001 ** (tick_upper / 2)
-
-            decimal_adjustment = 10 ** ((decimals0 - decimals1) / 2)
-            sqrt_price = sqrt_price_raw * decimal_adjustment
-            sqrt_pl = sqrt_pl_raw * decimal_adjustment
-            sqrt_pu = sqrt_pu_raw * decimal_adjustment
+            # Integer X96 math; only the returned amounts are converted to float
+            sqrt_price_lower_x96 = get_sqrt_ratio_at_tick(tick_lower)
+            sqrt_price_upper_x96 = get_sqrt_ratio_at_tick(tick_upper)
 
             if amount0_desired is not None:
                 calculated_amount0 = amount0_desired
-                calculated_amount1 = amount0_desired * \
-                    (sqrt_price - sqrt_pl) / (1/sqrt_price - 1/sqrt_pu)
+                amount1_wei = get_amount1_for_amount0(
+                    sqrt_price_x96,
+                    sqrt_price_lower_x96,
+                    sqrt_price_upper_x96,
+                    self._to_wei(amount0_desired, currency0),
+                )
+                calculated_amount1 = self._from_wei(amount1_wei, currency1)
             else:
                 calculated_amount1 = amount1_desired
-                calculated_amount0 = amount1_desired * \
-                    (1/sqrt_price - 1/sqrt_pu) / (sqrt_price - sqrt_pl)
+                amount0_wei = get_amount0_for_amount1(
+                    sqrt_price_x96,
+                    sqrt_price_lower_x96,
+                    sqrt_price_upper_x96,
+                    self._to_wei(amount1_desired, currency1),
+                )
+                calculated_amount0 = self._from_wei(amount0_wei, currency0)
+
+        # Range bounds are only needed once the request has been validated
+        price_lower = tick_to_price(tick_lower, decimals0, decimals1)
+        price_upper = tick_to_price(tick_upper, decimals0, decimals1)
 
         result = {
             "token0": {
@@ -240,9 +397,7 @@ class LiquidityManager(BaseLiquidityManager):
 
         Convenience wrapper around calculate_optimal_amounts().
         """
-        token0_addr = self._get_token_address(token0)
-        token1_addr = self._get_token_address(token1)
-        currency0, currency1 = sort_currencies(token0_addr, token1_addr)
+        _, _, currency0, currency1, _ = self._resolve_pair(token0, token1)
 
         tick_spacing = self.config.get_tick_spacing(fee)
         pool_key = PoolKey(
@@ -254,23 +409,17 @@ class LiquidityManager(BaseLiquidityManager):
         )
 
         slot0 = self.state_view.get_slot0(pool_key)
-        decimals0 = self._get_token_decimals(currency0)
-        decimals1 = self._get_token_decimals(currency1)
-
-        current_price = tick_to_price(slot0["tick"], decimals0, decimals1)
-
-        price_lower = current_price * (1 + percent_lower)
-        price_upper = current_price * (1 + percent_upper)
 
-        tick_lower = price_to_tick(price_lower, decimals0, decimals1)
-        tick_upper = price_to_tick(price_upper, decimals0, decimals1)
+        tick_lower = _tick_at_percent(slot0["tick"], percent_lower)
+        tick_upper = _tick_at_percent(slot0["tick"], percent_upper)
 
         tick_lower = round_tick_to_spacing(tick_lower, tick_spacing)
         tick_upper = round_tick_to_spacing(tick_upper, tick_spacing)
 
         return self.calculate_optimal_amounts(
             token0, token1, fee, tick_lower, tick_upper,
-            amount0_desired, amount1_desired, hooks
+            amount0_desired, amount1_desired, hooks,
+            _slot0_override=slot0,
         )
 
     def add_liquidity(
@@ -284,6 +433,7 @@ class LiquidityManager(BaseLiquidityManager):
         amount1,
         slippage_bps=50,
         hooks=ADDRESS_ZERO,
+        _slot0_override=None,
         **kwargs
     ):
         """
@@ -301,23 +451,16 @@ class LiquidityManager(BaseLiquidityManager):
             amount1: Amount of token1 (human readable)
             slippage_bps: Slippage tolerance in basis points
             hooks: Hooks contract address (default: no hooks)
+            _slot0_override: Already-fetched slot0 for this pool (internal)
 
         Returns:
             Dict with receipt and token_id
         """
-        token0_addr = self._get_token_address(token0)
-        token1_addr = self._get_token_address(token1)
-
-        # Sort currencies
-        currency0, currency1 = sort_currencies(token0_addr, token1_addr)
-        swapped = currency0 != token0_addr
+        # Resolve and sort currencies
+        _, _, currency0, currency1, swapped = self._resolve_pair(token0, token1)
         if swapped:
             amount0, amount1 = amount1, amount0
 
-        # Get token info
-        decimals0 = self._get_token_decimals(currency0)
-        decimals1 = self._get_token_decimals(currency1)
-
         # Round ticks to valid values
         tick_spacing = self.config.get_tick_spacing(fee)
         tick_lower = round_tick_to_spacing(tick_lower, tick_spacing)
@@ -326,14 +469,25 @@ class LiquidityManager(BaseLiquidityManager):
         if tick_lower >= tick_upper:
             raise ValueError(f"Invalid tick range: {tick_lower} >= {tick_upper}")
 
+        # Create pool key
+        pool_key = PoolKey(
+            currency0=currency0,
+            currency1=currency1,
+            fee=fee,
+            tick_spacing=tick_spacing,
+            hooks=hooks,
+        )
+
+        # Decimals, balances and pool state in one round trip
+        decimals0, decimals1, balance0, balance1, slot0 = self._preflight_reads(
+            currency0, currency1, pool_key, _slot0_override
+        )
+
         # Convert to wei
         amount0_wei = self._to_wei(amount0, currency0)
         amount1_wei = self._to_wei(amount1, currency1)
 
         # Check balances
-        balance0 = self._get_balance(currency0)
-        balance1 = self._get_balance(currency1)
-
         if balance0 < amount0_wei:
             raise InsufficientBalanceError(
                 f"Insufficient {self._get_token_symbol(currency0)} balance"
@@ -344,26 +498,15 @@ class LiquidityManager(BaseLiquidityManager):
             )
 
         # Approve ERC20 tokens (not needed for native ETH)
+        approved = False
         if not is_native_eth(currency0):
-            ERC20(self.manager, currency0).approve(
-                self.position_manager.address, amount0_wei
-            )
+            approved |= self._ensure_approval(currency0, amount0_wei)
         if not is_native_eth(currency1):
-            ERC20(self.manager, currency1).approve(
-                self.position_manager.address, amount1_wei
-            )
+            approved |= self._ensure_approval(currency1, amount1_wei)
 
-        # Create pool key
-        pool_key = PoolKey(
-            currency0=currency0,
-            currency1=currency1,
-            fee=fee,
-            tick_spacing=tick_spacing,
-            hooks=hooks,
-        )
-
-        # Get current pool state for liquidity calculation
-        slot0 = self.state_view.get_slot0(pool_key)
+        # Approval txs take blocks to confirm; re-read the price if any were sent
+        if approved:
+            slot0 = self.state_view.get_slot0(pool_key)
 
         # Calculate liquidity from amounts
         liquidity = calculate_liquidity_from_amounts(
@@ -421,9 +564,7 @@ class LiquidityManager(BaseLiquidityManager):
                 f"Invalid percentage range: {percent_lower} >= {percent_upper}"
             )
 
-        token0_addr = self._get_token_address(token0)
-        token1_addr = self._get_token_address(token1)
-        currency0, currency1 = sort_currencies(token0_addr, token1_addr)
+        token0_addr, token1_addr, currency0, currency1, _ = self._resolve_pair(token0, token1)
 
         decimals0 = self._get_token_decimals(currency0)
         decimals1 = self._get_token_decimals(currency1)
@@ -443,15 +584,15 @@ class LiquidityManager(BaseLiquidityManager):
         price_lower = current_price * (1 + percent_lower)
         price_upper = current_price * (1 + percent_upper)
 
-        tick_lower = price_to_tick(price_lower, decimals0, decimals1)
-        tick_upper = price_to_tick(price_upper, decimals0, decimals1)
+        tick_lower = _tick_at_percent(slot0["tick"], percent_lower)
+        tick_upper = _tick_at_percent(slot0["tick"], percent_upper)
 
         tick_lower = round_tick_to_spacing(tick_lower, tick_spacing)
         tick_upper = round_tick_to_spacing(tick_upper, tick_spacing)
 
-        print(f"Current price: {current_price:.6f}")
-        print(f"Price range: {price_lower:.6f} to {price_upper:.6f}")
-        print(f"Tick range: {tick_lower} to {tick_upper}")
+        logger.debug("Current price: %.6f", current_price)
+        logger.debug("Price range: %.6f to %.6f", price_lower, price_upper)
+        logger.debug("Tick range: %d to %d", tick_lower, tick_upper)
 
         result = self.add_liquidity(
             token0_addr,
@@ -463,6 +604,7 @@ class LiquidityManager(BaseLiquidityManager):
             amount1,
             slippage_bps,
             hooks,
+            _slot0_override=slot0,
         )
 
         result["current_price"] = current_price
@@ -473,19 +615,34 @@ class LiquidityManager(BaseLiquidityManager):
 
         return result
 
-    def remove_liquidity(self, token_id, percentage, collect_fees=True, burn=False, **kwargs):
+    def remove_liquidity(self, token_id, percentage, collect_fees=None, burn=False, **kwargs):
         """
         Remove liquidity from a position.
 
+        Decrease, fee collection and burn go out as one modifyLiquidities
+        transaction, so every receipt key in the result refers to that
+        same transaction.
+
         Args:
             token_id: Position NFT token ID
             percentage: Percentage of liquidity to remove (0-100)
-            collect_fees: Whether to collect fees after removal
+            collect_fees: Deprecated. In V4, decreasing liquidity always
+                credits the accrued fees, which TAKE_PAIR then takes, so
+                collect_fees=False cannot be honoured and only warns.
             burn: Whether to burn the position NFT (only for 100% removal)
 
         Returns:
-            Dict with transaction receipts
+            Dict with 'receipt' (also under the old 'decrease_receipt',
+            'collect_receipt' and, when burned, 'burn_receipt' keys)
         """
+        if collect_fees is False:
+            warnings.warn(
+                "collect_fees=False has no effect on Uniswap V4: accrued fees are "
+                "always taken with the removed liquidity",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+
         owner = self.position_manager.owner_of(token_id)
         if owner.lower() != self.manager.address.lower():
             raise PositionError(
@@ -493,7 +650,7 @@ class LiquidityManager(BaseLiquidityManager):
             )
 
         pos = self.position_manager.get_position(token_id)
-        liquidity = pos["liquidity"]
+        liquidity = pos.liquidity
 
         if liquidity == 0:
             raise PositionError(f"Position {token_id} has no liquidity")
@@ -508,22 +665,35 @@ class LiquidityManager(BaseLiquidityManager):
 
         result = {"token_id": token_id}
 
-        # Decrease liquidity
-        receipt = self.position_manager.decrease_liquidity(
-            token_id, liquidity_to_remove
-        )
-        result["decrease_receipt"] = receipt
-
-        # In V4, collect_fees is done via decrease_liquidity with 0 liquidity
-        if collect_fees:
-            collect_receipt = self.position_manager.collect_fees(token_id)
-            result["collect_receipt"] = collect_receipt
+        # Decrease liquidity and take the tokens. In V4 decreasing
+        # liquidity also credits the position's accrued fees, so TAKE_PAIR
+        # collects them in the same step.
+        encoded = [
+            encode_decrease_liquidity(
+                token_id=token_id,
+                liquidity=liquidity_to_remove,
+                amount0_min=0,
+                amount1_min=0,
+                recipient=self.manager.address,
+            )
+        ]
 
         if burn:
             if percentage != 100:
                 result["burn_skipped"] = "Can only burn when removing 100% liquidity"
             else:
-                burn_receipt = self.position_manager.burn(token_id)
-                result["burn_receipt"] = burn_receipt
+                encoded.append(encode_burn_position(token_id))
+                result["burned"] = True
+
+        # Everything goes out as a single modifyLiquidities tx
+        actions, params = combine_actions(*encoded)
+        receipt = self.position_manager.modify_batch(
+            actions, params, operation_type="decreaseLiquidity"
+        )
+        result["receipt"] = receipt
+        result["decrease_receipt"] = receipt
+        result["collect_receipt"] = receipt
+        if result.get("burned"):
+            result["burn_receipt"] = receipt
 
         return result
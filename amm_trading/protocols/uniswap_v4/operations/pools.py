@@ -1,11 +1,13 @@
 """Pool query operations for Uniswap V4"""
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ....core.connection import Web3Manager
 from ..config import UniswapV4Config
 from ....contracts.erc20 import ERC20
+from ....utils.token_cache import get_token_cache
 from ..contracts.state_view import StateView
 from ..types import PoolKey, ADDRESS_ZERO, create_pool_key, is_native_eth
 from ..math import tick_to_price
@@ -14,6 +16,9 @@ from ...base import BasePoolQuery
 # Cache file in working directory (V4-specific)
 CACHE_FILE = Path.cwd() / "univ4_pool_cache.json"
 
+# Upper bound on concurrent pool queries (each one is RPC-latency bound)
+MAX_QUERY_WORKERS = 16
+
 
 class PoolQuery(BasePoolQuery):
     """Query Uniswap V4 pool information"""
@@ -27,6 +32,7 @@ class PoolQuery(BasePoolQuery):
         self.config = UniswapV4Config()
         self.state_view = StateView(self.manager)
         self._cache = None
+        self._dirty = False
 
     def _load_cache(self):
         """Load static pool data from cache file"""
@@ -34,20 +40,21 @@ class PoolQuery(BasePoolQuery):
             return self._cache
 
         if CACHE_FILE.exists():
-            with open(CACHE_FILE) as f:
-                cache_list = json.load(f)
-                # Convert list to dict for fast lookup by pool name
-                self._cache = {item["pool_name"]: item for item in cache_list}
+            cache_list = json.loads(CACHE_FILE.read_bytes())
+            # Convert list to dict for fast lookup by pool name
+            self._cache = {item["pool_name"]: item for item in cache_list}
         else:
             self._cache = {}
 
         return self._cache
 
     def _save_cache(self):
-        """Save cache to file as list format"""
+        """Save cache to file as list format (no-op if nothing changed)"""
+        if not self._dirty:
+            return
         cache_list = list(self._cache.values())
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache_list, f, indent=2)
+        CACHE_FILE.write_text(json.dumps(cache_list, indent=2))
+        self._dirty = False
 
     def _get_pool_key_from_config(self, pool_name):
         """
@@ -79,23 +86,83 @@ class PoolQuery(BasePoolQuery):
         )
 
     def _get_token_info(self, address):
-        """Get token info, handling native ETH"""
+        """Get token info from the shared token cache, handling native ETH"""
         if is_native_eth(address):
             return {
                 "address": ADDRESS_ZERO,
                 "symbol": "ETH",
                 "decimals": 18,
             }
-        token = ERC20(self.manager, address)
+        cache = get_token_cache()
+        info = cache.get(self.manager.chain_id, address)
+        if info is None:
+            info = ERC20(self.manager, address).info
+            cache.set(self.manager.chain_id, address, info)
         return {
             "address": address,
-            "symbol": token.symbol,
-            "decimals": token.decimals,
+            "symbol": info["symbol"],
+            "decimals": info["decimals"],
+        }
+
+    def _refetch_token_infos(self, pool_keys):
+        """
+        Re-read metadata of every token in pool_keys from chain.
+
+        Updates the shared token cache with a single write so that stale
+        symbols or decimals are replaced. Tokens whose read fails keep
+        their cached entry.
+        """
+        addresses = list(dict.fromkeys(
+            currency
+            for pool_key in pool_keys
+            for currency in (pool_key.currency0, pool_key.currency1)
+            if not is_native_eth(currency)
+        ))
+
+        def fetch(address):
+            try:
+                return ERC20(self.manager, address).info
+            except Exception:
+                return None
+
+        infos = self._map_pools(fetch, addresses)
+
+        get_token_cache().set_many(self.manager.chain_id, {
+            address: info for address, info in zip(addresses, infos) if info is not None
+        })
+
+    def _get_pool_tokens(self, pool_name, pool_key, use_pool_cache=True):
+        """
+        Get (token0_info, token1_info) for a pool.
+
+        Token metadata is static, so it is taken from the pool cache file
+        when the cached entry matches pool_key (unless use_pool_cache is
+        False); otherwise it comes from the shared token cache.
+        """
+        cached = self._load_cache().get(pool_name) if pool_name and use_pool_cache else None
+        if cached and "token0" in cached and cached.get("pool_key") == self._pool_key_dict(pool_key):
+            return cached["token0"], cached["token1"]
+
+        return (
+            self._get_token_info(pool_key.currency0),
+            self._get_token_info(pool_key.currency1),
+        )
+
+    @staticmethod
+    def _pool_key_dict(pool_key):
+        """PoolKey as stored in pool info dicts"""
+        return {
+            "currency0": pool_key.currency0,
+            "currency1": pool_key.currency1,
+            "fee": pool_key.fee,
+            "tick_spacing": pool_key.tick_spacing,
+            "hooks": pool_key.hooks,
         }
 
     def get_pool_info(self, pool_identifier):
         """
         Get detailed pool information.
+        Uses cache for static token data, fetches dynamic data fresh.
 
         In V4, pools are identified by PoolKey (not address).
         This method accepts either a pool name (from config) or a PoolKey.
@@ -117,9 +184,8 @@ class PoolQuery(BasePoolQuery):
                 f"pool_identifier must be pool name or PoolKey, got {type(pool_identifier)}"
             )
 
-        # Get token info
-        token0_info = self._get_token_info(pool_key.currency0)
-        token1_info = self._get_token_info(pool_key.currency1)
+        # Get token info (static, from cache when available)
+        token0_info, token1_info = self._get_pool_tokens(pool_name, pool_key)
 
         # Generate pool name if not provided
         if pool_name is None:
@@ -127,56 +193,50 @@ class PoolQuery(BasePoolQuery):
 
         # Get dynamic data from state view
         try:
-            slot0 = self.state_view.get_slot0(pool_key)
-            liquidity = self.state_view.get_liquidity(pool_key)
+            (slot0, liquidity), = self.state_view.multi_get_slot0_and_liquidity([pool_key])
+            return self._build_pool_info(
+                pool_name, pool_key, token0_info, token1_info, slot0, liquidity
+            )
+        except Exception as e:
+            return self._pool_error_info(pool_name, pool_key, e)
 
-            current_tick = slot0["tick"]
-            sqrt_price_x96 = slot0["sqrt_price_x96"]
+    def _build_pool_info(self, pool_name, pool_key, token0_info, token1_info, slot0, liquidity):
+        """Assemble the pool info dict from already-fetched state"""
+        current_tick = slot0["tick"]
 
-            # Calculate current price
-            price = tick_to_price(
-                current_tick,
-                token0_info["decimals"],
-                token1_info["decimals"]
-            )
+        # Calculate current price
+        price = tick_to_price(
+            current_tick,
+            token0_info["decimals"],
+            token1_info["decimals"]
+        )
 
-            return {
-                "pool_name": pool_name,
-                "pool_key": {
-                    "currency0": pool_key.currency0,
-                    "currency1": pool_key.currency1,
-                    "fee": pool_key.fee,
-                    "tick_spacing": pool_key.tick_spacing,
-                    "hooks": pool_key.hooks,
-                },
-                "token0": token0_info,
-                "token1": token1_info,
-                "pair": f"{token0_info['symbol']}/{token1_info['symbol']}",
-                "fee": pool_key.fee,
-                "fee_percent": f"{pool_key.fee / 10000}%",
-                "tick_spacing": pool_key.tick_spacing,
-                "hooks": pool_key.hooks,
-                "has_hooks": pool_key.hooks != ADDRESS_ZERO,
-                "current_tick": current_tick,
-                "current_price": price,
-                "price_formatted": f"{price:.6f} {token1_info['symbol']}/{token0_info['symbol']}",
-                "liquidity": liquidity,
-                "protocol_fee": slot0["protocol_fee"],
-                "lp_fee": slot0["lp_fee"],
-            }
+        return {
+            "pool_name": pool_name,
+            "pool_key": self._pool_key_dict(pool_key),
+            "token0": token0_info,
+            "token1": token1_info,
+            "pair": f"{token0_info['symbol']}/{token1_info['symbol']}",
+            "fee": pool_key.fee,
+            "fee_percent": f"{pool_key.fee / 10000}%",
+            "tick_spacing": pool_key.tick_spacing,
+            "hooks": pool_key.hooks,
+            "has_hooks": pool_key.hooks != ADDRESS_ZERO,
+            "current_tick": current_tick,
+            "current_price": price,
+            "price_formatted": f"{price:.6f} {token1_info['symbol']}/{token0_info['symbol']}",
+            "liquidity": liquidity,
+            "protocol_fee": slot0["protocol_fee"],
+            "lp_fee": slot0["lp_fee"],
+        }
 
-        except Exception as e:
-            return {
-                "pool_name": pool_name,
-                "pool_key": {
-                    "currency0": pool_key.currency0,
-                    "currency1": pool_key.currency1,
-                    "fee": pool_key.fee,
-                    "tick_spacing": pool_key.tick_spacing,
-                    "hooks": pool_key.hooks,
-                },
-                "error": str(e),
-            }
+    def _pool_error_info(self, pool_name, pool_key, error):
+        """Pool info dict for a pool whose state could not be read"""
+        return {
+            "pool_name": pool_name,
+            "pool_key": self._pool_key_dict(pool_key),
+            "error": str(error),
+        }
 
     def get_all_configured_pools(self):
         """
@@ -185,38 +245,130 @@ class PoolQuery(BasePoolQuery):
         Returns:
             List of pool info dicts
         """
-        results = []
+        return self._query_pools(list(self.config.pools.keys()))
+
+    def _query_pools(self, names, refresh_tokens=False):
+        """
+        Query several configured pools, reading their state in one batch.
 
-        for name in self.config.pools.keys():
+        Args:
+            names: Pool names from config
+            refresh_tokens: Re-read token metadata from chain instead of
+                taking it from the pool cache file
+
+        Returns:
+            List of pool info dicts, in the same order as names
+        """
+        results = [None] * len(names)
+
+        # Static data first: pool keys and token metadata
+        pool_keys = {}
+        for i, name in enumerate(names):
+            try:
+                pool_keys[i] = self._get_pool_key_from_config(name)
+            except Exception as e:
+                results[i] = {"pool_name": name, "error": str(e)}
+
+        if refresh_tokens:
+            self._refetch_token_infos(pool_keys.values())
+
+        pending = []
+        for i, pool_key in pool_keys.items():
+            name = names[i]
+            try:
+                token0_info, token1_info = self._get_pool_tokens(
+                    name, pool_key, use_pool_cache=not refresh_tokens
+                )
+            except Exception as e:
+                results[i] = {"pool_name": name, "error": str(e)}
+                continue
+            pending.append((i, name, pool_key, token0_info, token1_info))
+
+        if not pending:
+            return results
+
+        # Dynamic data for every pool in one Multicall3 round trip
+        try:
+            states = self.state_view.multi_get_slot0_and_liquidity(
+                [pool_key for _, _, pool_key, _, _ in pending]
+            )
+        except Exception:
+            # Fall back to querying pools individually
+            fallback = self._map_pools(
+                lambda row: self._safe_pool_info_from_state(*row[1:]), pending
+            )
+            for (i, _, _, _, _), result in zip(pending, fallback):
+                results[i] = result
+            return results
+
+        for (i, name, pool_key, token0_info, token1_info), (slot0, liquidity) in zip(pending, states):
             try:
-                results.append(self.get_pool_info(name))
+                results[i] = self._build_pool_info(
+                    name, pool_key, token0_info, token1_info, slot0, liquidity
+                )
             except Exception as e:
-                results.append({"pool_name": name, "error": str(e)})
+                results[i] = self._pool_error_info(name, pool_key, e)
 
         return results
 
+    def _safe_pool_info_from_state(self, name, pool_key, token0_info, token1_info):
+        """Read one pool's state and build its info dict, or an error dict"""
+        try:
+            (slot0, liquidity), = self.state_view.multi_get_slot0_and_liquidity([pool_key])
+            return self._build_pool_info(
+                name, pool_key, token0_info, token1_info, slot0, liquidity
+            )
+        except Exception as e:
+            return self._pool_error_info(name, pool_key, e)
+
+    def _map_pools(self, func, items):
+        """
+        Apply func to several pools concurrently.
+
+        Pool queries are RPC-latency bound, so they are fanned out over
+        a thread pool rather than issued one after another.
+
+        Args:
+            func: Callable taking one item
+            items: List of per-pool items (names or resolved rows)
+
+        Returns:
+            List of results, in the same order as items
+        """
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(MAX_QUERY_WORKERS, len(items))) as executor:
+            return list(executor.map(func, items))
+
     def refresh_cache(self, pool_name=None):
         """
-        Force refresh cache for a pool or all configured pools.
+        Refresh cache for a pool or all configured pools.
+
+        Token metadata is re-read from chain (updating the shared token
+        cache) and all pools' state is read in one Multicall3 batch. A pool
+        whose read fails keeps its previous cache entry; failures are never
+        cached. The file is only rewritten when an entry actually changed.
 
         Args:
             pool_name: Specific pool to refresh, or None for all
         """
-        self._cache = {}
+        cache = self._load_cache()
         self.state_view.clear_cache()
 
-        if pool_name:
-            try:
-                info = self.get_pool_info(pool_name)
-                self._cache[pool_name] = info
-            except Exception:
-                pass
-        else:
-            for name in self.config.pools.keys():
-                try:
-                    info = self.get_pool_info(name)
-                    self._cache[name] = info
-                except Exception:
-                    pass
+        names = [pool_name] if pool_name else list(self.config.pools.keys())
+        fresh = self._query_pools(names, refresh_tokens=True)
+
+        # A single-pool refresh leaves the other entries alone; a full
+        # refresh drops pools that are no longer configured
+        merged = dict(cache) if pool_name else {}
+        for name, info in zip(names, fresh):
+            if "error" not in info:
+                merged[name] = info
+            elif name in cache:
+                merged[name] = cache[name]
+
+        if merged != cache:
+            self._cache = merged
+            self._dirty = True
 
         self._save_cache()
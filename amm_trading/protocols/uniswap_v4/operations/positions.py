@@ -1,14 +1,26 @@
 """Position query operations for Uniswap V4"""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from eth_abi import decode
+
 from ....core.connection import Web3Manager
 from ..config import UniswapV4Config
 from ....contracts.erc20 import ERC20
+from ....utils.token_cache import get_token_cache
 from ..contracts.position_manager import PositionManager
 from ..contracts.state_view import StateView
 from ..types import ADDRESS_ZERO, is_native_eth
 from ..math import tick_to_price, get_amounts_from_liquidity
+from ..math_fast import tick_to_price_vec, get_amounts_from_liquidity_vec
 from ...base import BasePositionQuery
 
+# Upper bound on concurrent position queries (each one is RPC-latency bound)
+MAX_QUERY_WORKERS = 16
+
+# Below this many positions the scalar price math is cheaper than NumPy setup
+VECTORIZE_MIN_POSITIONS = 20
+
 
 class PositionQuery(BasePositionQuery):
     """Query Uniswap V4 position information"""
@@ -31,8 +43,81 @@ class PositionQuery(BasePositionQuery):
                 "symbol": "ETH",
                 "decimals": 18,
             }
-        token = ERC20(self.manager, address)
-        return token.info
+        cache = get_token_cache()
+        info = cache.get(self.manager.chain_id, address)
+        if info is None:
+            info = ERC20(self.manager, address).info
+            cache.set(self.manager.chain_id, address, info)
+        return info
+
+    def _fetch_position_bundle(self, token_id):
+        """
+        Fetch a position together with its token metadata and pool state.
+
+        The position is read first (it yields the PoolKey), then slot0 and
+        both tokens' metadata go out as a single Multicall3 eth_call. If
+        the multicall fails, token info is read per token and slot0 is
+        left as None for the caller to fetch.
+
+        Returns:
+            (position, token0_info, token1_info, slot0 or None)
+        """
+        pos = self.position_manager.get_position(token_id)
+        pool_key = pos.pool_key
+
+        try:
+            token0_info, token1_info, slot0 = self._fetch_pool_bundle_multicall(pool_key)
+        except Exception:
+            token0_info = self._get_token_info(pool_key.currency0)
+            token1_info = self._get_token_info(pool_key.currency1)
+            slot0 = None
+
+        return pos, token0_info, token1_info, slot0
+
+    def _fetch_pool_bundle_multicall(self, pool_key):
+        """Multicall3 implementation of the second phase of _fetch_position_bundle"""
+        currencies = (pool_key.currency0, pool_key.currency1)
+        cache = get_token_cache()
+        chain_id = self.manager.chain_id
+
+        # Only tokens missing from the metadata cache need to be read
+        cached = [
+            None if is_native_eth(currency) else cache.get(chain_id, currency)
+            for currency in currencies
+        ]
+
+        calls = []
+        for currency, info in zip(currencies, cached):
+            if not is_native_eth(currency) and info is None:
+                token = self.manager.get_contract(currency, "erc20")
+                calls.append((currency, token.encode_abi("symbol")))
+                calls.append((currency, token.encode_abi("name")))
+                calls.append((currency, token.encode_abi("decimals")))
+        calls.append(self.state_view.slot0_call(pool_key))
+
+        results = iter(
+            return_data
+            for _, return_data in self.state_view.multicall.aggregate3(calls)
+        )
+
+        infos = []
+        fetched = {}
+        for currency, info in zip(currencies, cached):
+            if is_native_eth(currency):
+                info = self._get_token_info(currency)
+            elif info is None:
+                info = {
+                    "address": self.manager.checksum(currency),
+                    "symbol": decode(["string"], next(results))[0],
+                    "name": decode(["string"], next(results))[0],
+                    "decimals": decode(["uint8"], next(results))[0],
+                }
+                fetched[currency] = info
+            infos.append(info)
+        slot0 = self.state_view.decode_slot0(next(results))
+        cache.set_many(chain_id, fetched)
+
+        return infos[0], infos[1], slot0
 
     def get_position(self, token_id):
         """
@@ -44,12 +129,20 @@ class PositionQuery(BasePositionQuery):
         Returns:
             Dict with position details
         """
-        pos = self.position_manager.get_position(token_id)
-        pool_key = pos["pool_key"]
+        # Position, token info and slot0 in two round trips
+        pos, token0_info, token1_info, slot0 = self._fetch_position_bundle(token_id)
+        return self._build_position(token_id, pos, token0_info, token1_info, slot0)
 
-        # Get token info (handles native ETH)
-        token0_info = self._get_token_info(pool_key.currency0)
-        token1_info = self._get_token_info(pool_key.currency1)
+    def _build_position(self, token_id, pos, token0_info, token1_info, slot0, derived=None):
+        """
+        Assemble the position dict from already-fetched data.
+
+        Args:
+            slot0: Pool slot0, or None to read it here
+            derived: Precomputed (price, price_lower, price_upper, amount0,
+                amount1) from the vectorized batch path; computed here if None
+        """
+        pool_key = pos.pool_key
 
         result = {
             "token_id": token_id,
@@ -58,9 +151,9 @@ class PositionQuery(BasePositionQuery):
             "pair": f"{token0_info['symbol']}/{token1_info['symbol']}",
             "fee": pool_key.fee,
             "fee_percent": f"{pool_key.fee / 10000}%",
-            "tick_lower": pos["tick_lower"],
-            "tick_upper": pos["tick_upper"],
-            "liquidity": pos["liquidity"],
+            "tick_lower": pos.tick_lower,
+            "tick_upper": pos.tick_upper,
+            "liquidity": pos.liquidity,
             "pool_key": {
                 "currency0": pool_key.currency0,
                 "currency1": pool_key.currency1,
@@ -73,47 +166,51 @@ class PositionQuery(BasePositionQuery):
 
         # Get current pool state
         try:
-            slot0 = self.state_view.get_slot0(pool_key)
+            if slot0 is None:
+                slot0 = self.state_view.get_slot0(pool_key)
             current_tick = slot0["tick"]
             sqrt_price_x96 = slot0["sqrt_price_x96"]
 
-            # Calculate current price
-            price = tick_to_price(
-                current_tick,
-                token0_info["decimals"],
-                token1_info["decimals"]
-            )
-
             # Determine position status
-            if pos["tick_lower"] <= current_tick <= pos["tick_upper"]:
+            if pos.tick_lower <= current_tick <= pos.tick_upper:
                 status = "ACTIVE (earning fees)"
-            elif current_tick < pos["tick_lower"]:
+            elif current_tick < pos.tick_lower:
                 status = "OUT OF RANGE (below)"
             else:
                 status = "OUT OF RANGE (above)"
 
-            # Calculate current amounts
-            amount0, amount1 = get_amounts_from_liquidity(
-                pos["liquidity"],
-                sqrt_price_x96,
-                current_tick,
-                pos["tick_lower"],
-                pos["tick_upper"],
-                token0_info["decimals"],
-                token1_info["decimals"],
-            )
+            if derived is not None:
+                price, price_lower, price_upper, amount0, amount1 = derived
+            else:
+                # Calculate current price
+                price = tick_to_price(
+                    current_tick,
+                    token0_info["decimals"],
+                    token1_info["decimals"]
+                )
 
-            # Calculate price range
-            price_lower = tick_to_price(
-                pos["tick_lower"],
-                token0_info["decimals"],
-                token1_info["decimals"]
-            )
-            price_upper = tick_to_price(
-                pos["tick_upper"],
-                token0_info["decimals"],
-                token1_info["decimals"]
-            )
+                # Calculate current amounts
+                amount0, amount1 = get_amounts_from_liquidity(
+                    pos.liquidity,
+                    sqrt_price_x96,
+                    current_tick,
+                    pos.tick_lower,
+                    pos.tick_upper,
+                    token0_info["decimals"],
+                    token1_info["decimals"],
+                )
+
+                # Calculate price range
+                price_lower = tick_to_price(
+                    pos.tick_lower,
+                    token0_info["decimals"],
+                    token1_info["decimals"]
+                )
+                price_upper = tick_to_price(
+                    pos.tick_upper,
+                    token0_info["decimals"],
+                    token1_info["decimals"]
+                )
 
             result.update({
                 "status": status,
@@ -149,14 +246,167 @@ class PositionQuery(BasePositionQuery):
         """
         addr = address or self.manager.address
         count = self.position_manager.balance_of(addr)
+        if count == 0:
+            return []
+
+        token_ids = self._get_token_ids(addr, count)
+
+        # Positions are independent, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=min(MAX_QUERY_WORKERS, count)) as executor:
+            bundles = list(executor.map(self._safe_fetch_position_bundle, token_ids))
+
+        derived = self._derive_batch(bundles) if count >= VECTORIZE_MIN_POSITIONS else {}
 
         positions = []
-        for i in range(count):
-            token_id = self.position_manager.token_of_owner_by_index(i, addr)
+        for i, (token_id, bundle) in enumerate(zip(token_ids, bundles)):
+            if isinstance(bundle, Exception):
+                positions.append({"token_id": token_id, "error": str(bundle)})
+                continue
             try:
-                pos = self.get_position(token_id)
-                positions.append(pos)
+                positions.append(
+                    self._build_position(token_id, *bundle, derived=derived.get(i))
+                )
             except Exception as e:
                 positions.append({"token_id": token_id, "error": str(e)})
 
         return positions
+
+    async def iter_positions_for_address(self, address=None, ordered=False):
+        """
+        Yield positions owned by address as they are fetched.
+
+        Unlike get_positions_for_address, the first result is available
+        after a single position fetch, which matters for large wallets.
+
+        Args:
+            address: Address to query (uses manager address if None)
+            ordered: If True, yield in index order instead of completion order
+
+        Yields:
+            Position dicts (or {"token_id", "error"} dicts on failure)
+        """
+        addr = address or self.manager.address
+        count = await asyncio.to_thread(self.position_manager.balance_of, addr)
+        if count == 0:
+            return
+
+        token_ids = await asyncio.to_thread(self._get_token_ids, addr, count)
+        semaphore = asyncio.Semaphore(MAX_QUERY_WORKERS)
+
+        async def fetch(index, token_id):
+            async with semaphore:
+                return index, await asyncio.to_thread(self._safe_get_position, token_id)
+
+        tasks = [asyncio.ensure_future(fetch(i, tid)) for i, tid in enumerate(token_ids)]
+        try:
+            if not ordered:
+                for next_done in asyncio.as_completed(tasks):
+                    _, position = await next_done
+                    yield position
+                return
+
+            # Buffer out-of-order results until their predecessors arrive
+            pending = {}
+            next_index = 0
+            for next_done in asyncio.as_completed(tasks):
+                index, position = await next_done
+                pending[index] = position
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _safe_get_position(self, token_id):
+        """get_position that returns an error dict instead of raising"""
+        try:
+            return self.get_position(token_id)
+        except Exception as e:
+            return {"token_id": token_id, "error": str(e)}
+
+    def _safe_fetch_position_bundle(self, token_id):
+        """_fetch_position_bundle that returns the exception instead of raising"""
+        try:
+            return self._fetch_position_bundle(token_id)
+        except Exception as e:
+            return e
+
+    def _derive_batch(self, bundles):
+        """
+        Compute prices and amounts for many positions in one NumPy pass.
+
+        Only bundles that already carry slot0 are included; the rest are
+        computed one by one in _build_position.
+
+        Returns:
+            Dict of bundle index -> (price, price_lower, price_upper, amount0, amount1),
+            empty if numpy is not installed
+        """
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return {}
+
+        indices = [
+            i for i, bundle in enumerate(bundles)
+            if not isinstance(bundle, Exception) and bundle[3] is not None
+        ]
+        if not indices:
+            return {}
+
+        rows = [bundles[i] for i in indices]
+        ticks = [slot0["tick"] for _, _, _, slot0 in rows]
+        tick_lowers = [pos.tick_lower for pos, _, _, _ in rows]
+        tick_uppers = [pos.tick_upper for pos, _, _, _ in rows]
+        decimals0 = [token0["decimals"] for _, token0, _, _ in rows]
+        decimals1 = [token1["decimals"] for _, _, token1, _ in rows]
+
+        prices = tick_to_price_vec(ticks, decimals0, decimals1)
+        prices_lower = tick_to_price_vec(tick_lowers, decimals0, decimals1)
+        prices_upper = tick_to_price_vec(tick_uppers, decimals0, decimals1)
+        amounts0, amounts1 = get_amounts_from_liquidity_vec(
+            [pos.liquidity for pos, _, _, _ in rows],
+            [slot0["sqrt_price_x96"] for _, _, _, slot0 in rows],
+            ticks,
+            tick_lowers,
+            tick_uppers,
+            decimals0,
+            decimals1,
+        )
+
+        return {
+            i: (
+                float(prices[j]),
+                float(prices_lower[j]),
+                float(prices_upper[j]),
+                float(amounts0[j]),
+                float(amounts1[j]),
+            )
+            for j, i in enumerate(indices)
+        }
+
+    def _get_token_ids(self, address, count):
+        """
+        Get the token IDs of all positions owned by address.
+
+        All tokenOfOwnerByIndex lookups go out as one Multicall3 eth_call,
+        falling back to individual calls if the multicall fails.
+        """
+        address = self.manager.checksum(address)
+        try:
+            contract = self.position_manager.contract
+            calls = [
+                (self.position_manager.address,
+                 contract.encode_abi("tokenOfOwnerByIndex", args=[address, i]))
+                for i in range(count)
+            ]
+            return [
+                decode(["uint256"], return_data)[0]
+                for _, return_data in self.state_view.multicall.aggregate3(calls)
+            ]
+        except Exception:
+            return [
+                self.position_manager.token_of_owner_by_index(i, address)
+                for i in range(count)
+            ]
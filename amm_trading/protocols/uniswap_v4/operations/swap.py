@@ -1,16 +1,64 @@
 """Token swap operations for Uniswap V4"""
 
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import NamedTuple
 from web3 import Web3
 
 from ....core.connection import Web3Manager
 from ..config import UniswapV4Config
 from ....core.exceptions import ConfigError, InsufficientBalanceError
 from ....contracts.erc20 import ERC20
+from ....utils.gas import get_nonce_tracker
+from ....utils.token_cache import get_token_cache
 from ..contracts.quoter import Quoter
+from ..encoding import encode_swap_exact_in_single
 from ..types import PoolKey, ADDRESS_ZERO, create_pool_key, is_native_eth, sort_currencies
 from ...base import BaseSwapManager
 
+# Universal Router command byte for a V4 swap
+_V4_SWAP_COMMAND = bytes([0x10])
+
+# Powers of ten for wei conversion, one per possible ERC20 decimals (uint8)
+_POW10 = tuple(10 ** i for i in range(256))
+
+
+class SwapContext(NamedTuple):
+    """
+    Resolved inputs and quote for a swap, shared by quote() and swap().
+
+    Attributes:
+        pool_name: Pool name in format 'TOKEN0_TOKEN1_FEE'
+        pool_key: PoolKey of the pool
+        token_in: Token to send, as passed by the caller
+        token_out: Token to receive, as passed by the caller
+        token_in_addr: Resolved token_in address (ADDRESS_ZERO for ETH)
+        token_out_addr: Resolved token_out address
+        token_in_info: Token info dict for token_in
+        token_out_info: Token info dict for token_out
+        amount_in: Human readable input amount
+        amount_in_wei: Input amount in wei
+        zero_for_one: True if swapping currency0 for currency1
+        balance: token_in balance in wei (None if it could not be read)
+        quote: Quoter result dict (amount_out, gas_estimate)
+    """
+
+    pool_name: str
+    pool_key: PoolKey
+    token_in: str
+    token_out: str
+    token_in_addr: str
+    token_out_addr: str
+    token_in_info: dict
+    token_out_info: dict
+    amount_in: float
+    amount_in_wei: int
+    zero_for_one: bool
+    balance: int
+    quote: dict
+
 
 class SwapManager(BaseSwapManager):
     """
@@ -33,6 +81,24 @@ class SwapManager(BaseSwapManager):
         self.quoter = Quoter(self.manager)
         self.router_address = self.manager.checksum(self.config.universal_router_address)
         self.router = self.manager.get_contract(self.router_address, "universalRouter")
+        # Pool names and symbols resolve to the same PoolKey / address for
+        # the lifetime of the manager, so repeat trades skip the lookups
+        self._pool_key_cache = {}
+        self._token_address_cache = {}
+        self._tx_template = None
+        # Known router allowance per token, so approvals are only checked
+        # on-chain once
+        self._allowance_cache = {}
+
+    def _get_tx_template(self):
+        """Fields shared by every swap transaction (built on first swap)"""
+        if self._tx_template is None:
+            self._tx_template = {
+                "from": self.manager.address,
+                "to": self.router_address,
+                "chainId": self.manager.chain_id,
+            }
+        return self._tx_template
 
     def _parse_pool_name(self, pool_name):
         """
@@ -40,48 +106,82 @@ class SwapManager(BaseSwapManager):
 
         Returns PoolKey
         """
-        parts = pool_name.split("_")
-        if len(parts) < 3:
+        cached = self._pool_key_cache.get(pool_name)
+        if cached is not None:
+            return cached
+
+        # TOKEN0_TOKEN1_FEE; anything after a further '_' is ignored
+        token0_symbol, _, rest = pool_name.partition("_")
+        token1_symbol, _, rest = rest.partition("_")
+        fee_str, _, _ = rest.partition("_")
+        if not (token0_symbol and token1_symbol and fee_str):
             raise ConfigError(
                 f"Invalid pool name format: {pool_name}. Expected: TOKEN0_TOKEN1_FEE"
             )
 
-        token0_symbol = parts[0]
-        token1_symbol = parts[1]
         try:
-            fee = int(parts[2]) * 100  # Convert 30 -> 3000
+            fee = int(fee_str) * 100  # Convert 30 -> 3000
         except ValueError:
-            raise ConfigError(f"Invalid fee in pool name: {parts[2]}")
+            raise ConfigError(f"Invalid fee in pool name: {fee_str}")
 
         token0_addr = self._get_token_address(token0_symbol)
         token1_addr = self._get_token_address(token1_symbol)
 
-        return create_pool_key(token0_addr, token1_addr, fee)
+        pool_key = self._pool_key_cache[pool_name] = create_pool_key(
+            token0_addr, token1_addr, fee
+        )
+        return pool_key
 
     def _get_token_address(self, symbol):
         """Get token address, handling ETH -> ADDRESS_ZERO"""
+        cached = self._token_address_cache.get(symbol)
+        if cached is not None:
+            return cached
+
         if symbol.upper() == "ETH":
-            return ADDRESS_ZERO
-        return self.manager.checksum(self.config.get_token_address(symbol))
+            address = ADDRESS_ZERO
+        else:
+            # Interned so repeated PoolKey hashing/equality compares by identity
+            address = sys.intern(self.manager.checksum(self.config.get_token_address(symbol)))
+        self._token_address_cache[symbol] = address
+        return address
 
     def _get_token_info(self, address):
         """Get token info, handling native ETH"""
         if is_native_eth(address):
             return {"symbol": "ETH", "decimals": 18, "address": ADDRESS_ZERO}
-        token = ERC20(self.manager, address)
+        cache = get_token_cache()
+        info = cache.get(self.manager.chain_id, address)
+        if info is None:
+            info = ERC20(self.manager, address).info
+            cache.set(self.manager.chain_id, address, info)
         return {
-            "symbol": token.symbol,
-            "decimals": token.decimals,
+            "symbol": info["symbol"],
+            "decimals": info["decimals"],
             "address": address,
         }
 
     def _to_wei(self, amount, decimals):
-        """Convert human amount to wei"""
-        return int(amount * (10 ** decimals))
+        """Convert human amount to wei (exact decimal scaling, no float rounding)"""
+        return int(Decimal(str(amount)) * _POW10[decimals])
 
     def _from_wei(self, amount_wei, decimals):
         """Convert wei to human amount"""
-        return amount_wei / (10 ** decimals)
+        return amount_wei / _POW10[decimals]
+
+    def _rate(self, amount_in_wei, decimals_in, amount_out_wei, decimals_out):
+        """
+        Human price of token_in in token_out (0 if amount_in_wei is 0).
+
+        The ratio is taken on the exact wei amounts in Decimal and only
+        converted to float for display.
+        """
+        if amount_in_wei <= 0:
+            return 0
+        return float(
+            (Decimal(amount_out_wei) * _POW10[decimals_in])
+            / (Decimal(amount_in_wei) * _POW10[decimals_out])
+        )
 
     def _get_balance(self, address):
         """Get balance in wei (native ETH or ERC20)"""
@@ -89,9 +189,12 @@ class SwapManager(BaseSwapManager):
             return self.manager.w3.eth.get_balance(self.manager.address)
         return ERC20(self.manager, address).balance_of()
 
-    def quote(self, token_in, token_out, amount_in, pool_name=None, **kwargs):
+    def prepare_swap(self, token_in, token_out, amount_in, pool_name):
         """
-        Get a quote for a swap without executing.
+        Resolve tokens, read the balance and quote a swap.
+
+        The result can be passed to swap(prepared=...) to execute a quoted
+        swap without repeating the lookups, balance read and quoter call.
 
         Args:
             token_in: Token to send (symbol or address, 'ETH' for native)
@@ -100,11 +203,8 @@ class SwapManager(BaseSwapManager):
             pool_name: Pool name in format 'TOKEN0_TOKEN1_FEE'
 
         Returns:
-            Dict with quote details
+            SwapContext
         """
-        if pool_name is None:
-            raise ValueError("pool_name is required for Uniswap V4 quotes")
-
         pool_key = self._parse_pool_name(pool_name)
 
         token_in_addr = self._get_token_address(token_in)
@@ -116,30 +216,118 @@ class SwapManager(BaseSwapManager):
         amount_in_wei = self._to_wei(amount_in, token_in_info["decimals"])
 
         # Determine swap direction
-        zero_for_one = token_in_addr.lower() == pool_key.currency0.lower()
+        zero_for_one = pool_key.is_currency0(token_in_addr)
 
-        # Check balance
         try:
             balance = self._get_balance(token_in_addr)
-            has_sufficient_balance = balance >= amount_in_wei
-            balance_human = self._from_wei(balance, token_in_info["decimals"])
         except Exception:
-            balance = 0
-            has_sufficient_balance = None
-            balance_human = None
+            balance = None
 
-        # Get quote
-        result = self.quoter.quote_exact_input_single(
+        quote = self.quoter.quote_exact_input_single(
             pool_key=pool_key,
             zero_for_one=zero_for_one,
             amount_in=amount_in_wei,
         )
 
+        return SwapContext(
+            pool_name=pool_name,
+            pool_key=pool_key,
+            token_in=token_in,
+            token_out=token_out,
+            token_in_addr=token_in_addr,
+            token_out_addr=token_out_addr,
+            token_in_info=token_in_info,
+            token_out_info=token_out_info,
+            amount_in=amount_in,
+            amount_in_wei=amount_in_wei,
+            zero_for_one=zero_for_one,
+            balance=balance,
+            quote=quote,
+        )
+
+    def _read_swap_state(self, token_in_addr, read_balance=True, read_nonce=True, read_allowance=True):
+        """
+        Read the chain state swap() needs, concurrently.
+
+        The reads are independent, so they are issued in parallel rather
+        than one round trip after another.
+
+        Args:
+            token_in_addr: Input token address (ADDRESS_ZERO for ETH)
+            read_balance: Whether to read the token_in balance
+            read_nonce: Whether to read the pending transaction count; it is
+                only read when the shared nonce tracker still has to sync
+            read_allowance: Whether to read the router allowance (ignored
+                for native ETH)
+
+        Returns:
+            (balance, gas_price, pending_count, allowance); reads that were
+            skipped are None
+        """
+        reads = {"gas_price": self.manager.get_gas_price}
+        if read_balance:
+            reads["balance"] = lambda: self._get_balance(token_in_addr)
+        if read_nonce and not get_nonce_tracker(self.manager, self.manager.address).synced:
+            reads["pending_count"] = lambda: self.manager.w3.eth.get_transaction_count(
+                self.manager.address, "pending"
+            )
+        if read_allowance and not is_native_eth(token_in_addr):
+            reads["allowance"] = lambda: ERC20(self.manager, token_in_addr).allowance(
+                self.router_address
+            )
+
+        with ThreadPoolExecutor(max_workers=len(reads)) as executor:
+            futures = {name: executor.submit(read) for name, read in reads.items()}
+            results = {name: future.result() for name, future in futures.items()}
+
+        return (
+            results.get("balance"),
+            results["gas_price"],
+            results.get("pending_count"),
+            results.get("allowance"),
+        )
+
+    def quote(self, token_in, token_out, amount_in, pool_name=None, **kwargs):
+        """
+        Get a quote for a swap without executing.
+
+        Args:
+            token_in: Token to send (symbol or address, 'ETH' for native)
+            token_out: Token to receive
+            amount_in: Amount of token_in to swap (human readable)
+            pool_name: Pool name in format 'TOKEN0_TOKEN1_FEE'
+
+        Returns:
+            Dict with quote details
+        """
+        if pool_name is None:
+            raise ValueError("pool_name is required for Uniswap V4 quotes")
+
+        ctx = self.prepare_swap(token_in, token_out, amount_in, pool_name)
+        pool_key = ctx.pool_key
+        token_in_addr, token_out_addr = ctx.token_in_addr, ctx.token_out_addr
+        token_in_info, token_out_info = ctx.token_in_info, ctx.token_out_info
+        result = ctx.quote
+
+        # Check balance
+        if ctx.balance is not None:
+            has_sufficient_balance = ctx.balance >= ctx.amount_in_wei
+            balance_human = self._from_wei(ctx.balance, token_in_info["decimals"])
+        else:
+            has_sufficient_balance = None
+            balance_human = None
+
         amount_out_human = self._from_wei(
             result["amount_out"], token_out_info["decimals"]
         )
-        price = amount_out_human / amount_in if amount_in > 0 else 0
-        inverse_price = amount_in / amount_out_human if amount_out_human > 0 else 0
+        price = self._rate(
+            ctx.amount_in_wei, token_in_info["decimals"],
+            result["amount_out"], token_out_info["decimals"],
+        )
+        inverse_price = self._rate(
+            result["amount_out"], token_out_info["decimals"],
+            ctx.amount_in_wei, token_in_info["decimals"],
+        )
 
         gas_price = self.manager.get_gas_price()
         total_gas_estimate = result["gas_estimate"] + 50000
@@ -194,6 +382,7 @@ class SwapManager(BaseSwapManager):
         max_gas_price_gwei=None,
         deadline_minutes=30,
         dry_run=False,
+        prepared=None,
         **kwargs
     ):
         """
@@ -210,6 +399,9 @@ class SwapManager(BaseSwapManager):
             max_gas_price_gwei: Maximum gas price in gwei
             deadline_minutes: Transaction deadline in minutes
             dry_run: If True, simulate without executing
+            prepared: SwapContext from prepare_swap() for these same
+                arguments; its balance and quote are reused instead of
+                being fetched again
 
         Returns:
             Dict with transaction details
@@ -217,21 +409,34 @@ class SwapManager(BaseSwapManager):
         if pool_name is None:
             raise ValueError("pool_name is required for Uniswap V4 swaps")
 
-        pool_key = self._parse_pool_name(pool_name)
-
-        token_in_addr = self._get_token_address(token_in)
-        token_out_addr = self._get_token_address(token_out)
-
-        token_in_info = self._get_token_info(token_in_addr)
-        token_out_info = self._get_token_info(token_out_addr)
-
-        amount_in_wei = self._to_wei(amount_in, token_in_info["decimals"])
-
-        # Determine swap direction
-        zero_for_one = token_in_addr.lower() == pool_key.currency0.lower()
+        if prepared is None:
+            prepared = self.prepare_swap(token_in, token_out, amount_in, pool_name)
+        elif (prepared.token_in, prepared.token_out, prepared.amount_in, prepared.pool_name) != (
+            token_in, token_out, amount_in, pool_name
+        ):
+            raise ValueError("prepared swap does not match the swap arguments")
+
+        pool_key = prepared.pool_key
+        token_in_addr, token_out_addr = prepared.token_in_addr, prepared.token_out_addr
+        token_in_info, token_out_info = prepared.token_in_info, prepared.token_out_info
+        amount_in_wei = prepared.amount_in_wei
+        zero_for_one = prepared.zero_for_one
+
+        # Balance, gas price, nonce and allowance are independent reads;
+        # the allowance is skipped when the cached value already covers it
+        allowance = self._allowance_cache.get(token_in_addr)
+        balance, current_gas_price, pending_count, allowance_read = self._read_swap_state(
+            token_in_addr,
+            read_balance=prepared.balance is None,
+            read_nonce=not dry_run,
+            read_allowance=not dry_run and (allowance is None or allowance < amount_in_wei),
+        )
+        if balance is None:
+            balance = prepared.balance
+        if allowance_read is not None:
+            allowance = allowance_read
 
         # Check balance
-        balance = self._get_balance(token_in_addr)
         has_sufficient_balance = balance >= amount_in_wei
 
         if not has_sufficient_balance and not dry_run:
@@ -241,7 +446,6 @@ class SwapManager(BaseSwapManager):
             )
 
         # Check gas price
-        current_gas_price = self.manager.get_gas_price()
         if max_gas_price_gwei:
             max_gas_price_wei = Web3.to_wei(max_gas_price_gwei, "gwei")
             if current_gas_price > max_gas_price_wei:
@@ -255,12 +459,8 @@ class SwapManager(BaseSwapManager):
 
         deadline = int(time.time()) + (deadline_minutes * 60)
 
-        # Get quote for expected output
-        quote_result = self.quoter.quote_exact_input_single(
-            pool_key=pool_key,
-            zero_for_one=zero_for_one,
-            amount_in=amount_in_wei,
-        )
+        # Expected output from the prepared quote
+        quote_result = prepared.quote
 
         expected_out = quote_result["amount_out"]
         gas_estimate = quote_result["gas_estimate"]
@@ -271,8 +471,7 @@ class SwapManager(BaseSwapManager):
             )
 
         # Calculate slippage
-        slippage_multiplier = (10000 - slippage_bps) / 10000
-        amount_out_min = int(expected_out * slippage_multiplier)
+        amount_out_min = int(expected_out * (10000 - slippage_bps) // 10000)
 
         if amount_out_min == 0:
             raise ValueError(
@@ -284,6 +483,10 @@ class SwapManager(BaseSwapManager):
         gas_cost_eth = float(Web3.from_wei(gas_cost_wei, "ether"))
 
         if dry_run:
+            rate = self._rate(
+                amount_in_wei, token_in_info["decimals"],
+                expected_out, token_out_info["decimals"],
+            )
             return {
                 "dry_run": True,
                 "status": "SIMULATION - No transaction sent",
@@ -304,8 +507,8 @@ class SwapManager(BaseSwapManager):
                     "is_native_eth": is_native_eth(token_out_addr),
                 },
                 "price": {
-                    "rate": self._from_wei(expected_out, token_out_info["decimals"]) / amount_in if amount_in > 0 else 0,
-                    "formatted": f"1 {token_in_info['symbol']} = {self._from_wei(expected_out, token_out_info['decimals']) / amount_in:.6f} {token_out_info['symbol']}" if amount_in > 0 else "N/A",
+                    "rate": rate,
+                    "formatted": f"1 {token_in_info['symbol']} = {rate:.6f} {token_out_info['symbol']}" if amount_in_wei > 0 else "N/A",
                 },
                 "pool": pool_name,
                 "fee": pool_key.fee,
@@ -317,16 +520,21 @@ class SwapManager(BaseSwapManager):
                 },
             }
 
-        # Approve ERC20 tokens (not needed for native ETH)
+        # Approve ERC20 tokens (not needed for native ETH). Approving the
+        # max lets later swaps of this token skip the approval tx.
         if not is_native_eth(token_in_addr):
-            ERC20(self.manager, token_in_addr).approve(
-                self.router_address, amount_in_wei
-            )
+            if allowance < amount_in_wei:
+                ERC20(self.manager, token_in_addr).approve(
+                    self.router_address, self.config.MAX_UINT256
+                )
+                allowance = self.config.MAX_UINT256
+            # Infinite allowances are not decreased by transferFrom
+            if allowance != self.config.MAX_UINT256:
+                allowance -= amount_in_wei
+            self._allowance_cache[token_in_addr] = allowance
 
         # Build swap through Universal Router
         # V4_SWAP command = 0x10 in Universal Router
-        from ..encoding import encode_swap_exact_in_single
-
         swap_params = encode_swap_exact_in_single(
             pool_key=pool_key,
             zero_for_one=zero_for_one,
@@ -335,25 +543,33 @@ class SwapManager(BaseSwapManager):
         )
 
         # Universal Router execute command
-        commands = bytes([0x10])  # V4_SWAP command
+        commands = _V4_SWAP_COMMAND
         inputs = [swap_params]
 
         # Value to send (for native ETH input)
         value = amount_in_wei if is_native_eth(token_in_addr) else 0
 
-        tx = self.router.functions.execute(
-            commands, inputs, deadline
-        ).build_transaction({
-            "from": self.manager.address,
-            "nonce": self.manager.get_nonce(),
-            "gas": int(gas_estimate * 1.2),
-            "gasPrice": gas_price,
-            "chainId": self.manager.chain_id,
-            "value": value,
-        })
-
-        signed = self.manager.account.sign_transaction(tx)
-        tx_hash = self.manager.w3.eth.send_raw_transaction(signed.raw_transaction)
+        # Take the nonce from the tracker shared with approvals and other
+        # tracked transactions; pending_count is only used if it never synced
+        nonce_tracker = get_nonce_tracker(self.manager, self.manager.address)
+        nonce = nonce_tracker.reserve(pending_count=pending_count)
+        try:
+            # Every field is known, so encode the call directly instead of
+            # going through build_transaction's default filling
+            tx = {
+                **self._get_tx_template(),
+                "nonce": nonce,
+                "gas": int(gas_estimate * 1.2),
+                "gasPrice": gas_price,
+                "value": value,
+                "data": self.router.encode_abi("execute", args=[commands, inputs, deadline]),
+            }
+
+            signed = self.manager.account.sign_transaction(tx)
+            tx_hash = self.manager.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception:
+            nonce_tracker.resync()
+            raise
 
         receipt = self.manager.w3.eth.wait_for_transaction_receipt(tx_hash)
 
@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
-from typing import Optional, Tuple
-from eth_abi import encode
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+from web3 import Web3
 
 # Native ETH is represented by address zero in V4
 ADDRESS_ZERO = "0x0000000000000000000000000000000000000000"
 
+# Default swap price limits (no limit in either direction)
+MIN_SQRT_PRICE_LIMIT = 0
+MAX_SQRT_PRICE_LIMIT = (1 << 160) - 1
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class PoolKey:
     """
     Identifies a V4 pool.
@@ -19,6 +24,9 @@ class PoolKey:
     In V4, pools are identified by a PoolKey rather than a contract address.
     The PoolKey is hashed to produce the pool ID used in PoolManager.
 
+    PoolKey is immutable and hashable, so it can be used as a dict or
+    cache key.
+
     Attributes:
         currency0: Lower address token (use ADDRESS_ZERO for native ETH)
         currency1: Higher address token
@@ -32,23 +40,58 @@ class PoolKey:
     fee: int
     tick_spacing: int
     hooks: str = ADDRESS_ZERO
+    _tuple: tuple = field(init=False, repr=False, compare=False)
+    _currency0_lc: str = field(init=False, repr=False, compare=False)
+    _currency1_lc: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        # Lowercased currencies are needed for ordering and direction checks
+        currency0_lc = self.currency0.lower()
+        currency1_lc = self.currency1.lower()
+        object.__setattr__(self, "_currency0_lc", currency0_lc)
+        object.__setattr__(self, "_currency1_lc", currency1_lc)
+
         # Ensure currency0 < currency1
-        if self.currency0.lower() > self.currency1.lower():
+        if currency0_lc > currency1_lc:
             raise ValueError(
                 f"currency0 must be < currency1. Got: {self.currency0} > {self.currency1}"
             )
+        # Fields are frozen, so the ABI tuple can be built once up front
+        object.__setattr__(
+            self,
+            "_tuple",
+            (self.currency0, self.currency1, self.fee, self.tick_spacing, self.hooks),
+        )
 
     def to_tuple(self) -> tuple:
         """Convert to tuple for ABI encoding"""
-        return (
-            self.currency0,
-            self.currency1,
-            self.fee,
-            self.tick_spacing,
-            self.hooks,
-        )
+        return self._tuple
+
+    def is_currency0(self, address: str) -> bool:
+        """Check if address is currency0 (i.e. a swap from it is zeroForOne)"""
+        return address.lower() == self._currency0_lc
+
+    @property
+    def pool_id(self) -> bytes:
+        """32-byte pool ID (memoized by compute_pool_id)"""
+        return compute_pool_id(self)
+
+
+class PositionInfo(NamedTuple):
+    """
+    Position data as returned by the Position Manager.
+
+    Attributes:
+        pool_key: The pool the position belongs to
+        tick_lower: Lower tick boundary
+        tick_upper: Upper tick boundary
+        liquidity: Current position liquidity
+    """
+
+    pool_key: PoolKey
+    tick_lower: int
+    tick_upper: int
+    liquidity: int
 
 
 class Actions(IntEnum):
@@ -152,11 +195,19 @@ def is_native_eth(address: str) -> bool:
     return address.lower() == ADDRESS_ZERO.lower()
 
 
+@lru_cache(maxsize=1024)
+def _address_word(address: str) -> bytes:
+    """Address left-padded to a 32-byte ABI word"""
+    return bytes.fromhex(address[2:]).rjust(32, b"\x00")
+
+
+@lru_cache(maxsize=4096)
 def compute_pool_id(pool_key: PoolKey) -> bytes:
     """
     Compute the pool ID from a PoolKey.
 
     The pool ID is the keccak256 hash of the ABI-encoded PoolKey.
+    Results are memoized per PoolKey, since pool IDs are deterministic.
 
     Args:
         pool_key: The PoolKey to hash
@@ -164,18 +215,14 @@ def compute_pool_id(pool_key: PoolKey) -> bytes:
     Returns:
         32-byte pool ID
     """
-    from web3 import Web3
-
-    # ABI encode the PoolKey struct
-    encoded = encode(
-        ["address", "address", "uint24", "int24", "address"],
-        [
-            pool_key.currency0,
-            pool_key.currency1,
-            pool_key.fee,
-            pool_key.tick_spacing,
-            pool_key.hooks,
-        ],
+    # Every PoolKey field is a static 32-byte ABI word, so the struct
+    # encoding is just the concatenated words
+    encoded = (
+        _address_word(pool_key.currency0)
+        + _address_word(pool_key.currency1)
+        + pool_key.fee.to_bytes(32, "big")
+        + pool_key.tick_spacing.to_bytes(32, "big", signed=True)
+        + _address_word(pool_key.hooks)
     )
 
     return Web3.keccak(encoded)
@@ -1,7 +1,24 @@
 """EIP-1559 Gas management with user-configurable limits"""
 
 import json
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple
+
+# Reuse a fetched base fee for half a mainnet slot (12s)
+BASE_FEE_TTL = 6.0
+
+WEI_PER_GWEI = 10 ** 9
+
+# Common provider cap on requests per JSON-RPC batch
+DEFAULT_BATCH_REQUESTS_LIMIT = 20
+
+# Gas estimates kept per GasManager (same call, sender and cached fee read)
+GAS_ESTIMATE_CACHE_SIZE = 256
 
 
 class GasPriceTooHighError(Exception):
@@ -9,6 +26,39 @@ class GasPriceTooHighError(Exception):
     pass
 
 
+class GasParams(NamedTuple):
+    """EIP-1559 gas parameters for one transaction (all in Wei / gas units)"""
+
+    max_fee_wei: int
+    priority_fee_wei: int
+    gas: int
+
+
+# Default gas config locations, in priority order (working directory as of import)
+DEFAULT_CONFIG_PATHS = (
+    Path.cwd() / "config" / "gas.json",
+    Path(__file__).resolve().parent.parent.parent / "config" / "gas.json",
+    Path.home() / ".amm-trading" / "config" / "gas.json",
+)
+
+
+@lru_cache(maxsize=None)
+def _default_config_path():
+    """First existing path of DEFAULT_CONFIG_PATHS, or None"""
+    return next((path for path in DEFAULT_CONFIG_PATHS if path.exists()), None)
+
+
+@lru_cache(maxsize=8)
+def _read_config_file(path, mtime):
+    """
+    Parse a gas config file.
+
+    The file's mtime is part of the cache key, so an edited file is
+    re-read while an unchanged one is parsed only once per process.
+    """
+    return json.loads(Path(path).read_bytes())
+
+
 class GasConfig:
     """Load and manage gas configuration from JSON file"""
 
@@ -36,19 +86,25 @@ class GasConfig:
         """
         self._config = self._load_config(config_path)
 
+        # Resolve everything the per-transaction path needs once, up front
+        self._gas_limits = self._config.get("gasLimit", self.DEFAULT_GAS_LIMITS)
+        self._default_gas_limit = self._gas_limits.get("default", 500000)
+        max_fee_gwei = self.maxFeePerGas
+        self._max_fee_wei = None if max_fee_gwei is None else self._gwei_to_wei(max_fee_gwei)
+        self._priority_fee_wei = self._gwei_to_wei(self.maxPriorityFeePerGas or 1.5)
+
+    @staticmethod
+    def _gwei_to_wei(gwei):
+        """Exact Gwei -> Wei conversion (0.1 Gwei is 100000000 Wei, not 99999999)"""
+        return int(Decimal(str(gwei)) * WEI_PER_GWEI)
+
     def _load_config(self, config_path=None):
         """Load config from file or return defaults"""
-        search_paths = [
-            config_path,
-            Path.cwd() / "config" / "gas.json",
-            Path(__file__).parent.parent.parent / "config" / "gas.json",
-            Path.home() / ".amm-trading" / "config" / "gas.json",
-        ]
-
-        for path in search_paths:
-            if path and Path(path).exists():
-                with open(path) as f:
-                    return json.load(f)
+        path = Path(config_path) if config_path and Path(config_path).exists() else None
+        if path is None:
+            path = _default_config_path()
+        if path is not None:
+            return _read_config_file(str(path.resolve()), path.stat().st_mtime_ns)
 
         # Return defaults if no config found
         return {
@@ -57,6 +113,13 @@ class GasConfig:
             "gasLimit": self.DEFAULT_GAS_LIMITS.copy(),
         }
 
+    @staticmethod
+    def reload():
+        """Forget parsed config files so the next GasConfig re-reads them"""
+        _read_config_file.cache_clear()
+        _default_config_path.cache_clear()
+        get_default_gas_config.cache_clear()
+
     @property
     def maxFeePerGas(self):
         """Max fee per gas in Gwei (None = no limit)"""
@@ -67,6 +130,21 @@ class GasConfig:
         """Priority fee (tip) in Gwei"""
         return self._config.get("maxPriorityFeePerGas", 1.5)
 
+    @property
+    def batchRequestsLimit(self):
+        """Max requests sent to the RPC at once by batched senders"""
+        return self._config.get("batchRequestsLimit", DEFAULT_BATCH_REQUESTS_LIMIT)
+
+    @property
+    def maxFeePerGasWei(self):
+        """Max fee per gas in Wei (None = no limit)"""
+        return self._max_fee_wei
+
+    @property
+    def maxPriorityFeePerGasWei(self):
+        """Priority fee (tip) in Wei"""
+        return self._priority_fee_wei
+
     def getGasLimit(self, operation_type):
         """
         Get gas limit for operation type.
@@ -77,8 +155,13 @@ class GasConfig:
         Returns:
             Gas limit in units
         """
-        gas_limits = self._config.get("gasLimit", self.DEFAULT_GAS_LIMITS)
-        return gas_limits.get(operation_type, gas_limits.get("default", 500000))
+        return self._gas_limits.get(operation_type, self._default_gas_limit)
+
+
+@lru_cache(maxsize=None)
+def get_default_gas_config():
+    """Get the process-wide GasConfig loaded from the default locations"""
+    return GasConfig()
 
 
 class GasManager:
@@ -97,10 +180,17 @@ class GasManager:
         """
         Args:
             manager: Web3Manager instance
-            config: GasConfig instance (created if None, loads from gas_config.json)
+            config: GasConfig instance (shared default config if None)
         """
         self.manager = manager
-        self.config = config or GasConfig()
+        self.config = config or get_default_gas_config()
+        # (block_number, base_fee, next_base_fee, fetched_at) of the last fee read
+        self._base_fee_cache = None
+        # (operation_type, gas_buffer) -> buffered gas limit
+        self._buffered_gas_limits = {}
+        # (to, from, calldata, block_number of the fee read) -> gas estimate, oldest first
+        self._estimate_cache = OrderedDict()
+        self._estimate_lock = threading.Lock()
 
     @property
     def maxFeePerGas(self):
@@ -118,69 +208,140 @@ class GasManager:
 
     def getBaseFee(self):
         """
-        Get current base fee from latest block.
+        Get current base fee of the latest block.
+
+        Read with eth_feeHistory, which returns a few hundred bytes instead
+        of a full block. The value is reused for BASE_FEE_TTL seconds, so
+        several gas lookups within the same block cost a single RPC.
 
         Returns:
             Base fee in Wei
         """
-        latest_block = self.manager.w3.eth.get_block("latest")
-        return latest_block.get("baseFeePerGas", 0)
+        self._refresh_fees()
+        return self._base_fee_cache[1]
 
-    def getGasParams(self, operation_type=None, gas_buffer=1.2):
+    def getNextBaseFee(self):
+        """
+        Get the base fee the next block will have.
+
+        Returns:
+            Base fee in Wei
+        """
+        self._refresh_fees()
+        return self._base_fee_cache[2]
+
+    def _refresh_fees(self):
+        """Fetch base fees unless the cached ones are still fresh"""
+        if self._cached_base_fee() is not None:
+            return
+        eth = self.manager.w3.eth
+        try:
+            self._store_fee_history(eth.fee_history(1, "latest"))
+        except Exception:
+            # Node without eth_feeHistory: fall back to reading the block
+            block = eth.get_block("latest")
+            base_fee = block.get("baseFeePerGas", 0)
+            self._base_fee_cache = (block.get("number"), base_fee, base_fee, time.monotonic())
+
+    def _fresh_fee_cache(self):
+        """The cached fee read, or None if missing or older than BASE_FEE_TTL"""
+        cached = self._base_fee_cache
+        if cached is not None and time.monotonic() - cached[3] < BASE_FEE_TTL:
+            return cached
+        return None
+
+    def _cached_base_fee(self):
+        """Cached base fee in Wei, or None if missing or older than BASE_FEE_TTL"""
+        cached = self._fresh_fee_cache()
+        return cached[1] if cached is not None else None
+
+    def _cached_block_number(self):
+        """Block number of the cached fee read, or None if missing or older than BASE_FEE_TTL"""
+        cached = self._fresh_fee_cache()
+        return cached[0] if cached is not None else None
+
+    def _store_fee_history(self, history):
+        """Cache the base fees from an eth_feeHistory(1, "latest") result and return the current one"""
+        # baseFeePerGas holds the latest block's fee followed by the next block's
+        base_fee, next_base_fee = history["baseFeePerGas"][0], history["baseFeePerGas"][-1]
+        self._base_fee_cache = (history["oldestBlock"], base_fee, next_base_fee, time.monotonic())
+        return base_fee
+
+    def _next_base_fee(self, base_fee):
+        """Next block's base fee if it belongs to base_fee's cached read, else base_fee"""
+        cached = self._base_fee_cache
+        if cached is not None and cached[1] == base_fee:
+            return cached[2]
+        return base_fee
+
+    def invalidate(self):
+        """Drop the cached base fee so the next lookup reads a fresh block"""
+        self._base_fee_cache = None
+        with self._estimate_lock:
+            self._estimate_cache.clear()
+
+    def getGasParams(self, operation_type=None, gas_buffer=1.2, base_fee=None):
         """
         Get EIP-1559 gas parameters for a transaction.
 
         Args:
             operation_type: Transaction type for gas limit lookup
             gas_buffer: Multiplier for gas limit (default 1.2 = +20%)
+            base_fee: Already fetched base fee in Wei (fetched if None)
 
         Returns:
-            Dict with maxFeePerGas, maxPriorityFeePerGas, gas (all in Wei)
+            GasParams(max_fee_wei, priority_fee_wei, gas)
 
         Raises:
             GasPriceTooHighError: If base fee exceeds maxFeePerGas
         """
-        base_fee = self.getBaseFee()
-        base_fee_gwei = base_fee / 1e9
+        if base_fee is None:
+            base_fee = self.getBaseFee()
 
         # Get priority fee in Wei
-        priority_fee_gwei = self.maxPriorityFeePerGas or 1.5
-        priority_fee_wei = int(priority_fee_gwei * 1e9)
+        priority_fee_wei = self.config.maxPriorityFeePerGasWei
 
         # Calculate maxFeePerGas
-        if self.maxFeePerGas is not None:
-            max_fee_gwei = self.maxFeePerGas
-            max_fee_wei = int(max_fee_gwei * 1e9)
-
+        max_fee_wei = self.config.maxFeePerGasWei
+        if max_fee_wei is not None:
             # Validate: maxFeePerGas must be >= baseFee for transaction to be included
             if max_fee_wei < base_fee:
+                base_fee_gwei = base_fee / WEI_PER_GWEI
                 raise GasPriceTooHighError(
                     f"Current base fee ({base_fee_gwei:.2f} Gwei) exceeds your "
-                    f"maxFeePerGas ({max_fee_gwei} Gwei). Transaction cannot be included. "
+                    f"maxFeePerGas ({self.maxFeePerGas} Gwei). Transaction cannot be included. "
                     f"Either increase maxFeePerGas or wait for lower network congestion."
                 )
         else:
-            # No limit set - use base fee + priority fee with buffer
-            max_fee_wei = int((base_fee + priority_fee_wei) * 1.2)
+            # No limit set - leave room for the base fee to double (wallet standard)
+            max_fee_wei = self._next_base_fee(base_fee) * 2 + priority_fee_wei
 
         # Get gas limit
-        gas_limit = self.getGasLimit(operation_type)
-        gas_limit = int(gas_limit * gas_buffer)
+        key = (operation_type, gas_buffer)
+        gas_limit = self._buffered_gas_limits.get(key)
+        if gas_limit is None:
+            gas_limit = int(self.getGasLimit(operation_type) * gas_buffer)
+            self._buffered_gas_limits[key] = gas_limit
 
-        return {
-            "maxFeePerGas": max_fee_wei,
-            "maxPriorityFeePerGas": priority_fee_wei,
-            "gas": gas_limit,
-        }
+        return GasParams(max_fee_wei, priority_fee_wei, gas_limit)
 
-    def estimateGas(self, contract_func, from_address, operation_type=None):
+    def estimateGas(self, contract_func, from_address, operation_type=None, data=None):
         """
         Estimate gas for a contract function call.
 
+        Successful estimates are cached, so retrying the same call (e.g. in
+        a slippage retry loop) skips the node simulation. The cache key is
+        the block number of the last base fee read, which build() has just
+        made; no fee read is made here. The cache is therefore bounded by
+        BASE_FEE_TTL rather than strictly per block: an estimate can be
+        reused for up to BASE_FEE_TTL seconds after a new block. Without a
+        fresh fee read the node is always asked.
+
         Args:
             contract_func: Contract function to estimate
             from_address: Address to estimate from
             operation_type: Type of operation for fallback
+            data: The call's already encoded calldata (encoded here if None)
 
         Returns:
             Estimated gas amount
@@ -188,10 +349,32 @@ class GasManager:
         fallback = self.getGasLimit(operation_type)
 
         try:
-            return contract_func.estimate_gas({"from": from_address})
+            if data is None:
+                data = contract_func._encode_transaction_data()
+            block_number = self._cached_block_number()
+            key = None
+            if block_number is not None:
+                key = (contract_func.address, from_address, data, block_number)
+                with self._estimate_lock:
+                    estimate = self._estimate_cache.get(key)
+                if estimate is not None:
+                    return estimate
+
+            estimate = self.manager.w3.eth.estimate_gas({
+                "from": from_address,
+                "to": contract_func.address,
+                "data": data,
+            })
         except Exception:
             return fallback
 
+        if key is not None:
+            with self._estimate_lock:
+                self._estimate_cache[key] = estimate
+                if len(self._estimate_cache) > GAS_ESTIMATE_CACHE_SIZE:
+                    self._estimate_cache.popitem(last=False)
+        return estimate
+
     def calculateMaxCost(self, operation_type=None, gas_buffer=1.2):
         """
         Calculate maximum possible transaction cost.
@@ -204,15 +387,17 @@ class GasManager:
             Dict with cost breakdown
         """
         params = self.getGasParams(operation_type, gas_buffer)
-        max_cost_wei = params["gas"] * params["maxFeePerGas"]
+        # Served from the cache filled by getGasParams
+        base_fee = self.getBaseFee()
+        max_cost_wei = params.gas * params.max_fee_wei
 
         return {
-            "gasLimit": params["gas"],
-            "maxFeePerGas_gwei": params["maxFeePerGas"] / 1e9,
-            "maxPriorityFeePerGas_gwei": params["maxPriorityFeePerGas"] / 1e9,
+            "gasLimit": params.gas,
+            "maxFeePerGas_gwei": params.max_fee_wei / WEI_PER_GWEI,
+            "maxPriorityFeePerGas_gwei": params.priority_fee_wei / WEI_PER_GWEI,
             "maxCost_wei": max_cost_wei,
             "maxCost_eth": max_cost_wei / 1e18,
-            "baseFee_gwei": self.getBaseFee() / 1e9,
+            "baseFee_gwei": base_fee / WEI_PER_GWEI,
         }
 
     def formatSummary(self, operation_type=None, gas_buffer=1.2):
@@ -235,3 +420,72 @@ class GasManager:
             f"  Gas Limit:    {cost['gasLimit']:,}\n"
             f"  Max Cost:     {cost['maxCost_eth']:.6f} ETH"
         )
+
+
+class NonceTracker:
+    """
+    Hands out consecutive nonces for one account from a local counter.
+
+    The counter is synced from the pending transaction count on first
+    use and then advanced locally, so a burst of transactions costs one
+    eth_getTransactionCount instead of one per transaction. Call resync()
+    whenever a reserved nonce was not used (build or send failed) or the
+    account sent transactions through another path; the next reserve()
+    then re-reads the count from the node.
+    """
+
+    def __init__(self, manager, address):
+        """
+        Args:
+            manager: Web3Manager instance
+            address: Account the nonces are for
+        """
+        self.manager = manager
+        self.address = address
+        self._next_nonce = None
+        self._lock = threading.Lock()
+
+    @property
+    def synced(self):
+        """Whether the next reserve() can be served without an RPC"""
+        return self._next_nonce is not None
+
+    def reserve(self, count=1, pending_count=None):
+        """
+        Reserve consecutive nonces.
+
+        Args:
+            count: Number of nonces to reserve
+            pending_count: Already fetched pending transaction count, used
+                to sync instead of an RPC if the tracker is not synced
+
+        Returns:
+            First reserved nonce
+        """
+        with self._lock:
+            if self._next_nonce is None:
+                if pending_count is None:
+                    pending_count = self.manager.w3.eth.get_transaction_count(
+                        self.address, "pending"
+                    )
+                self._next_nonce = pending_count
+            nonce = self._next_nonce
+            self._next_nonce += count
+            return nonce
+
+    def resync(self):
+        """Forget the local counter so the next reserve() reads it from the node"""
+        with self._lock:
+            self._next_nonce = None
+
+
+@lru_cache(maxsize=None)
+def get_nonce_tracker(manager, address):
+    """
+    Get the NonceTracker shared by everything sending from an account.
+
+    Each contract wrapper owns its own TransactionBuilder, so the counter
+    has to live here rather than on the builder for an approve sent by
+    one wrapper to be seen by a swap sent from another.
+    """
+    return NonceTracker(manager, address)
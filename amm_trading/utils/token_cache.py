@@ -0,0 +1,116 @@
+"""Persistent cache for ERC20 token metadata"""
+
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+# Cache file in working directory, shared by all protocols
+TOKEN_CACHE_FILE = Path.cwd() / "token_cache.json"
+
+
+class TokenCache:
+    """
+    On-disk cache of ERC20 token metadata (symbol, decimals, ...).
+
+    Token metadata is immutable, so entries never expire; they are keyed
+    by chain ID and lowercased address and written through on every miss
+    (use set_many() to store several tokens with one write). The file is
+    replaced atomically, and an unreadable file is treated as empty.
+    Use clear() to force a re-fetch.
+
+    File format:
+    {
+        "1": {
+            "0xa0b8...": {"address": "0xA0b8...", "symbol": "USDC", "decimals": 6}
+        }
+    }
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Cache file path (default: token_cache.json in working directory)
+        """
+        self.path = Path(path) if path else TOKEN_CACHE_FILE
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _load(self):
+        """Load cache from file on first use (empty if missing or corrupt)"""
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_bytes())
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        """Atomically replace the cache file with the in-memory data"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, chain_id, address):
+        """
+        Get cached token info.
+
+        Args:
+            chain_id: Chain ID the token lives on
+            address: Token address (any case)
+
+        Returns:
+            Token info dict, or None if not cached
+        """
+        with self._lock:
+            return self._load().get(str(chain_id), {}).get(address.lower())
+
+    def set(self, chain_id, address, info):
+        """
+        Store token info and write the cache file.
+
+        Args:
+            chain_id: Chain ID the token lives on
+            address: Token address (any case)
+            info: Token info dict (must be JSON serializable)
+        """
+        self.set_many(chain_id, {address: info})
+
+    def set_many(self, chain_id, infos):
+        """
+        Store info for several tokens with a single write of the cache file.
+
+        Args:
+            chain_id: Chain ID the tokens live on
+            infos: Dict of token address (any case) -> token info dict
+        """
+        if not infos:
+            return
+        with self._lock:
+            chain = self._load().setdefault(str(chain_id), {})
+            for address, info in infos.items():
+                chain[address.lower()] = info
+            self._save()
+
+    def clear(self):
+        """Drop all cached entries and delete the cache file"""
+        with self._lock:
+            self._data = {}
+            if self.path.exists():
+                self.path.unlink()
+
+
+@lru_cache(maxsize=None)
+def get_token_cache():
+    """Get the process-wide TokenCache instance"""
+    return TokenCache()
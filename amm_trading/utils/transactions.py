@@ -1,6 +1,11 @@
 """Transaction utilities with EIP-1559 support"""
 
-from .gas import GasManager
+import asyncio
+
+from .gas import GasManager, get_nonce_tracker
+
+# Node errors meaning the nonce we used is already taken
+_NONCE_TAKEN_ERRORS = ("nonce too low", "replacement transaction underpriced")
 
 
 class TransactionBuilder:
@@ -14,6 +19,14 @@ class TransactionBuilder:
         """
         self.manager = manager
         self.gas_manager = gas_manager or GasManager(manager)
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the sender and chain from the manager (e.g. after switching accounts)"""
+        self._from = self.manager.address
+        self._chain_id = None  # read from the manager on first build
+        self._eth = self.manager.w3.eth
+        self.nonce_tracker = get_nonce_tracker(self.manager, self._from)
 
     def build(self, contract_func, operation_type=None, gas_buffer=1.2, value=0):
         """
@@ -25,35 +38,110 @@ class TransactionBuilder:
             gas_buffer: Multiplier for gas limit (default 1.2 = +20%)
             value: ETH value to send in wei (default 0)
 
+        The nonce is reserved from the shared nonce tracker; if the
+        returned transaction is not sent, call nonce_tracker.resync().
+
         Returns:
             Transaction dictionary ready for signing
 
         Raises:
             GasPriceTooHighError: If base fee exceeds maxFeePerGas
         """
+        base_fee, nonce = self._fetch_base_fee_and_nonce()
+        try:
+            return self._build_tx(contract_func, operation_type, gas_buffer, value, base_fee, nonce)
+        except Exception:
+            self.nonce_tracker.resync()
+            raise
+
+    def _build_tx(self, contract_func, operation_type, gas_buffer, value, base_fee, nonce):
+        """Build a transaction from an already fetched base fee and nonce"""
         # Get EIP-1559 gas parameters (validates against maxFeePerGas)
-        gas_params = self.gas_manager.getGasParams(operation_type, gas_buffer=1.0)
+        gas_params = self.gas_manager.getGasParams(
+            operation_type, gas_buffer=1.0, base_fee=base_fee
+        )
+
+        # Encode the call once for both the estimate and the transaction
+        data = contract_func._encode_transaction_data()
 
         # Estimate actual gas needed
         estimated_gas = self.gas_manager.estimateGas(
-            contract_func, self.manager.address, operation_type
+            contract_func, self._from, operation_type, data=data
         )
         gas_limit = int(estimated_gas * gas_buffer)
 
-        tx = {
-            "from": self.manager.address,
-            "nonce": self.manager.get_nonce(),
+        if self._chain_id is None:
+            self._chain_id = self.manager.chain_id
+
+        return {
+            "from": self._from,
+            "to": contract_func.address,
+            "data": data,
+            "value": value,
+            "nonce": nonce,
             "gas": gas_limit,
-            "maxFeePerGas": gas_params["maxFeePerGas"],
-            "maxPriorityFeePerGas": gas_params["maxPriorityFeePerGas"],
-            "chainId": self.manager.chain_id,
+            "maxFeePerGas": gas_params.max_fee_wei,
+            "maxPriorityFeePerGas": gas_params.priority_fee_wei,
+            "chainId": self._chain_id,
             "type": 2,  # EIP-1559 transaction type
         }
 
-        if value > 0:
-            tx["value"] = value
+    def _fetch_base_fee_and_nonce(self, count=1):
+        """
+        Read the latest base fee and reserve nonces.
+
+        Nonces come from the shared nonce tracker. When it still has to
+        sync and the base fee is not cached, both reads go out as one
+        JSON-RPC batch if web3 supports it (web3.py >= 7); otherwise, or if
+        the provider rejects batches, they are sent one after the other.
+
+        Args:
+            count: Number of consecutive nonces to reserve
+
+        Returns:
+            (base_fee, first_nonce) tuple
+        """
+        tracker = self.nonce_tracker
+        base_fee = self.gas_manager._cached_base_fee()
+        if base_fee is not None or tracker.synced:
+            if base_fee is None:
+                base_fee = self.gas_manager.getBaseFee()
+            return base_fee, tracker.reserve(count)
+
+        w3 = self.manager.w3
+        eth = self._eth
+        if hasattr(w3, "batch_requests"):
+            try:
+                with w3.batch_requests() as batch:
+                    batch.add(eth.fee_history(1, "latest"))
+                    batch.add(eth.get_transaction_count(self._from, "pending"))
+                    history, pending_count = batch.execute()
+                base_fee = self.gas_manager._store_fee_history(history)
+                return base_fee, tracker.reserve(count, pending_count=pending_count)
+            except Exception:
+                pass
+
+        return self.gas_manager.getBaseFee(), tracker.reserve(count)
+
+    def _send(self, tx):
+        """
+        Sign and send a transaction.
 
-        return contract_func.build_transaction(tx)
+        On a rejected send the nonce tracker is resynced before the error
+        is re-raised.
+
+        Returns:
+            Transaction hash
+        """
+        signed = self.manager.account.sign_transaction(tx)
+        try:
+            return self._eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            if "already known" in str(e).lower():
+                # The very same transaction is already in the mempool
+                return signed.hash
+            self.nonce_tracker.resync()
+            raise
 
     def build_and_send(self, contract_func, operation_type=None, gas_buffer=1.2,
                        value=0, wait=True):
@@ -74,36 +162,98 @@ class TransactionBuilder:
             GasPriceTooHighError: If base fee exceeds maxFeePerGas
         """
         tx = self.build(contract_func, operation_type, gas_buffer, value)
-
-        signed = self.manager.account.sign_transaction(tx)
-        tx_hash = self.manager.w3.eth.send_raw_transaction(signed.raw_transaction)
+        try:
+            tx_hash = self._send(tx)
+        except Exception as e:
+            if not any(msg in str(e).lower() for msg in _NONCE_TAKEN_ERRORS):
+                raise
+            # Another tx from this account took the nonce; retry on a fresh one
+            tx = self.build(contract_func, operation_type, gas_buffer, value)
+            tx_hash = self._send(tx)
 
         if not wait:
             return tx_hash
 
-        receipt = self.manager.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self._eth.wait_for_transaction_receipt(tx_hash)
+        # A new block was mined; don't price the next tx off the old base fee
+        self.gas_manager.invalidate()
         return receipt
 
+    async def build_and_send_many(self, calls, gas_buffer=1.2, wait=True):
+        """
+        Build, sign, and send several independent transactions concurrently.
 
-# Legacy functions for backward compatibility
+        The base fee is fetched once and the transactions take
+        consecutive nonces reserved in one go from the nonce tracker. Gas
+        is estimated for all of them concurrently against the current
+        state, so the calls must not depend on each other (e.g. an approve
+        followed by a swap spending that approval); send dependent calls
+        with build_and_send instead.
 
-def estimate_gas(contract_func, from_address, fallback=500000):
-    """
-    Estimate gas for a contract function call.
+        Requests go out in chunks of the gas config's batchRequestsLimit:
+        each chunk is built and sent concurrently, chunks one after the
+        other, so large batches stay under provider request caps.
 
-    Args:
-        contract_func: Contract function to estimate
-        from_address: Address to estimate from
-        fallback: Fallback gas if estimation fails
+        Args:
+            calls: List of (contract_func, operation_type) or
+                (contract_func, operation_type, value) tuples
+            gas_buffer: Multiplier for gas limit
+            wait: Whether to wait for receipts
 
-    Returns:
-        Estimated gas amount
-    """
-    try:
-        return contract_func.estimate_gas({"from": from_address})
-    except Exception:
-        return fallback
+        Returns:
+            List of receipts if wait=True, else tx hashes, in the order of calls
 
+        Raises:
+            GasPriceTooHighError: If base fee exceeds maxFeePerGas
+        """
+        if not calls:
+            return []
+
+        limit = self.gas_manager.config.batchRequestsLimit
+        base_fee, base_nonce = await asyncio.to_thread(
+            self._fetch_base_fee_and_nonce, len(calls)
+        )
+        async_eth = self.manager.async_w3.eth
+
+        # Any failure before all sends went through leaves a nonce gap
+        tx_hashes = []
+        try:
+            for start in range(0, len(calls), limit):
+                txs = await asyncio.gather(*(
+                    asyncio.to_thread(
+                        self._build_tx,
+                        call[0],
+                        call[1],
+                        gas_buffer,
+                        call[2] if len(call) > 2 else 0,
+                        base_fee,
+                        base_nonce + i,
+                    )
+                    for i, call in enumerate(calls[start:start + limit], start)
+                ))
+
+                signed = [self.manager.account.sign_transaction(tx) for tx in txs]
+                tx_hashes.extend(await asyncio.gather(*(
+                    async_eth.send_raw_transaction(s.raw_transaction) for s in signed
+                )))
+        except Exception:
+            self.nonce_tracker.resync()
+            raise
+
+        if not wait:
+            return tx_hashes
+
+        receipts = []
+        for start in range(0, len(tx_hashes), limit):
+            receipts.extend(await asyncio.gather(*(
+                async_eth.wait_for_transaction_receipt(tx_hash)
+                for tx_hash in tx_hashes[start:start + limit]
+            )))
+        self.gas_manager.invalidate()
+        return receipts
+
+
+# Standalone helper for pre-built transactions
 
 def send_transaction(manager, tx_data, wait=True):
     """
@@ -125,53 +275,3 @@ def send_transaction(manager, tx_data, wait=True):
 
     receipt = manager.w3.eth.wait_for_transaction_receipt(tx_hash)
     return receipt
-
-
-def build_tx_eip1559(manager, contract_func, gas_manager, operation_type=None, gas_buffer=1.2, value=0):
-    """
-    Build an EIP-1559 transaction for a contract function.
-
-    Args:
-        manager: Web3Manager instance
-        contract_func: Contract function to call
-        gas_manager: GasManager instance
-        operation_type: Operation type for gas limit
-        gas_buffer: Multiplier for gas estimate
-        value: ETH value to send in wei
-
-    Returns:
-        Transaction dictionary ready for signing
-    """
-    gas_params = gas_manager.getGasParams(operation_type, gas_buffer=1.0)
-    estimated_gas = gas_manager.estimateGas(contract_func, manager.address, operation_type)
-    gas_limit = int(estimated_gas * gas_buffer)
-
-    tx = {
-        "from": manager.address,
-        "nonce": manager.get_nonce(),
-        "gas": gas_limit,
-        "maxFeePerGas": gas_params["maxFeePerGas"],
-        "maxPriorityFeePerGas": gas_params["maxPriorityFeePerGas"],
-        "chainId": manager.chain_id,
-        "type": 2,
-    }
-
-    if value > 0:
-        tx["value"] = value
-
-    return contract_func.build_transaction(tx)
-
-
-def format_gas_cost(gas, max_fee_per_gas):
-    """
-    Format maximum gas cost in ETH.
-
-    Args:
-        gas: Gas limit
-        max_fee_per_gas: Max fee per gas in wei
-
-    Returns:
-        Maximum cost in ETH as float
-    """
-    cost_wei = gas * max_fee_per_gas
-    return cost_wei / 1e18
@@ -0,0 +1,115 @@
+"""
+Helpers shared by the archive scripts: RPC session, Multicall3 and the
+on-disk token metadata cache.
+Import from a script in this directory: from archive_utils import ...
+"""
+
+import json
+import os
+import tempfile
+import requests
+from eth_abi import decode, encode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Multicall3 (same address on every major chain) and the ERC20 selectors we batch through it
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")
+
+# Max sub-calls per aggregate3 eth_call (keeps each call under node gas caps)
+MULTICALL_BATCH_SIZE = 500
+
+# On-disk cache of immutable token metadata, shared by the archive scripts:
+# {chain_id: {checksum_address: {'decimals': ..., 'symbol': ...}}}
+TOKEN_CACHE_FILE = os.path.join(os.path.dirname(__file__), 'results', 'token_cache.json')
+
+
+def load_token_cache():
+    """Load the token metadata cache (empty if missing or unreadable)"""
+    try:
+        with open(TOKEN_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+TOKEN_CACHE = load_token_cache()
+
+
+def save_token_cache():
+    """
+    Merge TOKEN_CACHE into the cache file and atomically replace it.
+
+    Entries another script wrote since we loaded are kept (and picked up
+    into TOKEN_CACHE), and each writer uses its own temp file, so scripts
+    running at the same time do not drop each other's tokens.
+    """
+    merged = load_token_cache()
+    for chain_id, tokens in TOKEN_CACHE.items():
+        merged.setdefault(chain_id, {}).update(tokens)
+
+    cache_dir = os.path.dirname(TOKEN_CACHE_FILE)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".token_cache.", suffix=".tmp")
+    try:
+        # mkstemp creates the file owner-only; the cache is not secret
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(merged, f, indent=2)
+        os.replace(tmp_path, TOKEN_CACHE_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # Update in place: scripts hold references to the per-chain dicts
+    for chain_id, tokens in merged.items():
+        TOKEN_CACHE.setdefault(chain_id, {}).update(tokens)
+
+
+def decode_symbol(data):
+    """Decode a symbol() result (string, or bytes32 for tokens like MKR)"""
+    try:
+        return decode(['string'], data)[0]
+    except Exception:
+        return data[:32].rstrip(b'\x00').decode('utf-8', errors='replace')
+
+
+def create_session():
+    """requests Session with keep-alive pooling and retries on connection errors"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def multicall(w3, calls):
+    """
+    Run several read calls in one eth_call through Multicall3's aggregate3.
+
+    Sub-calls may fail individually (allowFailure is set), so callers must
+    check each success flag. Large batches are split into several eth_calls.
+
+    Args:
+        w3: Web3 instance
+        calls: List of (target_address, calldata_bytes)
+
+    Returns:
+        List of (success, return_data) in the same order as calls
+    """
+    results = []
+    for start in range(0, len(calls), MULTICALL_BATCH_SIZE):
+        data = AGGREGATE3_SELECTOR + encode(
+            ['(address,bool,bytes)[]'],
+            [[(target, True, calldata)
+              for target, calldata in calls[start:start + MULTICALL_BATCH_SIZE]]]
+        )
+        result = w3.eth.call({'to': MULTICALL3_ADDRESS, 'data': data})
+        results.extend(decode(['(bool,bytes)[]'], result)[0])
+    return results
@@ -11,8 +11,20 @@ import json
 import os
 import time
 import argparse
+from collections import namedtuple
+from eth_abi import decode
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 from dotenv import load_dotenv
+from archive_utils import (
+    DECIMALS_SELECTOR,
+    SYMBOL_SELECTOR,
+    TOKEN_CACHE,
+    create_session,
+    decode_symbol,
+    multicall,
+    save_token_cache,
+)
 
 # Load environment variables
 load_dotenv()
@@ -39,9 +51,45 @@ ABIS = load_abis()
 # Contract addresses
 NFPM_ADDRESS = Web3.to_checksum_address(CONFIG['contracts']['uniswap_v3_nfpm'])
 
+# Receipt polling: blocks are >= 12s on mainnet, so polling every 0.1s (web3's
+# default) mostly burns RPC requests. Both are tunable from the environment.
+RECEIPT_TIMEOUT = int(os.getenv('RECEIPT_TIMEOUT', '300'))
+RECEIPT_POLL_SECS = float(os.getenv('RECEIPT_POLL_SECS', '2'))
+
+# Reuse fetched fee data for this long before asking the node again
+FEE_CACHE_SECS = 15
+
+# Calibrated gas use of the NFPM calls this script sends, padded by
+# GAS_SAFETY_FACTOR. Only used without estimate_gas when --fast-gas is passed,
+# since the estimate doubles as a check that the tx would not revert.
+SELECTOR_GAS = {
+    'decreaseLiquidity': 180000,
+    'collect': 150000,
+    'burn': 80000
+}
+GAS_SAFETY_FACTOR = 1.2
+FALLBACK_GAS = 500000
+
+# NFPM events decoded from receipts
+NFPM_EVENTS = ('DecreaseLiquidity', 'Collect')
+
+# Field order of NonfungiblePositionManager.positions(tokenId)
+Position = namedtuple('Position', [
+    'nonce', 'operator', 'token0', 'token1', 'fee', 'tickLower', 'tickUpper',
+    'liquidity', 'feeGrowthInside0LastX128', 'feeGrowthInside1LastX128',
+    'tokensOwed0', 'tokensOwed1'
+])
+TokenInfo = namedtuple('TokenInfo', ['address', 'decimals', 'symbol'])
+
 
 class UniswapV3LiquidityRemover:
-    def __init__(self):
+    def __init__(self, fast_gas=False):
+        """
+        Args:
+            fast_gas: Use the SELECTOR_GAS limits instead of estimate_gas,
+                skipping the node-side revert check
+        """
+        self.fast_gas = fast_gas
         rpc_url = os.getenv('RPC_URL')
         private_key = os.getenv('PRIVATE_KEY')
 
@@ -50,18 +98,40 @@ class UniswapV3LiquidityRemover:
         if not private_key:
             raise ValueError("PRIVATE_KEY not found in wallet.env file")
 
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.w3 = Web3(Web3.HTTPProvider(
+            rpc_url, request_kwargs={'timeout': 30}, session=create_session()))
         if not self.w3.is_connected():
             raise ConnectionError("Failed to connect to Ethereum node")
 
         self.account = self.w3.eth.account.from_key(private_key)
         self.address = self.account.address
 
+        # Chain ID never changes; the nonce is tracked locally after the first read
+        self.chain_id = self.w3.eth.chain_id
+        self._nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
+        self._fees = None  # (max_fee_per_gas, max_priority_fee_per_gas, fetched_at)
+
+        # Token metadata for this chain (entries are checksum address -> info)
+        self.token_cache = TOKEN_CACHE.setdefault(str(self.chain_id), {})
+
         self.nfpm = self.w3.eth.contract(
             address=NFPM_ADDRESS,
             abi=ABIS['uniswap_v3_nfpm']
         )
 
+        # topic0 -> (event name, non-indexed input names, their ABI types) for
+        # the NFPM events we report on, so a receipt is decoded in one pass
+        self._event_decoders = {}
+        for item in self.nfpm.abi:
+            if item.get('type') == 'event' and item['name'] in NFPM_EVENTS:
+                signature = f"{item['name']}({','.join(i['type'] for i in item['inputs'])})"
+                data_inputs = [i for i in item['inputs'] if not i['indexed']]
+                self._event_decoders[Web3.keccak(text=signature)] = (
+                    item['name'],
+                    [i['name'] for i in data_inputs],
+                    [i['type'] for i in data_inputs]
+                )
+
         print(f"📝 Using account: {self.address}")
         print(
             f"💰 ETH Balance: {self.w3.from_wei(self.w3.eth.get_balance(self.address), 'ether'):.6f} ETH\n")
@@ -69,36 +139,137 @@ class UniswapV3LiquidityRemover:
     def get_position_info(self, token_id):
         """Get position information"""
         try:
-            position = self.nfpm.functions.positions(token_id).call()
-            return {
-                'nonce': position[0],
-                'operator': position[1],
-                'token0': position[2],
-                'token1': position[3],
-                'fee': position[4],
-                'tickLower': position[5],
-                'tickUpper': position[6],
-                'liquidity': position[7],
-                'feeGrowthInside0LastX128': position[8],
-                'feeGrowthInside1LastX128': position[9],
-                'tokensOwed0': position[10],
-                'tokensOwed1': position[11]
-            }
+            return Position(*self.nfpm.functions.positions(token_id).call())
         except Exception as e:
             raise ValueError(
                 f"Failed to get position info for token_id {token_id}: {e}")
 
     def get_token_info(self, token_address):
-        """Get token decimals and symbol"""
-        token = self.w3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ABIS['erc20']
-        )
+        """Get token decimals and symbol as a TokenInfo"""
+        return self.get_tokens_info([token_address])[0]
+
+    def get_tokens_info(self, token_addresses):
+        """Get TokenInfo for several tokens with a single Multicall3 call"""
+        addresses = [Web3.to_checksum_address(a) for a in token_addresses]
+        missing = [a for a in dict.fromkeys(addresses) if a not in self.token_cache]
+
+        if missing:
+            calls = []
+            for address in missing:
+                calls.append((address, DECIMALS_SELECTOR))
+                calls.append((address, SYMBOL_SELECTOR))
+            try:
+                results = multicall(self.w3, calls)
+                for i, address in enumerate(missing):
+                    (ok_decimals, decimals_data), (ok_symbol, symbol_data) = results[2 * i:2 * i + 2]
+                    if not (ok_decimals and ok_symbol):
+                        raise ValueError(f"Token metadata call failed for {address}")
+                    self.token_cache[address] = {
+                        'decimals': decode(['uint8'], decimals_data)[0],
+                        'symbol': decode_symbol(symbol_data)
+                    }
+            except Exception:
+                # No Multicall3 on this chain (or a sub-call failed): read each token directly
+                erc20 = self.w3.eth.contract(abi=ABIS['erc20'])
+                for address in missing:
+                    token = erc20(address=address)
+                    self.token_cache[address] = {
+                        'decimals': token.functions.decimals().call(),
+                        'symbol': token.functions.symbol().call()
+                    }
+
+            save_token_cache()
+
+        return [
+            TokenInfo(a, self.token_cache[a]['decimals'], self.token_cache[a]['symbol'])
+            for a in addresses
+        ]
+
+    def decode_events(self, receipt):
+        """
+        Decode the NFPM events in a receipt with a single pass over its logs.
+
+        Returns:
+            Dict of event name -> list of non-indexed args dicts, in log order
+        """
+        events = {}
+        for log in receipt.logs:
+            if not log['topics'] or log['address'] != NFPM_ADDRESS:
+                continue
+            decoder = self._event_decoders.get(log['topics'][0])
+            if decoder is None:
+                continue
+            name, arg_names, arg_types = decoder
+            values = decode(arg_types, bytes(log['data']))
+            events.setdefault(name, []).append(dict(zip(arg_names, values)))
+        return events
+
+    def get_fees(self):
+        """
+        EIP-1559 fees from one eth_feeHistory call, cached for FEE_CACHE_SECS.
+
+        Returns:
+            (max_fee_per_gas, max_priority_fee_per_gas) in wei
+        """
+        if self._fees is None or time.monotonic() - self._fees[2] > FEE_CACHE_SECS:
+            history = self.w3.eth.fee_history(1, 'latest', [50])
+            # baseFeePerGas ends with the next block's base fee; allow it to double
+            priority_fee = history['reward'][0][0]
+            max_fee = history['baseFeePerGas'][-1] * 2 + priority_fee
+            self._fees = (max_fee, priority_fee, time.monotonic())
+        return self._fees[0], self._fees[1]
+
+    def gas_limit(self, contract_func):
+        """
+        Gas limit for an NFPM call.
+
+        Asks the node with estimate_gas, which also simulates the call: a
+        revert raises here instead of being broadcast and burning gas. With
+        fast_gas the calibrated SELECTOR_GAS entry is used instead, saving
+        that round trip but skipping the check.
+
+        Raises:
+            ContractLogicError: If the call would revert
+        """
+        name = contract_func.fn_name
+        if self.fast_gas and name in SELECTOR_GAS:
+            return int(SELECTOR_GAS[name] * GAS_SAFETY_FACTOR)
+
+        try:
+            gas_estimate = contract_func.estimate_gas({'from': self.address})
+            print(f"⛽ Estimated gas: {gas_estimate:,}")
+        except ContractLogicError as e:
+            print(f"❌ Transaction would revert: {e}")
+            raise
+        except Exception as e:
+            print(f"⚠️  Gas estimation failed: {e}")
+            gas_estimate = SELECTOR_GAS.get(name, FALLBACK_GAS)
+        return int(gas_estimate * GAS_SAFETY_FACTOR)
+
+    def tx_params(self, gas):
+        """Transaction fields for the next transaction from this account"""
+        max_fee, priority_fee = self.get_fees()
         return {
-            'decimals': token.functions.decimals().call(),
-            'symbol': token.functions.symbol().call()
+            'from': self.address,
+            'nonce': self._nonce,
+            'gas': gas,
+            'maxFeePerGas': max_fee,
+            'maxPriorityFeePerGas': priority_fee,
+            'chainId': self.chain_id
         }
 
+    def send_transaction(self, tx):
+        """Sign and send a transaction, advancing the local nonce"""
+        signed_tx = self.account.sign_transaction(tx)
+        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        self._nonce += 1
+        return tx_hash
+
+    def wait_for_receipt(self, tx_hash):
+        """Wait for a transaction receipt using the configured poll interval and timeout"""
+        return self.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=RECEIPT_TIMEOUT, poll_latency=RECEIPT_POLL_SECS)
+
     def decrease_liquidity(self, token_id, liquidity_percentage, collect_fees=True, burn=False, slippage_bps=50):
         """Decrease liquidity from a position"""
 
@@ -106,22 +277,22 @@ class UniswapV3LiquidityRemover:
         position = self.get_position_info(token_id)
 
         # Get token info
-        token0_info = self.get_token_info(position['token0'])
-        token1_info = self.get_token_info(position['token1'])
+        token0_info, token1_info = self.get_tokens_info(
+            [position.token0, position.token1])
 
-        current_liquidity = position['liquidity']
-        tokens_owed0 = position['tokensOwed0']
-        tokens_owed1 = position['tokensOwed1']
+        current_liquidity = position.liquidity
+        tokens_owed0 = position.tokensOwed0
+        tokens_owed1 = position.tokensOwed1
 
         print(f"📊 Position Information:")
-        print(f"   Token 0: {token0_info['symbol']} ({position['token0']})")
-        print(f"   Token 1: {token1_info['symbol']} ({position['token1']})")
-        print(f"   Fee Tier: {position['fee'] / 10000}% ({position['fee']})")
+        print(f"   Token 0: {token0_info.symbol} ({position.token0})")
+        print(f"   Token 1: {token1_info.symbol} ({position.token1})")
+        print(f"   Fee Tier: {position.fee / 10000}% ({position.fee})")
         print(
-            f"   Tick Range: {position['tickLower']} to {position['tickUpper']}")
+            f"   Tick Range: {position.tickLower} to {position.tickUpper}")
         print(f"   Current Liquidity: {current_liquidity}")
-        print(f"   Tokens Owed (fees): {tokens_owed0 / (10**token0_info['decimals']):.6f} {token0_info['symbol']}, "
-              f"{tokens_owed1 / (10**token1_info['decimals']):.6f} {token1_info['symbol']}\n")
+        print(f"   Tokens Owed (fees): {tokens_owed0 / (10**token0_info.decimals):.6f} {token0_info.symbol}, "
+              f"{tokens_owed1 / (10**token1_info.decimals):.6f} {token1_info.symbol}\n")
 
         # Calculate liquidity to remove
         if liquidity_percentage == 100:
@@ -171,55 +342,39 @@ class UniswapV3LiquidityRemover:
         print(f"   Liquidity to remove: {liquidity_to_remove}")
         print(f"   Deadline: {deadline} ({time.ctime(deadline)})\n")
 
-        # Estimate gas
-        try:
-            gas_estimate = self.nfpm.functions.decreaseLiquidity(decrease_params).estimate_gas({
-                'from': self.address
-            })
-            print(f"⛽ Estimated gas: {gas_estimate:,}")
-        except Exception as e:
-            print(f"⚠️  Gas estimation failed: {e}")
-            gas_estimate = 500000  # Fallback
-
         # Build and send decreaseLiquidity transaction
-        nonce = self.w3.eth.get_transaction_count(self.address)
-
-        tx = self.nfpm.functions.decreaseLiquidity(decrease_params).build_transaction({
-            'from': self.address,
-            'nonce': nonce,
-            'gas': int(gas_estimate * 1.2),
-            'gasPrice': self.w3.eth.gas_price,
-            'chainId': self.w3.eth.chain_id
-        })
+        decrease_func = self.nfpm.functions.decreaseLiquidity(decrease_params)
+        tx = decrease_func.build_transaction(
+            self.tx_params(self.gas_limit(decrease_func)))
 
         print(
-            f"💰 Gas price: {self.w3.from_wei(self.w3.eth.gas_price, 'gwei'):.2f} Gwei")
+            f"💰 Max fee: {self.w3.from_wei(tx['maxFeePerGas'], 'gwei'):.2f} Gwei "
+            f"(tip {self.w3.from_wei(tx['maxPriorityFeePerGas'], 'gwei'):.2f} Gwei)")
         print(
-            f"💵 Estimated cost: {self.w3.from_wei(tx['gas'] * tx['gasPrice'], 'ether'):.6f} ETH\n")
+            f"💵 Max cost: {self.w3.from_wei(tx['gas'] * tx['maxFeePerGas'], 'ether'):.6f} ETH\n")
 
-        signed_tx = self.account.sign_transaction(tx)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = self.send_transaction(tx)
 
         print(f"⏳ Transaction sent: {tx_hash.hex()}")
         print(f"🔗 Etherscan: https://etherscan.io/tx/{tx_hash.hex()}\n")
 
         # Wait for confirmation
         print("⏳ Waiting for confirmation...")
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.wait_for_receipt(tx_hash)
 
         if receipt.status == 1:
             print(
                 f"✅ Liquidity decreased successfully in block {receipt.blockNumber}\n")
 
             # Parse DecreaseLiquidity event
-            decrease_event = self.nfpm.events.DecreaseLiquidity().process_receipt(receipt)
+            decrease_event = self.decode_events(receipt).get('DecreaseLiquidity')
             if decrease_event:
-                amount0 = decrease_event[0]['args']['amount0']
-                amount1 = decrease_event[0]['args']['amount1']
+                amount0 = decrease_event[0]['amount0']
+                amount1 = decrease_event[0]['amount1']
                 print(
-                    f"💰 Amount 0 received: {amount0 / (10 ** token0_info['decimals']):.6f} {token0_info['symbol']}")
+                    f"💰 Amount 0 received: {amount0 / (10 ** token0_info.decimals):.6f} {token0_info.symbol}")
                 print(
-                    f"💰 Amount 1 received: {amount1 / (10 ** token1_info['decimals']):.6f} {token1_info['symbol']}\n")
+                    f"💰 Amount 1 received: {amount1 / (10 ** token1_info.decimals):.6f} {token1_info.symbol}\n")
         else:
             raise Exception("Decrease liquidity transaction failed")
 
@@ -251,32 +406,23 @@ class UniswapV3LiquidityRemover:
         }
 
         try:
-            nonce = self.w3.eth.get_transaction_count(self.address)
-
-            tx = self.nfpm.functions.collect(collect_params).build_transaction({
-                'from': self.address,
-                'nonce': nonce,
-                'gas': 300000,
-                'gasPrice': self.w3.eth.gas_price,
-                'chainId': self.w3.eth.chain_id
-            })
-
-            signed_tx = self.account.sign_transaction(tx)
-            tx_hash = self.w3.eth.send_raw_transaction(
-                signed_tx.rawTransaction)
+            collect_func = self.nfpm.functions.collect(collect_params)
+            tx = collect_func.build_transaction(
+                self.tx_params(self.gas_limit(collect_func)))
+            tx_hash = self.send_transaction(tx)
 
             print(f"⏳ Collect transaction sent: {tx_hash.hex()}")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = self.wait_for_receipt(tx_hash)
 
             if receipt.status == 1:
                 # Collect event may not always be emitted, try to parse it
                 try:
-                    collect_event = self.nfpm.events.Collect().process_receipt(receipt)
-                    if collect_event and len(collect_event) > 0:
-                        amount0 = collect_event[0]['args'].get('amount0', 0)
-                        amount1 = collect_event[0]['args'].get('amount1', 0)
-                        print(f"✅ Collected: {amount0 / (10 ** token0_info['decimals']):.6f} {token0_info['symbol']}, "
-                              f"{amount1 / (10 ** token1_info['decimals']):.6f} {token1_info['symbol']}\n")
+                    collect_event = self.decode_events(receipt).get('Collect')
+                    if collect_event:
+                        amount0 = collect_event[0].get('amount0', 0)
+                        amount1 = collect_event[0].get('amount1', 0)
+                        print(f"✅ Collected: {amount0 / (10 ** token0_info.decimals):.6f} {token0_info.symbol}, "
+                              f"{amount1 / (10 ** token1_info.decimals):.6f} {token1_info.symbol}\n")
                     else:
                         print("✅ Collect completed (check transaction for details)\n")
                 except:
@@ -290,22 +436,13 @@ class UniswapV3LiquidityRemover:
     def burn_position(self, token_id):
         """Burn the position NFT (only after removing all liquidity)"""
         try:
-            nonce = self.w3.eth.get_transaction_count(self.address)
-
-            tx = self.nfpm.functions.burn(token_id).build_transaction({
-                'from': self.address,
-                'nonce': nonce,
-                'gas': 200000,
-                'gasPrice': self.w3.eth.gas_price,
-                'chainId': self.w3.eth.chain_id
-            })
-
-            signed_tx = self.account.sign_transaction(tx)
-            tx_hash = self.w3.eth.send_raw_transaction(
-                signed_tx.rawTransaction)
+            burn_func = self.nfpm.functions.burn(token_id)
+            tx = burn_func.build_transaction(
+                self.tx_params(self.gas_limit(burn_func)))
+            tx_hash = self.send_transaction(tx)
 
             print(f"⏳ Burn transaction sent: {tx_hash.hex()}")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = self.wait_for_receipt(tx_hash)
 
             if receipt.status == 1:
                 print(
@@ -330,6 +467,9 @@ def main():
                         help='Burn the position NFT (only when removing 100% liquidity)')
     parser.add_argument('--slippage', type=float, default=0.5,
                         help='Slippage tolerance in percentage (default: 0.5)')
+    parser.add_argument('--fast-gas', action='store_true',
+                        help='Use calibrated gas limits instead of estimate_gas '
+                             '(saves an RPC per tx but skips the revert check)')
 
     args = parser.parse_args()
 
@@ -338,7 +478,7 @@ def main():
         sys.exit(1)
 
     try:
-        remover = UniswapV3LiquidityRemover()
+        remover = UniswapV3LiquidityRemover(fast_gas=args.fast_gas)
 
         remover.decrease_liquidity(
             token_id=args.token_id,
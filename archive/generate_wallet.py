@@ -6,9 +6,10 @@ Usage: python generate_wallet.py
 
 import json
 import os
+import tempfile
 from mnemonic import Mnemonic
 from eth_account import Account
-from eth_account.hdaccount import generate_mnemonic, seed_from_mnemonic
+from eth_account.hdaccount import generate_mnemonic, key_from_seed, seed_from_mnemonic
 
 
 def generate_wallet():
@@ -29,12 +30,14 @@ def generate_wallet():
     print("⚠️  WARNING: Store this phrase securely and NEVER share it!")
     print("=" * 60)
 
+    # Run the mnemonic -> seed PBKDF2 (2048 rounds) once for all accounts
+    seed = seed_from_mnemonic(mnemonic, "")
+
     # Derive the first 3 accounts (m/44'/60'/0'/0/0, m/44'/60'/0'/0/1, m/44'/60'/0'/0/2)
     accounts = []
     for i in range(3):
         # Derive account using standard Ethereum derivation path
-        account = Account.from_mnemonic(
-            mnemonic, account_path=f"m/44'/60'/0'/0/{i}")
+        account = Account.from_key(key_from_seed(seed, f"m/44'/60'/0'/0/{i}"))
 
         accounts.append({
             "account_index": i,
@@ -60,9 +63,20 @@ def generate_wallet():
         "warning": "NEVER share your mnemonic or private keys with anyone!"
     }
 
+    # Write owner-only to a temp file in the same directory, then rename over
+    # wallet.json so a crash never leaves a truncated or world-readable file
     output_file = os.path.join(results_dir, "wallet.json")
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    fd, tmp_path = tempfile.mkstemp(dir=results_dir, prefix=".wallet.", suffix=".tmp")
+    try:
+        os.fchmod(fd, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(output_data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
     print(f"💾 Wallet data saved to: {output_file}")
     print("=" * 60)
@@ -6,11 +6,23 @@ Usage: python query_positions.py 0xYourAddress
 
 import sys
 import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from eth_abi import decode, encode
 from web3 import Web3
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 from collections import defaultdict
+from archive_utils import (
+    DECIMALS_SELECTOR,
+    SYMBOL_SELECTOR,
+    TOKEN_CACHE,
+    create_session,
+    decode_symbol,
+    multicall,
+    save_token_cache,
+)
 
 # Load environment variables
 load_dotenv()
@@ -48,6 +60,37 @@ UNISWAP_NFPM_ABI = ABIS['uniswap_v3_nfpm']
 # Transfer event signature for finding NFTs
 TRANSFER_EVENT_SIG = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
 
+# Concurrent RPC calls for per-token / per-NFT fan-out
+MAX_WORKERS = 16
+
+# Transfer log scan: block window per eth_getLogs, concurrent windows, and
+# how many NFT contracts we look at (query_all_assets only checks the first 20)
+LOG_CHUNK_BLOCKS = 2000
+LOG_WORKERS = 5
+MAX_NFT_CONTRACTS = 20
+
+# Selectors batched through Multicall3 (ERC20 metadata ones live in archive_utils)
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+TOKEN_OF_OWNER_BY_INDEX_SELECTOR = bytes.fromhex("2f745c59")
+POSITIONS_SELECTOR = bytes.fromhex("99fbab88")
+POSITION_TYPES = ['uint96', 'address', 'address', 'address', 'uint24', 'int24', 'int24',
+                  'uint128', 'uint256', 'uint256', 'uint128', 'uint128']
+
+# 0x-prefixed 20-byte hex address, any case
+ADDRESS_RE = re.compile(r'^0x[0-9a-fA-F]{40}$')
+
+# Checksummed form of every address seen, keyed by lowercase hex
+_CHECKSUM_CACHE = {}
+
+
+def checksum(address):
+    """Memoized Web3.to_checksum_address (skips the keccak on repeat addresses)"""
+    key = address.lower()
+    result = _CHECKSUM_CACHE.get(key)
+    if result is None:
+        result = _CHECKSUM_CACHE[key] = Web3.to_checksum_address(key)
+    return result
+
 
 class AddressAssetQuery:
     def __init__(self):
@@ -55,29 +98,55 @@ class AddressAssetQuery:
         if not rpc_url:
             raise ValueError("RPC_URL not found in .env file")
 
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        # Keep-alive pool large enough for MAX_WORKERS concurrent calls
+        self.w3 = Web3(Web3.HTTPProvider(
+            rpc_url, request_kwargs={'timeout': 30}, session=create_session()))
         if not self.w3.is_connected():
             raise ConnectionError("Failed to connect to Ethereum node")
 
+        # Contract factories are built once per ABI; instances once per address
+        self._contract_factories = {
+            'erc20': self.w3.eth.contract(abi=ERC20_ABI),
+            'erc721': self.w3.eth.contract(abi=ERC721_ABI),
+            'nfpm': self.w3.eth.contract(abi=UNISWAP_NFPM_ABI),
+        }
+        self._contracts = {}
+
+        # Token metadata for this chain (entries are checksum address -> info)
+        self.token_cache = TOKEN_CACHE.setdefault(str(self.w3.eth.chain_id), {})
+
     def get_eth_balance(self, address):
         """Get ETH balance"""
-        address = Web3.to_checksum_address(address)
+        address = checksum(address)
         balance_wei = self.w3.eth.get_balance(address)
         balance_eth = self.w3.from_wei(balance_wei, 'ether')
         return balance_eth
 
+    def get_contract(self, address, kind):
+        """Get a cached contract instance ('erc20', 'erc721' or 'nfpm') for an address"""
+        key = (address, kind)
+        contract = self._contracts.get(key)
+        if contract is None:
+            contract = self._contract_factories[kind](
+                address=checksum(address))
+            self._contracts[key] = contract
+        return contract
+
     def get_token_balance(self, token_address, owner_address):
         """Get ERC20 token balance"""
         try:
-            token = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address),
-                abi=ERC20_ABI
-            )
+            token = self.get_contract(token_address, 'erc20')
 
             balance = token.functions.balanceOf(
-                Web3.to_checksum_address(owner_address)).call()
-            decimals = token.functions.decimals().call()
-            symbol = token.functions.symbol().call()
+                checksum(owner_address)).call()
+            if token.address not in self.token_cache:
+                self.token_cache[token.address] = {
+                    'decimals': token.functions.decimals().call(),
+                    'symbol': token.functions.symbol().call()
+                }
+                save_token_cache()
+            decimals = self.token_cache[token.address]['decimals']
+            symbol = self.token_cache[token.address]['symbol']
 
             balance_human = balance / (10 ** decimals)
 
@@ -94,88 +163,185 @@ class AddressAssetQuery:
         return None
 
     def get_common_tokens(self, address):
-        """Get balances of common tokens"""
+        """Get balances of common tokens (one Multicall3 call for all of them)"""
+        address = checksum(address)
+        token_addrs = [checksum(a) for a in COMMON_TOKENS.values()]
+        raw_addrs = dict(zip(token_addrs, COMMON_TOKENS.values()))
+        balance_call = BALANCE_OF_SELECTOR + encode(['address'], [address])
+
+        calls = []
+        for token_addr in token_addrs:
+            calls.append((token_addr, balance_call))
+            if token_addr not in self.token_cache:
+                calls.append((token_addr, DECIMALS_SELECTOR))
+                calls.append((token_addr, SYMBOL_SELECTOR))
+
+        try:
+            results = iter(multicall(self.w3, calls))
+        except Exception:
+            # No Multicall3 on this chain: query token by token
+            tokens = []
+            for token_addr in COMMON_TOKENS.values():
+                token_info = self.get_token_balance(token_addr, address)
+                if token_info:
+                    tokens.append(token_info)
+            return tokens
+
         tokens = []
-        address = Web3.to_checksum_address(address)
+        cache_updated = False
+        for token_addr in token_addrs:
+            ok_balance, balance_data = next(results)
+            if token_addr not in self.token_cache:
+                (ok_decimals, decimals_data), (ok_symbol, symbol_data) = next(results), next(results)
+                if not (ok_decimals and ok_symbol):
+                    continue
+                self.token_cache[token_addr] = {
+                    'decimals': decode(['uint8'], decimals_data)[0],
+                    'symbol': decode_symbol(symbol_data)
+                }
+                cache_updated = True
+            if not ok_balance:
+                continue
 
-        for symbol, token_addr in COMMON_TOKENS.items():
-            token_info = self.get_token_balance(token_addr, address)
-            if token_info:
-                tokens.append(token_info)
+            decimals = self.token_cache[token_addr]['decimals']
+            symbol = self.token_cache[token_addr]['symbol']
+            balance = decode(['uint256'], balance_data)[0]
+            balance_human = balance / (10 ** decimals)
+            if balance_human > 0:
+                tokens.append({
+                    'symbol': symbol,
+                    'balance': balance_human,
+                    'balance_raw': balance,
+                    'decimals': decimals,
+                    'address': raw_addrs[token_addr]
+                })
 
+        if cache_updated:
+            save_token_cache()
         return tokens
 
     def find_nft_contracts(self, address):
         """Find NFT contracts by querying Transfer events"""
-        address = Web3.to_checksum_address(address)
-        address_topic = "0x" + "0" * 24 + address[2:].lower()
+        # Transfer to this address: topic2 is the address left-padded to 32 bytes.
+        # Built once and shared by every window's request.
+        address_topic = "0x" + checksum(address)[2:].lower().rjust(64, "0")
+        topics = [TRANSFER_EVENT_SIG, None, address_topic]
 
         # Get recent blocks (last 10000 blocks ~ 1.4 days)
         current_block = self.w3.eth.block_number
         from_block = max(0, current_block - 10000)
 
-        nft_contracts = set()
+        def query_chunk(bounds):
+            # Raw JSON-RPC: we only need each log's address, so skip web3's
+            # per-log AttributeDict formatting
+            response = self.w3.provider.make_request('eth_getLogs', [{
+                "fromBlock": hex(bounds[0]),
+                "toBlock": hex(bounds[1]),
+                "topics": topics
+            }])
+            if 'error' in response:
+                raise ValueError(response['error'])
+            # Newest log first, each contract once
+            addresses = dict.fromkeys(log['address'] for log in reversed(response['result']))
+            return [checksum(a) for a in addresses]
+
+        # Newest windows first; providers handle small ranges far better than one big one
+        chunks = [
+            (start, min(start + LOG_CHUNK_BLOCKS - 1, current_block))
+            for start in range(from_block, current_block + 1, LOG_CHUNK_BLOCKS)
+        ][::-1]
+
+        # Windows are fetched concurrently but consumed in block order (newest
+        # first), so the MAX_NFT_CONTRACTS cut-off keeps the same, most recent
+        # contracts no matter which requests finish first
+        nft_contracts = {}
+        with ThreadPoolExecutor(max_workers=LOG_WORKERS) as executor:
+            futures = [executor.submit(query_chunk, chunk) for chunk in chunks]
+            for future in futures:
+                try:
+                    nft_contracts.update(dict.fromkeys(future.result()))
+                except Exception as e:
+                    print(f"Warning: Could not query all Transfer events: {e}")
 
-        try:
-            logs = self.w3.eth.get_logs({
-                "fromBlock": from_block,
-                "toBlock": "latest",
-                # Transfer to this address
-                "topics": [TRANSFER_EVENT_SIG, None, address_topic]
-            })
-
-            for log in logs:
-                nft_contracts.add(log['address'])
-        except Exception as e:
-            print(f"Warning: Could not query all Transfer events: {e}")
+                if len(nft_contracts) >= MAX_NFT_CONTRACTS:
+                    # Enough candidates; drop the windows not started yet
+                    for pending in futures:
+                        pending.cancel()
+                    break
 
-        return list(nft_contracts)
+        return list(nft_contracts)[:MAX_NFT_CONTRACTS]
 
     def get_uniswap_v3_positions(self, owner_address):
         """Get Uniswap V3 position NFTs directly from NFPM contract"""
         try:
-            nfpm = self.w3.eth.contract(
-                address=Web3.to_checksum_address(UNISWAP_V3_NFPM),
-                abi=UNISWAP_NFPM_ABI
-            )
+            nfpm = self.get_contract(UNISWAP_V3_NFPM, 'nfpm')
 
-            owner_address = Web3.to_checksum_address(owner_address)
+            owner_address = checksum(owner_address)
             balance = nfpm.functions.balanceOf(owner_address).call()
 
             if balance == 0:
                 return None
 
-            # Get all token IDs
-            token_ids = []
-            for i in range(balance):
-                try:
-                    token_id = nfpm.functions.tokenOfOwnerByIndex(
-                        owner_address, i).call()
-                    token_ids.append(token_id)
-                except Exception as e:
-                    continue
+            def position_dict(token_id, pos_data):
+                _, _, token0, token1, fee, tick_lower, tick_upper, liquidity, _, _, _, _ = pos_data
 
-            if not token_ids:
-                return None
+                return {
+                    'token_id': token_id,
+                    'token0': checksum(token0),
+                    'token1': checksum(token1),
+                    'fee_tier': fee,
+                    'tick_lower': tick_lower,
+                    'tick_upper': tick_upper,
+                    'liquidity': str(liquidity)
+                }
 
-            # Get position details for each token
-            positions = []
-            for token_id in token_ids:
+            def fetch_token_id(i):
                 try:
-                    pos_data = nfpm.functions.positions(token_id).call()
-                    _, _, token0, token1, fee, tick_lower, tick_upper, liquidity, _, _, _, _ = pos_data
-
-                    positions.append({
-                        'token_id': token_id,
-                        'token0': token0,
-                        'token1': token1,
-                        'fee_tier': fee,
-                        'tick_lower': tick_lower,
-                        'tick_upper': tick_upper,
-                        'liquidity': str(liquidity)
-                    })
-                except:
-                    positions.append({'token_id': token_id})
+                    return nfpm.functions.tokenOfOwnerByIndex(owner_address, i).call()
+                except Exception:
+                    return None
+
+            def fetch_position(token_id):
+                try:
+                    return position_dict(token_id, nfpm.functions.positions(token_id).call())
+                except Exception:
+                    return {'token_id': token_id}
+
+            try:
+                # Two Multicall3 calls, however many positions the owner has
+                results = multicall(self.w3, [
+                    (nfpm.address, TOKEN_OF_OWNER_BY_INDEX_SELECTOR
+                     + encode(['address', 'uint256'], [owner_address, i]))
+                    for i in range(balance)
+                ])
+                token_ids = [decode(['uint256'], data)[0] for ok, data in results if ok]
+
+                if not token_ids:
+                    return None
+
+                results = multicall(self.w3, [
+                    (nfpm.address, POSITIONS_SELECTOR + encode(['uint256'], [token_id]))
+                    for token_id in token_ids
+                ])
+                positions = [
+                    position_dict(token_id, decode(POSITION_TYPES, data))
+                    if ok else {'token_id': token_id}
+                    for token_id, (ok, data) in zip(token_ids, results)
+                ]
+            except Exception:
+                # No Multicall3 on this chain: fan the calls out on a thread pool
+                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                    # Get all token IDs
+                    token_ids = [
+                        token_id for token_id in executor.map(fetch_token_id, range(balance))
+                        if token_id is not None
+                    ]
+
+                    if not token_ids:
+                        return None
+
+                    # Get position details for each token
+                    positions = list(executor.map(fetch_position, token_ids))
 
             return {
                 'contract': UNISWAP_V3_NFPM,
@@ -192,13 +358,10 @@ class AddressAssetQuery:
     def get_nft_balance(self, nft_address, owner_address):
         """Get NFT balance and owned token IDs"""
         try:
-            nft = self.w3.eth.contract(
-                address=Web3.to_checksum_address(nft_address),
-                abi=ERC721_ABI
-            )
+            nft = self.get_contract(nft_address, 'erc721')
 
             balance = nft.functions.balanceOf(
-                Web3.to_checksum_address(owner_address)).call()
+                checksum(owner_address)).call()
 
             if balance == 0:
                 return None
@@ -239,7 +402,7 @@ class AddressAssetQuery:
 
     def query_all_assets(self, address):
         """Query all assets for an address"""
-        address = Web3.to_checksum_address(address)
+        address = checksum(address)
 
         print(f"\n{'='*70}")
         print(f"Querying assets for: {address}")
@@ -293,12 +456,17 @@ class AddressAssetQuery:
 
         if nft_contracts:
             print(f"Found {len(nft_contracts)} potential NFT contract(s)")
-            for nft_addr in nft_contracts[:20]:  # Limit to first 20 contracts
-                # Skip Uniswap V3 NFPM as we already queried it
-                if Web3.to_checksum_address(nft_addr) == Web3.to_checksum_address(UNISWAP_V3_NFPM):
-                    continue
+            # Limit to first 20 contracts, skipping Uniswap V3 NFPM as we already queried it
+            candidates = [
+                nft_addr for nft_addr in nft_contracts[:20]
+                if checksum(nft_addr) != checksum(UNISWAP_V3_NFPM)
+            ]
+
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                nft_infos = list(executor.map(
+                    lambda nft_addr: self.get_nft_balance(nft_addr, address), candidates))
 
-                nft_info = self.get_nft_balance(nft_addr, address)
+            for nft_addr, nft_info in zip(candidates, nft_infos):
                 if nft_info:
                     results['nfts'].append(nft_info)
                     token_ids_str = ", ".join(
@@ -325,10 +493,17 @@ def main():
 
     address = sys.argv[1]
 
-    # Validate address
-    if not Web3.is_address(address):
+    # Validate address shape with a regex. All-lower/upper-case input has
+    # no checksum to verify; mixed case must be a correct EIP-55 checksum.
+    if not ADDRESS_RE.match(address):
         print(f"Error: Invalid Ethereum address: {address}")
         sys.exit(1)
+    hex_part = address[2:]
+    if hex_part != hex_part.lower() and hex_part != hex_part.upper():
+        if checksum(address) != address:
+            print(f"Error: Invalid EIP-55 checksum for address: {address}")
+            sys.exit(1)
+    address = checksum(address)
 
     try:
         query = AddressAssetQuery()
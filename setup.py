@@ -19,6 +19,10 @@ setup(
         "mnemonic>=0.20",
         "eth-account>=0.9.0",
     ],
+    extras_require={
+        # Optional speedups; everything falls back to pure Python without them
+        "fast": ["numpy", "numba", "gmpy2"],
+    },
     entry_points={
         "console_scripts": [
             "amm-trading=amm_trading.cli.main:main",
@@ -0,0 +1,60 @@
+"""Tests for GasManager's gas estimate cache (no blockchain needed)"""
+
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from amm_trading.utils import gas
+from amm_trading.utils.gas import GasManager
+
+CONTRACT_FUNC = SimpleNamespace(address="0x000000000000000000000000000000000000dEaD")
+SENDER = "0x5bd19Ea9E14205Bce413994D2640E4e9fb204DD3"
+
+
+class FakeEth:
+    def __init__(self):
+        self.calls = []
+
+    def fee_history(self, block_count, newest_block):
+        self.calls.append("fee_history")
+        return {"oldestBlock": 100, "baseFeePerGas": [10, 11]}
+
+    def estimate_gas(self, tx):
+        self.calls.append("estimate_gas")
+        return 21000
+
+
+def make_gas_manager():
+    """GasManager with the node replaced by a recorder of RPC calls"""
+    eth = FakeEth()
+    manager = object.__new__(GasManager)
+    manager.manager = SimpleNamespace(w3=SimpleNamespace(eth=eth))
+    manager.config = SimpleNamespace(getGasLimit=lambda operation_type: 500000)
+    manager._base_fee_cache = None
+    manager._estimate_cache = OrderedDict()
+    manager._estimate_lock = threading.Lock()
+    return manager, eth
+
+
+def test_estimate_reuses_fresh_fee_read():
+    manager, eth = make_gas_manager()
+    manager.getBaseFee()
+    manager.estimateGas(CONTRACT_FUNC, SENDER, data=b"\x01")
+    manager.estimateGas(CONTRACT_FUNC, SENDER, data=b"\x01")
+
+    assert eth.calls == ["fee_history", "estimate_gas"]
+
+
+def test_estimate_does_not_refresh_fees(monkeypatch):
+    manager, eth = make_gas_manager()
+    manager.getBaseFee()
+    monkeypatch.setattr(gas, "BASE_FEE_TTL", 0.0)
+    time.sleep(0.001)
+
+    # Stale fee read: the node is asked for the estimate but not for fees
+    manager.estimateGas(CONTRACT_FUNC, SENDER, data=b"\x01")
+    manager.estimateGas(CONTRACT_FUNC, SENDER, data=b"\x01")
+
+    assert eth.calls == ["fee_history", "estimate_gas", "estimate_gas"]
+    assert not manager._estimate_cache
@@ -0,0 +1,72 @@
+"""Tests for StateView's per-block tick info cache (no blockchain needed)"""
+
+from collections import OrderedDict
+
+from amm_trading.protocols.uniswap_v4.contracts import state_view
+from amm_trading.protocols.uniswap_v4.contracts.state_view import StateView
+from amm_trading.protocols.uniswap_v4.types import PoolKey
+
+POOL_KEY = PoolKey(
+    currency0="0x0000000000000000000000000000000000000000",
+    currency1="0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    fee=3000,
+    tick_spacing=60,
+)
+
+
+class FakeContract:
+    def encode_abi(self, fn_name, args):
+        return args[1]
+
+
+def make_state_view():
+    """StateView with the RPC replaced by a recorder of requested ticks"""
+    view = object.__new__(StateView)
+    view.contract = FakeContract()
+    view._tick_info_cache = OrderedDict()
+    view._tick_info_block = None
+    view.calls = []
+
+    def aggregate(calldatas, output_types, block_identifier="latest"):
+        view.calls.append((list(calldatas), block_identifier))
+        return [(tick, tick, 0, 0) for tick in calldatas]
+
+    view._aggregate = aggregate
+    return view
+
+
+def test_pinned_block_reads_are_cached():
+    view = make_state_view()
+    view.get_tick_info_batch(POOL_KEY, [-60, 0, 60], 100)
+    infos = view.get_tick_info_batch(POOL_KEY, [0, 60, 120], 100)
+
+    assert [info["liquidity_gross"] for info in infos] == [0, 60, 120]
+    assert view.calls == [([-60, 0, 60], 100), ([120], 100)]
+
+
+def test_new_block_invalidates_cache():
+    view = make_state_view()
+    view.get_tick_info_batch(POOL_KEY, [0, 60], 100)
+    view.get_tick_info_batch(POOL_KEY, [0, 60], 101)
+
+    assert view.calls == [([0, 60], 100), ([0, 60], 101)]
+    assert set(view._tick_info_cache) == {(POOL_KEY.pool_id, 0), (POOL_KEY.pool_id, 60)}
+    assert view._tick_info_block == 101
+
+
+def test_latest_is_not_cached():
+    view = make_state_view()
+    view.get_tick_info_batch(POOL_KEY, [0], "latest")
+    view.get_tick_info_batch(POOL_KEY, [0], "latest")
+
+    assert view.calls == [([0], "latest"), ([0], "latest")]
+    assert not view._tick_info_cache
+
+
+def test_cache_size_is_bounded(monkeypatch):
+    monkeypatch.setattr(state_view, "TICK_INFO_CACHE_SIZE", 2)
+    view = make_state_view()
+    infos = view.get_tick_info_batch(POOL_KEY, [0, 60, 120], 100)
+
+    assert len(infos) == 3
+    assert list(view._tick_info_cache) == [(POOL_KEY.pool_id, 60), (POOL_KEY.pool_id, 120)]
@@ -0,0 +1,56 @@
+"""Tests for V4 action batching (no blockchain needed)"""
+
+from eth_abi import decode, encode
+
+from amm_trading.protocols.uniswap_v4.encoding import (
+    combine_actions,
+    encode_burn_position,
+    encode_decrease_liquidity,
+)
+from amm_trading.protocols.uniswap_v4.types import ADDRESS_ZERO, Actions
+
+RECIPIENT = "0x5bd19Ea9E14205Bce413994D2640E4e9fb204DD3"
+
+
+def test_decrease_take_burn_batch():
+    actions, params = combine_actions(
+        encode_decrease_liquidity(
+            token_id=42,
+            liquidity=1000,
+            amount0_min=1,
+            amount1_min=2,
+            recipient=RECIPIENT,
+        ),
+        encode_burn_position(42),
+    )
+
+    # Actions run in order inside one unlock: decrease, take, then burn
+    assert actions == bytes([
+        Actions.DECREASE_LIQUIDITY,
+        Actions.TAKE_PAIR,
+        Actions.BURN_POSITION,
+    ])
+    assert len(params) == len(actions)
+
+    # One param per action, in the same order as the action bytes
+    assert decode(["uint256", "uint256", "uint128", "uint128", "bytes"], params[0]) == (
+        42, 1000, 1, 2, b""
+    )
+    assert decode(["address", "address", "address"], params[1]) == (
+        ADDRESS_ZERO, ADDRESS_ZERO, RECIPIENT.lower()
+    )
+    assert decode(["uint256", "uint128", "uint128", "bytes"], params[2]) == (42, 0, 0, b"")
+
+
+def test_burn_params_layout():
+    # The Position Manager decodes (tokenId, amount0Min, amount1Min, hookData)
+    actions, params = encode_burn_position(42, amount0_min=5, amount1_min=6, hook_data=b"\x01")
+
+    assert actions == bytes([Actions.BURN_POSITION])
+    assert decode(["uint256", "uint128", "uint128", "bytes"], params[0]) == (42, 5, 6, b"\x01")
+    assert params[0] == encode(["uint256", "uint128", "uint128", "bytes"], [42, 5, 6, b"\x01"])
+
+
+def test_combine_single_group_is_unchanged():
+    encoded = encode_burn_position(7)
+    assert combine_actions(encoded) == (encoded[0], list(encoded[1]))
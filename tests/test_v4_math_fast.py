@@ -0,0 +1,80 @@
+"""Parity of the float64 V4 math with math.py (no blockchain needed)"""
+
+import math
+
+import pytest
+
+from amm_trading.protocols.uniswap_v4.math import (
+    MAX_TICK,
+    calculate_liquidity_from_amounts,
+    get_amounts_from_liquidity,
+    get_sqrt_ratio_at_tick,
+    tick_to_price,
+)
+from amm_trading.protocols.uniswap_v4.math_fast import (
+    calculate_liquidity_from_amounts_f64,
+    get_amounts_from_liquidity_f64,
+    tick_to_price_f64,
+)
+
+REL_TOL = 1e-9
+
+# Ticks spread across the whole valid range, including both ends
+TICKS = [-MAX_TICK, -500000, -200000, -69082, -1, 0, 1, 60, 69082, 200000, 500000, MAX_TICK]
+
+# (tick_lower, tick_upper) ranges; the current tick is moved below, onto each
+# edge of, inside and above each
+RANGES = [(-887220, 887220), (-200040, -199980), (-60, 60), (195000, 205000)]
+
+# (amount0, amount1) in wei: balanced, one-sided and lopsided deposits
+AMOUNTS = [(10 ** 18, 10 ** 18), (10 ** 18, 0), (0, 10 ** 18), (10 ** 24, 10 ** 6)]
+
+
+def _close(a, b):
+    return math.isclose(a, b, rel_tol=REL_TOL, abs_tol=1e-300)
+
+
+def _current_ticks(tick_lower, tick_upper, edges=True):
+    """Ticks below, at, inside and above the range, clamped to the valid range"""
+    ticks = [tick_lower - 1, (tick_lower + tick_upper) // 2, tick_upper + 1]
+    if edges:
+        ticks += [tick_lower, tick_upper]
+    return [max(-MAX_TICK, min(MAX_TICK, tick)) for tick in ticks]
+
+
+@pytest.mark.parametrize("tick", TICKS)
+@pytest.mark.parametrize("decimals0,decimals1", [(18, 6), (6, 18), (18, 18)])
+def test_tick_to_price_parity(tick, decimals0, decimals1):
+    expected = tick_to_price(tick, decimals0, decimals1)
+    assert _close(tick_to_price_f64(tick, decimals0, decimals1), expected)
+
+
+@pytest.mark.parametrize("tick_lower,tick_upper", RANGES)
+def test_get_amounts_from_liquidity_parity(tick_lower, tick_upper):
+    liquidity = 10 ** 18
+    for tick in _current_ticks(tick_lower, tick_upper):
+        sqrt_price_x96 = get_sqrt_ratio_at_tick(tick)
+        expected = get_amounts_from_liquidity(
+            liquidity, sqrt_price_x96, tick, tick_lower, tick_upper, 18, 6
+        )
+        got = get_amounts_from_liquidity_f64(
+            float(liquidity), sqrt_price_x96 / 2 ** 96, tick, tick_lower, tick_upper, 18, 6
+        )
+        assert _close(got[0], expected[0])
+        assert _close(got[1], expected[1])
+
+
+@pytest.mark.parametrize("tick_lower,tick_upper", RANGES)
+@pytest.mark.parametrize("amount0,amount1", AMOUNTS)
+def test_calculate_liquidity_from_amounts_parity(tick_lower, tick_upper, amount0, amount1):
+    # Edge ticks are left out: the integer path clamps to the exact TickMath
+    # bound and divides by the near-zero distance to it, which float64 cannot match
+    for tick in _current_ticks(tick_lower, tick_upper, edges=False):
+        sqrt_price_x96 = get_sqrt_ratio_at_tick(tick)
+        expected = calculate_liquidity_from_amounts(
+            sqrt_price_x96, tick_lower, tick_upper, amount0, amount1
+        )
+        got = calculate_liquidity_from_amounts_f64(
+            sqrt_price_x96 / 2 ** 96, tick_lower, tick_upper, float(amount0), float(amount1)
+        )
+        assert math.isclose(got, expected, rel_tol=REL_TOL, abs_tol=1.0)
@@ -0,0 +1,97 @@
+"""Parity of the NumPy-vectorized V4 math with math.py (no blockchain needed)"""
+
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from amm_trading.protocols.uniswap_v4.math import (
+    MAX_TICK,
+    calculate_liquidity_from_amounts,
+    get_amounts_from_liquidity,
+    get_sqrt_ratio_at_tick,
+    tick_to_price,
+)
+from amm_trading.protocols.uniswap_v4.math_fast import (
+    calculate_liquidity_from_amounts_f64,
+    calculate_liquidity_from_amounts_vec,
+    get_amounts_from_liquidity_vec,
+    tick_to_price_vec,
+)
+
+REL_TOL = 1e-9
+
+# Ticks spread across the whole valid range, including both ends
+TICKS = [-MAX_TICK, -500000, -200000, -69082, -1, 0, 1, 60, 69082, 200000, 500000, MAX_TICK]
+
+# (tick_lower, tick_upper) ranges; the current tick is moved below, onto each
+# edge of, inside and above each
+RANGES = [(-887220, 887220), (-200040, -199980), (-60, 60), (195000, 205000)]
+
+# (amount0, amount1) in wei: balanced, one-sided and lopsided deposits
+AMOUNTS = [(10 ** 18, 10 ** 18), (10 ** 18, 0), (0, 10 ** 18), (10 ** 24, 10 ** 6)]
+
+
+def _close(a, b):
+    return math.isclose(a, b, rel_tol=REL_TOL, abs_tol=1e-300)
+
+
+def _current_ticks(tick_lower, tick_upper, edges=True):
+    """Ticks below, at, inside and above the range, clamped to the valid range"""
+    ticks = [tick_lower - 1, (tick_lower + tick_upper) // 2, tick_upper + 1]
+    if edges:
+        ticks += [tick_lower, tick_upper]
+    return [max(-MAX_TICK, min(MAX_TICK, tick)) for tick in ticks]
+
+
+@pytest.mark.parametrize("tick", TICKS)
+@pytest.mark.parametrize("decimals0,decimals1", [(18, 6), (6, 18), (18, 18)])
+def test_tick_to_price_vec_parity(tick, decimals0, decimals1):
+    expected = tick_to_price(tick, decimals0, decimals1)
+    assert _close(float(tick_to_price_vec([tick], decimals0, decimals1)[0]), expected)
+
+
+@pytest.mark.parametrize("tick_lower,tick_upper", RANGES)
+def test_get_amounts_from_liquidity_vec_parity(tick_lower, tick_upper):
+    liquidity = 10 ** 18
+    for tick in _current_ticks(tick_lower, tick_upper):
+        sqrt_price_x96 = get_sqrt_ratio_at_tick(tick)
+        expected = get_amounts_from_liquidity(
+            liquidity, sqrt_price_x96, tick, tick_lower, tick_upper, 18, 6
+        )
+        vec0, vec1 = get_amounts_from_liquidity_vec(
+            [liquidity], [sqrt_price_x96], [tick], [tick_lower], [tick_upper], [18], [6]
+        )
+        assert _close(float(vec0[0]), expected[0])
+        assert _close(float(vec1[0]), expected[1])
+
+
+@pytest.mark.parametrize("amount0,amount1", AMOUNTS)
+def test_calculate_liquidity_from_amounts_vec_parity(amount0, amount1):
+    # One call over the whole grid of (current tick, range) candidates. Edge
+    # ticks are left out: the integer path clamps to the exact TickMath bound
+    # and divides by the near-zero distance to it, which float64 cannot match.
+    rows = [
+        (get_sqrt_ratio_at_tick(tick), tick_lower, tick_upper)
+        for tick_lower, tick_upper in RANGES
+        for tick in _current_ticks(tick_lower, tick_upper, edges=False)
+    ]
+    got = calculate_liquidity_from_amounts_vec(
+        [sqrt_price_x96 / 2 ** 96 for sqrt_price_x96, _, _ in rows],
+        [tick_lower for _, tick_lower, _ in rows],
+        [tick_upper for _, _, tick_upper in rows],
+        float(amount0),
+        float(amount1),
+    )
+
+    assert got.shape == (len(rows),)
+    for value, (sqrt_price_x96, tick_lower, tick_upper) in zip(got, rows):
+        expected = calculate_liquidity_from_amounts(
+            sqrt_price_x96, tick_lower, tick_upper, amount0, amount1
+        )
+        scalar = calculate_liquidity_from_amounts_f64(
+            sqrt_price_x96 / 2 ** 96, tick_lower, tick_upper, float(amount0), float(amount1)
+        )
+        assert math.isclose(float(value), expected, rel_tol=REL_TOL, abs_tol=1.0)
+        assert math.isclose(float(value), scalar, rel_tol=REL_TOL, abs_tol=1.0)
@@ -0,0 +1,60 @@
+"""Golden-value tests for the exact V4 tick math (no blockchain needed)"""
+
+from decimal import Decimal, getcontext
+
+import pytest
+
+from amm_trading.protocols.uniswap_v4.math import (
+    MAX_TICK,
+    Q96,
+    calculate_liquidity_from_amounts,
+    get_sqrt_ratio_at_tick,
+)
+
+# TickMath.MIN_SQRT_RATIO / MAX_SQRT_RATIO from the Uniswap core contracts
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+
+def test_tickmath_constants():
+    assert get_sqrt_ratio_at_tick(-MAX_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(0) == Q96
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+
+
+@pytest.mark.parametrize("tick", [-MAX_TICK - 1, MAX_TICK + 1])
+def test_out_of_range_tick_rejected(tick):
+    with pytest.raises(ValueError):
+        get_sqrt_ratio_at_tick(tick)
+
+
+@pytest.mark.parametrize("tick", [-887000, -200000, -60, -1, 1, 60, 200000, 887000])
+def test_matches_high_precision_sqrt(tick):
+    # TickMath rounds up to an integer and its Q128 fixed point is within
+    # ~1e-19 relative of the true value; float64 math is only good to ~1e-16
+    getcontext().prec = 80
+    expected = (Decimal("1.0001") ** tick).sqrt() * Q96
+    error = abs(Decimal(get_sqrt_ratio_at_tick(tick)) - expected)
+    assert error < max(Decimal(1), expected * Decimal("1e-18"))
+
+
+def test_monotonic_across_range():
+    ticks = list(range(-MAX_TICK, MAX_TICK + 1, 7919)) + [MAX_TICK]
+    ratios = [get_sqrt_ratio_at_tick(tick) for tick in ticks]
+    assert ratios == sorted(ratios)
+    assert len(set(ratios)) == len(ratios)
+
+
+def test_liquidity_uses_exact_range_prices():
+    tick_lower, tick_upper = -887220, 887220
+    sqrt_price_x96 = get_sqrt_ratio_at_tick(0)
+    amount0 = amount1 = 10 ** 18
+
+    sqrt_lower = get_sqrt_ratio_at_tick(tick_lower)
+    sqrt_upper = get_sqrt_ratio_at_tick(tick_upper)
+    liquidity0 = amount0 * sqrt_price_x96 * sqrt_upper // ((sqrt_upper - sqrt_price_x96) * Q96)
+    liquidity1 = amount1 * Q96 // (sqrt_price_x96 - sqrt_lower)
+
+    assert calculate_liquidity_from_amounts(
+        sqrt_price_x96, tick_lower, tick_upper, amount0, amount1
+    ) == min(liquidity0, liquidity1)